@@ -0,0 +1,108 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.retrieval.index import PQ_RERANK_FACTOR, make_faiss_index, rerank_exact, search_params
+
+# Query-time knob values swept per index type
+SWEEPS: Dict[str, List[Optional[int]]] = {
+    "flat": [None],
+    "ivf_flat": [1, 4, 16, 64],
+    "ivf_pq": [4, 16, 64],
+    "hnsw": [16, 32, 64, 128],
+}
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """
+    Normalised vectors scattered around topic centroids, which is closer to
+    sentence embeddings than uniform noise (and harder for IVF than it looks).
+    """
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(clusters, dim)).astype("float32")
+    emb = centroids[rng.integers(0, clusters, size=n)] + 0.6 * rng.normal(size=(n, dim)).astype("float32")
+    faiss.normalize_L2(emb)
+    return emb
+
+
+def search(index: faiss.Index, kind: str, corpus: np.ndarray, queries: np.ndarray, k: int, params) -> np.ndarray:
+    # Same path as ChunkIndex.query, including the exact rerank for IVF-PQ
+    if kind == "ivf_pq":
+        _, candidates = index.search(queries, k * PQ_RERANK_FACTOR, params=params)
+        return rerank_exact(corpus, queries, candidates, k)[1]
+    return index.search(queries, k, params=params)[1]
+
+
+def latencies_ms(index: faiss.Index, kind: str, corpus: np.ndarray, queries: np.ndarray, k: int, params) -> np.ndarray:
+    out = np.empty(len(queries))
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        search(index, kind, corpus, queries[i : i + 1], k, params)
+        out[i] = (time.perf_counter() - start) * 1000
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recall@k and latency of ANN index types vs flat.")
+    parser.add_argument("--n", type=int, default=200_000, help="synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--vectors", type=Path, default=None, help=".npy vectors (e.g. from an index snapshot)")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--types", nargs="+", default=list(SWEEPS))
+    parser.add_argument("--threads", type=int, default=1, help="FAISS OpenMP threads")
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(args.threads)
+    if args.vectors:
+        emb = np.ascontiguousarray(np.load(args.vectors), dtype="float32")
+        faiss.normalize_L2(emb)
+    else:
+        emb = synthetic_vectors(args.n + args.queries, args.dim, clusters=max(args.n // 500, 8), seed=0)
+    # Held-out queries: perturbed copies of corpus rows, not rows themselves
+    rng = np.random.default_rng(1)
+    queries = emb[rng.choice(len(emb), args.queries, replace=False)] + 0.05 * rng.normal(
+        size=(args.queries, emb.shape[1])
+    ).astype("float32")
+    faiss.normalize_L2(queries)
+    corpus = emb[: args.n] if not args.vectors else emb
+    print(f"{corpus.shape[0]} vectors, dim={corpus.shape[1]}, {args.queries} queries, k={args.k}, threads={args.threads}")
+
+    exact = faiss.IndexFlatIP(corpus.shape[1])
+    exact.add(corpus)
+    _, truth = exact.search(queries, args.k)
+
+    print(f"{'type':<9} {'knob':>10} {'build s':>8} {'recall@k':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for kind in args.types:
+        start = time.perf_counter()
+        index, built = make_faiss_index(corpus, kind)
+        build_s = time.perf_counter() - start
+        for knob in SWEEPS[kind]:
+            if built.startswith("ivf"):
+                params, label = search_params(index, args.k, nprobe=knob), f"nprobe={knob}"
+            elif built == "hnsw":
+                params, label = search_params(index, args.k, ef_search=knob), f"ef={knob}"
+            else:
+                params, label = None, "-"
+            got = search(index, built, corpus, queries, args.k, params)
+            recall = np.mean([len(set(g) & set(t)) / args.k for g, t in zip(got, truth)])
+            lat = latencies_ms(index, built, corpus, queries, args.k, params)
+            print(
+                f"{built:<9} {label:>10} {build_s:8.1f} {recall:9.3f} "
+                f"{np.percentile(lat, 50):8.3f} {np.percentile(lat, 99):8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
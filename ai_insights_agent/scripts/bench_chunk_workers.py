@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import RAW_DIR
+from src.models import Article
+from src.processing.chunking import semantic_chunk_corpus_with_vectors
+
+
+def load_articles(snapshot: Path, copies: int) -> List[Article]:
+    """
+    Articles from a raw snapshot, repeated `copies` times under distinct ids
+    to emulate a larger corpus.
+    """
+    with snapshot.open("r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    return [
+        Article(**{**row, "id": f"{row['id']}-{n}", "raw_html": None})
+        for n in range(copies)
+        for row in rows
+    ]
+
+
+def default_workers() -> List[int]:
+    cpus = os.cpu_count() or 1
+    counts, n = [], 1
+    while n < cpus:
+        counts.append(n)
+        n *= 2
+    return counts + [cpus]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling benchmark for parallel corpus chunking.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="articles_*.jsonl file")
+    parser.add_argument("--copies", type=int, default=20, help="times each article is repeated")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="default: 1, 2, 4 .. CPUs")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(RAW_DIR.glob("articles_*.jsonl"))[-1]
+    articles = load_articles(snapshot, args.copies)
+    print(f"{len(articles)} articles from {snapshot.name} ({os.cpu_count()} CPUs)")
+
+    # The first pass embeds every distinct sentence; later passes hit the embedding
+    # cache, so the timings below are the split + group + Chunk stages.
+    reference, reference_vecs = semantic_chunk_corpus_with_vectors(articles, workers=1)
+    strip = lambda results: [[(c.id, c.text) for c in chunks] for chunks in results]
+    n_chunks = sum(len(chunks) for chunks in reference)
+
+    baseline = None
+    for workers in args.workers or default_workers():
+        best = float("inf")
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            results, vectors = semantic_chunk_corpus_with_vectors(articles, workers=workers)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        identical = strip(results) == strip(reference) and np.array_equal(vectors, reference_vecs)
+        print(
+            f"workers={workers:>3}: {best:6.2f}s  {len(articles) / best:7.1f} articles/s  "
+            f"{n_chunks / best:8.1f} chunks/s  speedup {baseline / best:4.1f}x  identical={identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
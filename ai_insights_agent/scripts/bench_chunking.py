@@ -0,0 +1,90 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.processing.chunking import _group_sentences
+
+
+def reference_groups(
+    sent_embs: np.ndarray,
+    sim_threshold: float,
+    max_sentences: int,
+    overlap: int,
+) -> List[Tuple[int, int]]:
+    # The original loop: re-stacks the group and recomputes the mean and norms per sentence.
+    def cosine(a, b):
+        denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return 0.0 if denom == 0.0 else float(np.dot(a, b) / denom)
+
+    groups = []
+    current_ids = [0]
+    current_embs = [sent_embs[0]]
+    for i in range(1, len(sent_embs)):
+        centroid = np.mean(np.stack(current_embs, axis=0), axis=0)
+        sim = cosine(centroid, sent_embs[i])
+        if sim >= sim_threshold and len(current_ids) < max_sentences:
+            current_ids.append(i)
+            current_embs.append(sent_embs[i])
+        else:
+            groups.append((current_ids[0], current_ids[-1]))
+            start = max(0, current_ids[-1] - overlap + 1)
+            current_ids = list(range(start, i + 1))
+            current_embs = [sent_embs[j] for j in current_ids]
+    groups.append((current_ids[0], current_ids[-1]))
+    return groups
+
+
+def synthetic_embeddings(n: int, dim: int, topic_len: int, noise: float, seed: int) -> np.ndarray:
+    """
+    Unit-norm sentence vectors drifting between topics, like a long policy document.
+    """
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n // topic_len + 1, dim))
+    topic_of = np.repeat(np.arange(len(topics)), topic_len)[:n]
+    emb = topics[topic_of] + noise * rng.normal(size=(n, dim))
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    return emb.astype("float32")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark semantic chunk grouping.")
+    parser.add_argument("--sentences", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--max-sentences", type=int, nargs="+", default=[6, 32])
+    parser.add_argument("--threshold", type=float, default=0.75)
+    parser.add_argument("--overlap", type=int, default=1)
+    args = parser.parse_args()
+
+    emb = synthetic_embeddings(args.sentences, args.dim, topic_len=40, noise=0.45, seed=0)
+    print(f"{args.sentences} sentences, dim={args.dim}, threshold={args.threshold}")
+
+    for max_sentences in args.max_sentences:
+        params = (args.threshold, max_sentences, args.overlap)
+
+        start = time.perf_counter()
+        expected = reference_groups(emb, *params)
+        ref_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = _group_sentences(emb, *params)
+        new_s = time.perf_counter() - start
+
+        print(
+            f"max_sentences={max_sentences:>3}: {len(got)} chunks  "
+            f"reference {ref_s:6.2f}s  running-sum {new_s:6.2f}s  "
+            f"({ref_s / new_s:4.1f}x)  identical={got == expected}"
+        )
+
+
+if __name__ == "__main__":
+    main()
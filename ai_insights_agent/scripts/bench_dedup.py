@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import CHUNK_DEDUP_THRESHOLD, PROCESSED_DIR
+from src.processing.dedup import find_near_duplicates, shingles
+
+
+def exhaustive_duplicates(texts: List[str], threshold: float) -> List[Optional[int]]:
+    # Same greedy rule as find_near_duplicates, comparing against every kept text.
+    sets = [set(shingles(t).tolist()) for t in texts]
+    kept: List[int] = []
+    dup_of: List[Optional[int]] = [None] * len(texts)
+    for i in sorted(range(len(texts)), key=lambda i: (-len(sets[i]), i)):
+        if not sets[i]:
+            continue
+        for j in sorted(kept):
+            if len(sets[i] & sets[j]) >= threshold * len(sets[i]):
+                dup_of[i] = j
+                break
+        else:
+            kept.append(i)
+    return dup_of
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Near-duplicate chunk detection on a chunk snapshot.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="chunks_*.jsonl file")
+    parser.add_argument("--threshold", type=float, default=CHUNK_DEDUP_THRESHOLD)
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))[-1]
+    with snapshot.open("r", encoding="utf-8") as f:
+        texts = [json.loads(line)["text"] for line in f]
+
+    start = time.perf_counter()
+    dup_of = find_near_duplicates(texts, args.threshold)
+    lsh_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = exhaustive_duplicates(texts, args.threshold)
+    exact_s = time.perf_counter() - start
+
+    removed = [i for i, d in enumerate(dup_of) if d is not None]
+    total_chars = sum(len(t) for t in texts)
+    removed_chars = sum(len(texts[i]) for i in removed)
+    found = {i for i, d in enumerate(dup_of) if d is not None}
+    truth = {i for i, d in enumerate(expected) if d is not None}
+    print(f"{len(texts)} chunks from {snapshot.name}, containment threshold {args.threshold}")
+    print(
+        f"near-duplicates: {len(removed)} ({len(removed) / len(texts):.1%}), "
+        f"{removed_chars} of {total_chars} chars ({removed_chars / total_chars:.1%}, "
+        f"~{removed_chars // 4} tokens)"
+    )
+    print(
+        f"MinHash/LSH {lsh_s * 1000:.0f} ms vs exhaustive {exact_s * 1000:.0f} ms; "
+        f"recall {len(found & truth) / max(len(truth), 1):.3f}"
+    )
+    for i in removed[:5]:
+        print(f"  - {texts[i][:70]!r}\n    in {texts[dup_of[i]][:70]!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import EMBEDDING_BATCH_SIZE, PROCESSED_DIR
+from src.processing.embedding_backends import (
+    OnnxBackend,
+    SentenceTransformerBackend,
+    available_backends,
+)
+
+
+def load_texts(path: Path) -> List[str]:
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends on CPU.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="chunks_*.jsonl file")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--queries", type=int, default=100, help="single-text latency samples")
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))[-1]
+    texts = load_texts(snapshot)
+    queries = [t[:120] for t in texts[: args.queries]]
+    print(f"{len(texts)} chunk texts from {snapshot.name}, batch size {args.batch_size}")
+
+    factories = {"torch": SentenceTransformerBackend, "onnx": OnnxBackend}
+    reference = None
+    for name in available_backends():
+        for threads in args.threads:
+            backend = factories[name](threads=threads)
+            backend.encode(texts[:8], args.batch_size)  # warm-up
+
+            start = time.perf_counter()
+            emb = backend.encode(texts, args.batch_size)
+            corpus_s = time.perf_counter() - start
+
+            latencies = []
+            for q in queries:
+                start = time.perf_counter()
+                backend.encode([q], 1)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            line = (
+                f"{name:>5} threads={threads:<2}: {len(texts) / corpus_s:7.1f} texts/s  "
+                f"query p50 {np.percentile(latencies, 50):6.1f} ms  p99 {np.percentile(latencies, 99):6.1f} ms"
+            )
+            if name == "torch" and reference is None:
+                reference = emb
+            elif reference is not None:
+                cos = np.sum(reference * emb, axis=1) / (
+                    np.linalg.norm(reference, axis=1) * np.linalg.norm(emb, axis=1)
+                )
+                line += f"  cosine vs torch: mean {cos.mean():.4f} min {cos.min():.4f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
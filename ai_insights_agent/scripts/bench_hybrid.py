@@ -0,0 +1,117 @@
+import argparse
+import json
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import PROCESSED_DIR
+from src.models import Chunk
+from src.retrieval.bm25 import BM25Index
+from src.retrieval.index import RETRIEVAL_MODES, ChunkIndex
+
+MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+# Exact-term patterns regulatory questions hinge on
+TERM_RE = re.compile(
+    rf"\b(\d{{1,2}} (?:{MONTHS})(?: \d{{4}})?|Annex [A-Z]\b|[Ss]ection \d+[A-Za-z]?|"
+    rf"[A-Z][A-Za-z]+(?: [A-Z][A-Za-z]+)* (?:Act|Bill|Order|Regulations) \d{{4}})"
+)
+
+
+def term_probes(chunks: List[Chunk], max_owners: int) -> Dict[str, Set[str]]:
+    """
+    Questions about exact terms found in the chunks, mapped to the chunks
+    containing the term. Terms in more than max_owners chunks are skipped.
+    """
+    owners: Dict[str, Set[str]] = {}
+    for c in chunks:
+        for term in set(TERM_RE.findall(c.text)):
+            owners.setdefault(term, set()).add(c.id)
+    return {f"What does the guidance say about {t}?": ids for t, ids in owners.items() if len(ids) <= max_owners}
+
+
+def percentiles(ms: List[float]) -> str:
+    return f"p50 {np.percentile(ms, 50):7.3f} ms  p99 {np.percentile(ms, 99):7.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BM25 / hybrid retrieval on a chunk snapshot.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="chunks_*.jsonl file")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--max-owners", type=int, default=3)
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))[-1]
+    with snapshot.open("r", encoding="utf-8") as f:
+        chunks = [Chunk(**json.loads(line)) for line in f]
+    print(f"{len(chunks)} chunks ({snapshot.name})")
+
+    start = time.perf_counter()
+    bm25 = BM25Index()
+    bm25.add(c.text for c in chunks)
+    bm25.compact()
+    print(
+        f"BM25 build: {time.perf_counter() - start:.3f}s, {bm25.n_terms} terms, "
+        f"{bm25.n_postings} postings ({bm25.n_postings * 8 / 2**10:.0f} KiB)"
+    )
+
+    index = ChunkIndex()
+    index.build(chunks)
+    probes = term_probes(chunks, args.max_owners)
+    questions = list(probes)
+    print(f"\nExact-term questions: {len(questions)} (e.g. {questions[0]!r})" if questions else "\nNo exact-term questions")
+
+    print(f"\n{'mode':>8} {'hit@' + str(args.k):>7} {'MRR':>6}  latency per question")
+    for mode in RETRIEVAL_MODES:
+        hits, rr, latency = 0, 0.0, []
+        for question in questions:
+            start = time.perf_counter()
+            ranked = [c.id for c, _ in index.query(question, k=args.k, mode=mode)]
+            latency.append((time.perf_counter() - start) * 1000)
+            rank = next((i for i, cid in enumerate(ranked) if cid in probes[question]), None)
+            if rank is not None:
+                hits += 1
+                rr += 1.0 / (rank + 1)
+        n = max(len(questions), 1)
+        print(f"{mode:>8} {hits / n:7.3f} {rr / n:6.3f}  {percentiles(latency) if latency else '-'}")
+
+    search_ms = []
+    for question in questions:
+        start = time.perf_counter()
+        bm25.search(question, args.k * 4)
+        search_ms.append((time.perf_counter() - start) * 1000)
+    if search_ms:
+        print(f"\nBM25 search alone: {percentiles(search_ms)}")
+
+    # Incremental maintenance: replace the last 5% of chunks
+    tail = chunks[-max(len(chunks) // 20, 1) :]
+    start = time.perf_counter()
+    bm25.remove(range(len(chunks) - len(tail), len(chunks)))
+    bm25.add(c.text for c in tail)
+    update_s = time.perf_counter() - start
+    start = time.perf_counter()
+    bm25.compact()
+    print(f"Update of {len(tail)} chunks: {update_s * 1000:.1f} ms, compaction {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    path = Path(tempfile.mkdtemp(prefix="bm25_"))
+    start = time.perf_counter()
+    files = bm25.save(path, "bench")
+    save_s = time.perf_counter() - start
+    start = time.perf_counter()
+    BM25Index.load(path, files, mmap=True)
+    size = sum((path / name).stat().st_size for name in files.values())
+    print(f"Save {save_s * 1000:.1f} ms, mmap load {(time.perf_counter() - start) * 1000:.1f} ms, {size / 2**10:.0f} KiB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+
+# (label, module, extra sys.path entry)
+TARGETS = [
+    ("src", "src", None),
+    ("cli", "src.app.cli", None),
+    ("ui_app", "src.app.ui_app", None),
+    ("run_reporting_cycle", "run_reporting_cycle", CURRENT_DIR),
+]
+
+
+def import_profile(module: str, extra_path) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """
+    Import `module` in a fresh interpreter under -X importtime.
+    Returns its cumulative import time (ms) and (self_us, cumulative_us, name) rows.
+    """
+    code = ""
+    if extra_path is not None:
+        code += f"import sys; sys.path.insert(0, {str(extra_path)!r})\n"
+    code += f"import {module}\n"
+
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows: List[Tuple[int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+
+    total_us = next(cum for _, cum, name in reversed(rows) if name == module)
+    return total_us / 1000, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time budget check for entry points.")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="per entry point")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per target")
+    args = parser.parse_args()
+
+    over_budget = []
+    for label, module, extra_path in TARGETS:
+        try:
+            total_ms, rows = import_profile(module, extra_path)
+        except RuntimeError as e:
+            print(f"{label:>20}: skipped ({str(e).splitlines()[-1]})")
+            continue
+
+        status = "ok" if total_ms <= args.budget_ms else "OVER BUDGET"
+        print(f"{label:>20}: {total_ms:8.1f} ms  [{status}]")
+        # Slowest top-level packages pulled in by the target (after interpreter startup)
+        startup = max((i for i, r in enumerate(rows) if r[2] == "site"), default=-1)
+        top_level = [r for r in rows[startup + 1 :] if "." not in r[2] and r[2] != module]
+        for _, cum, name in sorted(top_level, key=lambda r: -r[1])[: args.top]:
+            print(f"{'':>22}{cum / 1000:8.1f} ms  {name}")
+        if total_ms > args.budget_ms:
+            over_budget.append(label)
+
+    if over_budget:
+        print(f"\nOver the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import PROCESSED_DIR
+from src.models import Chunk
+from src.retrieval.index import ChunkIndex
+
+# Run in a fresh interpreter so the timing includes imports, as a CLI/UI cold start would
+LOAD_SNIPPET = """
+import os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.retrieval.index import ChunkIndex
+index = ChunkIndex.load({path!r}, mmap={mmap}, embedding_model="bench")
+loaded = time.perf_counter() - start
+index.chunks_by_id[index.chunk_ids[-1]]
+with open("/proc/self/statm") as f:  # resident pages (Linux)
+    rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+print(loaded, rss)
+"""
+
+
+def load_chunks(path: Path, copies: int) -> List[Chunk]:
+    with path.open("r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    return [Chunk(**{**row, "id": f"{row['id']}-{n}"}) for n in range(copies) for row in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index snapshot save/load versus rebuild.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="chunks_*.jsonl file")
+    parser.add_argument("--copies", type=int, default=50, help="times each chunk is repeated")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument(
+        "--encode",
+        action="store_true",
+        help="time a real rebuild (re-embedding every chunk) instead of using random vectors",
+    )
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))[-1]
+    chunks = load_chunks(snapshot, args.copies)
+    print(f"{len(chunks)} chunks ({snapshot.name} x{args.copies})")
+
+    index = ChunkIndex()
+    start = time.perf_counter()
+    if args.encode:
+        index.build(chunks)
+    else:
+        vectors = np.random.default_rng(0).normal(size=(len(chunks), args.dim)).astype("float32")
+        index.build(chunks, vectors=vectors)
+    print(f"build:          {time.perf_counter() - start:8.3f}s{'' if args.encode else ' (random vectors, no encoding)'}")
+
+    path = Path(tempfile.mkdtemp(prefix="index_snapshot_"))
+    start = time.perf_counter()
+    index.save(path, embedding_model="bench")
+    size = sum(p.stat().st_size for p in path.iterdir())
+    print(f"save:           {time.perf_counter() - start:8.3f}s  {size / 2**20:.1f} MiB in {path}")
+
+    for mmap in (False, True):
+        out = subprocess.run(
+            [sys.executable, "-c", LOAD_SNIPPET.format(root=str(PROJECT_ROOT), path=str(path), mmap=mmap)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        print(f"load mmap={str(mmap):<5}: {float(out[0]):8.3f}s  RSS {int(out[1]) / 2**20:.0f} MiB (incl. imports)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+import numpy as np
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Time real encoder passes, not cache lookups
+os.environ.setdefault("EMBEDDING_CACHE", "off")
+
+from src.config import CHAT_DIR
+from src.data.storage import load_latest_articles
+from src.processing.chunking import semantic_chunk_corpus_with_vectors, split_sentences
+from src.retrieval.index import ChunkIndex
+
+
+def chat_questions() -> List[str]:
+    questions: List[str] = []
+    for path in sorted(CHAT_DIR.glob("chat_*.json")):
+        questions.extend(turn["question"] for turn in json.loads(path.read_text(encoding="utf-8")))
+    return list(dict.fromkeys(q for q in questions if q.strip()))
+
+
+def sentence_probes(chunks) -> Dict[str, Set[str]]:
+    """
+    Known-item queries: the longest sentence of each chunk, mapped to every
+    chunk that contains it (overlapping chunks share sentences).
+    """
+    probes: Dict[str, Set[str]] = {}
+    for c in chunks:
+        sentences = split_sentences(c.text)
+        if len(sentences) >= 2:
+            probes.setdefault(max(sentences, key=len), set())
+    for c in chunks:
+        for probe, owners in probes.items():
+            if probe in c.text:
+                owners.add(c.id)
+    return probes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare index vectors: re-encoded chunk texts vs pooled sentence vectors."
+    )
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    articles = load_latest_articles()
+    per_article, pooled = semantic_chunk_corpus_with_vectors(articles)
+    chunks = [c for cs in per_article for c in cs]
+    print(f"{len(articles)} articles -> {len(chunks)} chunks")
+
+    indexes = {}
+    for mode in ("encode", "pooled"):
+        index = ChunkIndex()
+        start = time.perf_counter()
+        index.build(chunks, vectors=pooled if mode == "pooled" else None)
+        print(f"{mode:>7} build: {time.perf_counter() - start:6.2f}s")
+        indexes[mode] = index
+
+    agreement = np.sum(indexes["encode"].vectors * indexes["pooled"].vectors, axis=1)
+    print(f"\ncosine(encoded, pooled) per chunk: mean {agreement.mean():.3f}  min {agreement.min():.3f}")
+
+    probes = sentence_probes(chunks)
+    print(f"\nKnown-item retrieval ({len(probes)} sentence probes, k={args.k}):")
+    for mode, index in indexes.items():
+        hits, rr = 0, 0.0
+        batched = index.query_many(list(probes), k=args.k)
+        for owners, results in zip(probes.values(), batched):
+            ranked = [c.id for c, _ in results]
+            rank = next((i for i, cid in enumerate(ranked) if cid in owners), None)
+            if rank is not None:
+                hits += 1
+                rr += 1.0 / (rank + 1)
+        print(f"{mode:>7}: hit@{args.k} {hits / len(probes):.3f}  MRR {rr / len(probes):.3f}")
+
+    questions = chat_questions()
+    if questions:
+        overlap = []
+        encoded = indexes["encode"].query_many(questions, k=args.k)
+        pooled_results = indexes["pooled"].query_many(questions, k=args.k)
+        for ra, rb in zip(encoded, pooled_results):
+            a = {c.id for c, _ in ra}
+            b = {c.id for c, _ in rb}
+            overlap.append(len(a & b) / max(len(a), 1))
+        print(
+            f"\nChat questions ({len(questions)}): pooled top-{args.k} shares "
+            f"{np.mean(overlap):.0%} of the encoded top-{args.k}"
+        )
+
+
+if __name__ == "__main__":
+    main()
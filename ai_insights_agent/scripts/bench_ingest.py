@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Measure the transport, not the response cache
+os.environ.setdefault("HTTP_CACHE_MODE", "off")
+
+from src.config import INDEX_VECTOR_SOURCE, RAW_DIR
+from src.data.storage import load_raw_html
+from src.models import Article
+from src.scraping import collect_articles
+from src.scraping.collector import _parser_for, parse_documents
+from src.scraping.fetch import HostThrottle, configure_transport
+from src.scraping.replay import HttpArchive
+from src.processing.chunking import semantic_chunk_corpus_with_vectors
+from src.retrieval.index import ChunkIndex
+
+
+def seed_archive(archive: HttpArchive, snapshot: Path, copies: int) -> List[Tuple[str, str]]:
+    """
+    Fill a replay archive from a raw article snapshot. With copies > 1 each page
+    is also served under `?copy=<n>` URLs to emulate a larger crawl.
+    """
+    sources: List[Tuple[str, str]] = []
+    with snapshot.open("r", encoding="utf-8") as f:
+        for line in f:
+            art = Article(**json.loads(line))
+            html = load_raw_html(art)
+            if not html:
+                continue
+            for n in range(copies):
+                url = str(art.url) if n == 0 else f"{art.url}?copy={n}"
+                archive.add(url, html, headers={"Content-Type": "text/html; charset=utf-8"})
+                sources.append((art.source, url))
+    return sources
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="End-to-end ingest benchmark (fetch+parse -> chunk -> index) over replayed HTTP."
+    )
+    parser.add_argument("--snapshot", type=Path, default=None, help="articles_*.jsonl to seed from")
+    parser.add_argument("--archive", type=Path, default=None, help="replay archive (default: temp dir)")
+    parser.add_argument("--copies", type=int, default=4, help="times each page is served")
+    parser.add_argument("--latency", type=float, default=0.05, help="synthetic seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=8, help="fetch workers")
+    parser.add_argument("--parse-workers", type=int, default=1)
+    parser.add_argument(
+        "--vectors",
+        choices=["encode", "pooled"],
+        default=INDEX_VECTOR_SOURCE,
+        help="index vectors: re-encode chunk texts or reuse pooled sentence vectors",
+    )
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(RAW_DIR.glob("articles_*.jsonl"))[-1]
+    archive_dir = args.archive or Path(tempfile.mkdtemp(prefix="http_archive_"))
+    archive = HttpArchive(archive_dir)
+    sources = seed_archive(archive, snapshot, args.copies)
+    configure_transport("replay", archive_dir, latency=args.latency, jitter=args.jitter)
+    print(
+        f"Replaying {len(sources)} pages from {archive_dir} "
+        f"(latency {args.latency * 1000:.0f}ms +{args.jitter * 1000:.0f}ms jitter)"
+    )
+
+    timings = {}
+
+    start = time.perf_counter()
+    articles = collect_articles(
+        max_workers=args.workers,
+        throttle=HostThrottle(max_concurrency=args.workers, min_interval=0.0),
+        parse_workers=args.parse_workers,
+        sources=sources,
+    )
+    timings["fetch+parse"] = time.perf_counter() - start
+
+    # Parse alone, on the archived bodies, to split the collect stage
+    docs = [
+        (source, url, _parser_for(source), archive.get(url)["body"]) for source, url in sources
+    ]
+    start = time.perf_counter()
+    parse_documents(docs, workers=args.parse_workers)
+    timings["  parse only"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_article, vectors = semantic_chunk_corpus_with_vectors(articles)
+    chunks = [c for chunks in per_article for c in chunks]
+    timings["chunk"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ChunkIndex().build(chunks, vectors=vectors if args.vectors == "pooled" else None)
+    timings["index"] = time.perf_counter() - start
+
+    total = timings["fetch+parse"] + timings["chunk"] + timings["index"]
+    print(f"\n{len(articles)} articles -> {len(chunks)} chunks in {total:.2f}s")
+    for stage, seconds in timings.items():
+        print(f"{stage:>12}: {seconds:7.2f}s")
+    print(f"\n{'pages/s':>12}: {len(articles) / total:7.1f}")
+    print(f"{'chunks/s':>12}: {len(chunks) / total:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
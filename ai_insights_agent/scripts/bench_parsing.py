@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import GOVUK_SOURCE_NAME, RAW_DIR
+from src.data.storage import load_raw_html
+from src.models import Article
+from src.scraping.collector import parse_documents
+from src.scraping.html_backends import available_backends, extract_page
+from src.scraping.parse_govuk import GOVUK_CONTAINERS, parse_govuk_article
+
+
+def load_pages(path: Path) -> List[Tuple[str, str]]:
+    pages = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            art = Article(**json.loads(line))
+            pages.append((str(art.url), load_raw_html(art)))
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="articles_*.jsonl file")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--copies", type=int, default=8, help="corpus copies for the pool run")
+    parser.add_argument("--workers", type=int, default=0, help="pool size (0 = CPU count)")
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(RAW_DIR.glob("articles_*.jsonl"))[-1]
+    pages = load_pages(snapshot)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"Snapshot: {snapshot.name} ({len(pages)} pages, {total_kb:.0f} KB)")
+
+    # Per-backend single-process throughput + parity against the bs4 reference
+    reference = [extract_page(html, GOVUK_CONTAINERS, backend="bs4") for _, html in pages]
+    for backend in available_backends():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = [extract_page(html, GOVUK_CONTAINERS, backend=backend) for _, html in pages]
+        elapsed = (time.perf_counter() - start) / args.repeat
+        identical = results == reference
+        print(
+            f"{backend:>5}: {elapsed * 1000:8.1f} ms/corpus  "
+            f"{total_kb / elapsed / 1024:6.1f} MB/s  identical={identical}"
+        )
+
+    # Parse stage: inline vs process pool over a replicated corpus
+    docs = [(GOVUK_SOURCE_NAME, url, parse_govuk_article, html) for url, html in pages] * args.copies
+    for label, workers in (("inline", 1), ("pool", args.workers)):
+        start = time.perf_counter()
+        parse_documents(docs, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>6}: {len(docs)} docs in {elapsed:.2f}s ({len(docs) / elapsed:.1f} docs/s)")
+
+
+if __name__ == "__main__":
+    main()
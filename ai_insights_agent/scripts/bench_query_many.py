@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Query texts repeat between the two runs; without this the second run is all cache hits
+os.environ.setdefault("EMBEDDING_CACHE", "off")
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import PROCESSED_DIR
+from src.models import Chunk
+from src.retrieval.index import ChunkIndex
+
+
+def question_set(chunks: List[Chunk], n: int) -> List[str]:
+    # First sentence of each chunk, cycled up to n questions
+    firsts = [c.text.split(". ")[0][:300] for c in chunks if c.text.strip()]
+    return [firsts[i % len(firsts)] for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ChunkIndex.query in a loop versus query_many.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="chunks_*.jsonl file")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))[-1]
+    with snapshot.open("r", encoding="utf-8") as f:
+        chunks = [Chunk(**json.loads(line)) for line in f]
+    index = ChunkIndex()
+    index.build(chunks)
+    questions = question_set(chunks, args.queries)
+    print(f"{len(chunks)} chunks ({snapshot.name}), {len(questions)} questions, k={args.k}")
+
+    start = time.perf_counter()
+    looped = [index.query(q, k=args.k) for q in questions]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = index.query_many(questions, k=args.k)
+    batch_s = time.perf_counter() - start
+
+    same = sum(
+        [c.id for c, _ in a] == [c.id for c, _ in b] for a, b in zip(looped, batched)
+    )
+    print(f"query loop: {loop_s:7.2f}s  ({1000 * loop_s / len(questions):.2f} ms/question)")
+    print(f"query_many: {batch_s:7.2f}s  ({1000 * batch_s / len(questions):.2f} ms/question)")
+    print(f"speedup {loop_s / batch_s:.1f}x; identical top-{args.k} for {same}/{len(questions)} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+# Questions repeat across runs; without this later runs are all cache hits
+os.environ.setdefault("EMBEDDING_CACHE", "off")
+
+# Make project root importable so `src` works when running this script directly
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import PROCESSED_DIR
+from src.models import Chunk
+from src.retrieval.index import ChunkIndex
+from src.retrieval.scheduler import QueryScheduler
+
+
+def run_clients(ask: Callable[[str], object], questions: List[str], clients: int) -> tuple:
+    """
+    `clients` threads each ask their share of `questions` back to back.
+    Returns (wall seconds, per-question latencies in ms).
+    """
+    latencies: List[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(mine: List[str]) -> None:
+        barrier.wait()
+        for q in mine:
+            start = time.perf_counter()
+            ask(q)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(questions[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent QA retrieval: direct ChunkIndex.query vs QueryScheduler.")
+    parser.add_argument("--snapshot", type=Path, default=None, help="chunks_*.jsonl file")
+    parser.add_argument("--questions", type=int, default=400)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot = args.snapshot or sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))[-1]
+    with snapshot.open("r", encoding="utf-8") as f:
+        chunks = [Chunk(**json.loads(line)) for line in f]
+    index = ChunkIndex()
+    index.build(chunks)
+    firsts = [c.text.split(". ")[0][:300] for c in chunks if c.text.strip()]
+    questions = [firsts[i % len(firsts)] for i in range(args.questions)]
+    print(f"{len(chunks)} chunks ({snapshot.name}), {len(questions)} questions, k={args.k}")
+
+    print(f"{'clients':>7} {'mode':>9} {'q/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'batch':>6}")
+    for clients in args.clients:
+        wall, lat = run_clients(lambda q: index.query(q, k=args.k), questions, clients)
+        print(
+            f"{clients:7d} {'direct':>9} {len(questions) / wall:8.1f} "
+            f"{np.percentile(lat, 50):8.2f} {np.percentile(lat, 99):8.2f} {1:6.1f}"
+        )
+
+        scheduler = QueryScheduler(index)
+        wall, lat = run_clients(lambda q: scheduler.query(q, k=args.k), questions, clients)
+        scheduler.close()
+        print(
+            f"{clients:7d} {'scheduler':>9} {len(questions) / wall:8.1f} "
+            f"{np.percentile(lat, 50):8.2f} {np.percentile(lat, 99):8.2f} "
+            f"{scheduler.queries / max(scheduler.batches, 1):6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
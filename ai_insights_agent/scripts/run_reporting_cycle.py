@@ -1,6 +1,9 @@
+import argparse
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 # Make project root importable so `src` works when running this script directly
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -8,35 +11,199 @@ PROJECT_ROOT = CURRENT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.config import INDEX_DIR, INDEX_SNAPSHOT, INDEX_VECTOR_SOURCE
 from src.logging_utils import get_logger
 from src.scraping import collect_articles
-from src.processing.chunking import semantic_chunk
+from src.scraping.collector import FrontierCrawl, iter_articles, seed_frontier
+from src.scraping.frontier import CrawlFrontier
+from src.processing.chunking import semantic_chunk_corpus_with_vectors
+from src.processing.incremental import (
+    ChunkDelta,
+    apply_chunk_delta,
+    build_chunk_delta,
+    diff_articles,
+)
+from src.retrieval.index import ChunkIndex
 from src.models import Chunk
-from src.data.storage import save_articles, save_chunks
+from src.data.storage import (
+    iter_latest_articles,
+    load_chunkless_ids,
+    load_latest_articles,
+    load_latest_chunks,
+    save_articles,
+    save_chunkless_ids,
+    save_chunks,
+)
+from src.pipeline import stream_ingest
 from src.reporting.generate_report import generate_and_save_report
 
 logger = get_logger(__name__)
 
 
-def main() -> None:
-    logger.info("Starting reporting cycle...")
-    articles = collect_articles()
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run one ingest + reporting cycle.")
+    parser.add_argument(
+        "--mode",
+        choices=["incremental", "full", "stream"],
+        default="incremental",
+        help=(
+            "incremental: re-chunk only new/modified articles and patch the index snapshot; "
+            "full: re-chunk the whole corpus; "
+            "stream: like full, but articles flow through fetch/parse, chunk, embed, "
+            "index and persist in bounded batches with the stages running concurrently"
+        ),
+    )
+    parser.add_argument(
+        "--frontier",
+        action="store_true",
+        help=(
+            "crawl only URLs that are due according to the persistent crawl frontier "
+            "(configured URLs are seeded into it); others keep their last snapshot"
+        ),
+    )
+    return parser.parse_args()
+
+
+def run_full(articles) -> Tuple[List[Chunk], np.ndarray]:
+    per_article, vectors = semantic_chunk_corpus_with_vectors(articles)
+    return [c for chunks in per_article for c in chunks], vectors
+
+
+def run_incremental(articles) -> Optional[Tuple[List[Chunk], ChunkDelta]]:
+    """
+    Diff against the previous snapshot and chunk only what changed.
+    Returns the new chunk set and the delta, or None when nothing changed.
+    """
+    diff = diff_articles(articles, load_latest_articles())
+    previous_chunks = load_latest_chunks()
+    delta = build_chunk_delta(diff, previous_chunks, chunkless_ids=load_chunkless_ids())
+    if diff.is_empty and delta.is_empty:
+        # Articles re-chunked to nothing must not be retried next cycle
+        save_chunkless_ids(delta.chunkless_ids)
+        return None
+
+    all_chunks = apply_chunk_delta(
+        previous_chunks,
+        delta,
+        article_order=[a.id for a in articles],
+    )
+    return all_chunks, delta
+
+
+def run_stream(articles) -> Optional[List[Chunk]]:
+    """
+    Streaming full cycle; snapshots are written by the pipeline itself.
+    Returns None when no articles, or no chunks, were collected.
+    """
+    result = stream_ingest(articles)
+    if result is None:
+        return None
+    if INDEX_SNAPSHOT == "on":
+        result.index.save(INDEX_DIR)
+    return result.index.all_chunks()
+
+
+def save_index_snapshot(
+    all_chunks: List[Chunk],
+    vectors: Optional[np.ndarray] = None,
+    delta: Optional[ChunkDelta] = None,
+) -> None:
+    """
+    Refresh the index snapshot the CLI and UI load at startup. With a delta the
+    previous snapshot is patched (only added chunks are embedded, or take their
+    pooled vectors when INDEX_VECTOR_SOURCE is "pooled"); otherwise, or if that
+    snapshot is missing or out of step, the index is rebuilt.
+    """
+    if INDEX_SNAPSHOT != "on":
+        return
+    pooled = INDEX_VECTOR_SOURCE == "pooled"
+    index: Optional[ChunkIndex] = None
+    if delta is not None:
+        try:
+            # load() rejects a snapshot built from the other vector source
+            index = ChunkIndex.load(INDEX_DIR)
+            if pooled and delta.added and delta.vectors is None:
+                raise ValueError("the delta has no pooled vectors")
+            index.apply_delta(delta.added, delta.removed_ids, vectors=delta.vectors if pooled else None)
+            if set(index.chunk_ids) != {c.id for c in all_chunks}:
+                logger.info("Index snapshot does not match the previous chunks; rebuilding it")
+                index = None
+        except (FileNotFoundError, ValueError) as e:
+            logger.info("No usable index snapshot (%s); rebuilding it", e)
+            index = None
+
+    vector_source = INDEX_VECTOR_SOURCE
+    if index is None:
+        if pooled and vectors is None:
+            # Pooled vectors only exist for chunks made this cycle
+            logger.warning("No pooled vectors for the whole corpus; rebuilding from chunk texts (run --mode full)")
+            vector_source = "encode"
+        index = ChunkIndex()
+        index.build(all_chunks, vectors=vectors if vector_source == "pooled" else None)
+    index.save(INDEX_DIR, vector_source=vector_source)
+
+
+def run_cycle(mode: str, crawl: Optional[FrontierCrawl] = None) -> None:
+    """
+    One ingest + reporting cycle. With a frontier crawl, its leases are only
+    completed once the new snapshots are saved.
+    """
+    if mode == "stream":
+        all_chunks = run_stream(crawl.stream() if crawl else iter_articles())
+        if all_chunks is None:
+            logger.warning("No articles or chunks collected; aborting.")
+            return
+        if crawl is not None:
+            crawl.complete()
+        report = generate_and_save_report(all_chunks)
+        logger.info("Reporting cycle complete. Report id=%s", report.id)
+        return
+
+    articles = crawl.collect() if crawl else collect_articles()
     if not articles:
         logger.warning("No articles collected; aborting.")
         return
 
-    save_articles(articles)
-
-    all_chunks: List[Chunk] = []
-    for art in articles:
-        chs = semantic_chunk(art)
-        all_chunks.extend(chs)
+    vectors: Optional[np.ndarray] = None
+    delta: Optional[ChunkDelta] = None
+    if mode == "full":
+        all_chunks, vectors = run_full(articles)
+    else:
+        changes = run_incremental(articles)
+        if changes is None:
+            logger.info("No article changes since the last snapshot; skipping cycle.")
+            if crawl is not None:
+                # The saved snapshot already holds what was crawled
+                crawl.complete()
+            return
+        all_chunks, delta = changes
 
+    save_articles(articles)
     save_chunks(all_chunks)
+    chunked = {c.article_id for c in all_chunks}
+    save_chunkless_ids(a.id for a in articles if a.id not in chunked)
+    save_index_snapshot(all_chunks, vectors=vectors, delta=delta)
+    if crawl is not None:
+        crawl.complete()
 
     report = generate_and_save_report(all_chunks)
     logger.info("Reporting cycle complete. Report id=%s", report.id)
 
 
+def main() -> None:
+    args = parse_args()
+    logger.info("Starting reporting cycle (mode=%s)...", args.mode)
+    if not args.frontier:
+        run_cycle(args.mode)
+        return
+
+    frontier = CrawlFrontier()
+    try:
+        seed_frontier(frontier)
+        run_cycle(args.mode, FrontierCrawl(frontier, previous=iter_latest_articles()))
+    finally:
+        frontier.close()
+
+
 if __name__ == "__main__":
     main()
@@ -1,11 +1,11 @@
 from datetime import datetime
 from typing import List, Tuple
 
-from ..config import TOPIC
+from ..config import INDEX_DIR, INDEX_SNAPSHOT, INDEX_VECTOR_SOURCE, TOPIC
 from ..logging_utils import get_logger
 from ..models import Chunk, ConversationTurn
 from ..scraping import collect_articles
-from ..processing.chunking import semantic_chunk
+from ..processing.chunking import semantic_chunk_corpus_with_vectors
 from ..retrieval.index import ChunkIndex
 from ..llm import chat_completion, load_prompt, format_system_user
 
@@ -21,8 +21,8 @@ def build_knowledge_base() -> Tuple[ChunkIndex, List[Chunk]]:
     logger.info("Fetched %d articles", len(articles))
 
     all_chunks: List[Chunk] = []
-    for art in articles:
-        chunks = semantic_chunk(art)
+    per_article, vectors = semantic_chunk_corpus_with_vectors(articles)
+    for art, chunks in zip(articles, per_article):
         logger.info(
             "Source=%s, title='%s', chunks=%d",
             art.source,
@@ -32,17 +32,39 @@ def build_knowledge_base() -> Tuple[ChunkIndex, List[Chunk]]:
         all_chunks.extend(chunks)
 
     index = ChunkIndex()
-    index.build(all_chunks)
+    index.build(all_chunks, vectors=vectors if INDEX_VECTOR_SOURCE == "pooled" else None)
     logger.info("Vector index built.")
 
     return index, all_chunks
 
 
+def load_knowledge_base() -> ChunkIndex:
+    """
+    Load the saved index snapshot when it matches the configured embedding
+    model; otherwise build the knowledge base and save a snapshot for next time.
+    Chunks of a loaded snapshot are only read when a query returns them.
+    """
+    if INDEX_SNAPSHOT == "on":
+        try:
+            return ChunkIndex.load(INDEX_DIR)
+        except (FileNotFoundError, ValueError) as e:
+            logger.info("No usable index snapshot (%s); building the knowledge base", e)
+
+    index, _ = build_knowledge_base()
+    if INDEX_SNAPSHOT == "on":
+        index.save(INDEX_DIR)
+    return index
+
+
 def build_qa_prompt_with_history(
     question: str,
     retrieved: List[Tuple[Chunk, float]],
     history: List[ConversationTurn],
 ) -> str:
+    # Scores are cosine similarities (BM25 with RETRIEVAL_MODE=lexical). Chunks
+    # keep retrieval order, which in hybrid mode is the fused rank, so the
+    # scores are not necessarily sorted.
+
     # Last N turns
     recent = history[-3:]
 
@@ -99,7 +121,7 @@ def answer_question(
 
 def main() -> None:
     logger.info("Starting AI Regulation Insights Agent (CLI)...")
-    index, _ = build_knowledge_base()
+    index = load_knowledge_base()
     history: List[ConversationTurn] = []
 
     print()
@@ -1,7 +1,7 @@
 import sys
 from pathlib import Path
 from textwrap import shorten
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import streamlit as st
 
@@ -13,12 +13,13 @@ PROJECT_ROOT = CURRENT_DIR.parent.parent               # .../ai_insights_agent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.config import TOPIC
+from src.config import INDEX_DIR, INDEX_SNAPSHOT, INDEX_VECTOR_SOURCE, TOPIC
 from src.logging_utils import get_logger
 from src.models import Chunk, Report
 from src.scraping import collect_articles
-from src.processing.chunking import semantic_chunk
+from src.processing.chunking import semantic_chunk_corpus_with_vectors
 from src.retrieval.index import ChunkIndex
+from src.retrieval.scheduler import QueryScheduler
 from src.llm import chat_completion, load_prompt, format_system_user
 from src.data.storage import (
     load_all_reports,
@@ -161,13 +162,48 @@ CUSTOM_CSS = """
 # Knowledge base construction
 # -------------------------------------------------------------------
 @st.cache_resource(show_spinner=True)
+def load_knowledge_base() -> ChunkIndex:
+    """
+    Memory-mapped index snapshot when one matches the configured embedding
+    model (shared by all UI workers), otherwise a fresh build that is saved.
+    Chunks of a loaded snapshot are only read when a view needs them.
+    """
+    if INDEX_SNAPSHOT == "on":
+        try:
+            return ChunkIndex.load(INDEX_DIR)
+        except (FileNotFoundError, ValueError) as e:
+            logger.info("No usable index snapshot (%s); building the knowledge base", e)
+
+    index, _ = build_knowledge_base()
+    if INDEX_SNAPSHOT == "on":
+        index.save(INDEX_DIR)
+    return index
+
+
+@st.cache_resource(show_spinner=False)
+def query_scheduler() -> QueryScheduler:
+    """
+    One scheduler per UI process, so questions from concurrent sessions share
+    batched embedding and search calls.
+    """
+    return QueryScheduler(load_knowledge_base())
+
+
+@st.cache_resource(show_spinner=False)
+def count_articles() -> int:
+    """
+    Articles with indexed chunks. Reads every chunk, so it is only run on request.
+    """
+    return len({c.article_id for c in load_knowledge_base().all_chunks()})
+
+
 def build_knowledge_base() -> Tuple[ChunkIndex, List[Chunk]]:
     logger.info("Building knowledge base for UI...")
     articles = collect_articles()
 
     all_chunks: List[Chunk] = []
-    for art in articles:
-        chunks = semantic_chunk(art)
+    per_article, vectors = semantic_chunk_corpus_with_vectors(articles)
+    for art, chunks in zip(articles, per_article):
         logger.info(
             "Source=%s | title='%s' | chunks=%d",
             art.source,
@@ -177,7 +213,7 @@ def build_knowledge_base() -> Tuple[ChunkIndex, List[Chunk]]:
         all_chunks.extend(chunks)
 
     index = ChunkIndex()
-    index.build(all_chunks)
+    index.build(all_chunks, vectors=vectors if INDEX_VECTOR_SOURCE == "pooled" else None)
     logger.info("Knowledge base built with %d chunks", len(all_chunks))
     return index, all_chunks
 
@@ -189,6 +225,10 @@ def build_qa_prompt_with_history(
 ) -> str:
     """
     Build the user prompt including last N turns of conversation and retrieved chunks.
+
+    Chunks keep retrieval order. Scores are cosine similarities (BM25 with
+    RETRIEVAL_MODE=lexical); in hybrid mode the order is the fused rank, so
+    the scores are not necessarily sorted.
     """
     recent = chat_history[-3:]
 
@@ -228,7 +268,7 @@ def is_trend_question(question: str) -> bool:
 
 def answer_question(
     question: str,
-    index: ChunkIndex,
+    index: Union[ChunkIndex, QueryScheduler],
     chat_history: List[dict],
 ) -> Tuple[str, List[Tuple[Chunk, float]]]:
     """
@@ -299,7 +339,8 @@ def main() -> None:
 
     # Ensure KB is ready once, shared across tabs
     with st.spinner("Preparing knowledge base..."):
-        index, chunks = build_knowledge_base()
+        index = load_knowledge_base()
+        retriever = query_scheduler()  # built from the same cached index
 
     # ----------------- Chat tab -----------------
     with tab_chat:
@@ -334,7 +375,7 @@ def main() -> None:
                     with st.spinner("Analysing relevant documents..."):
                         answer, retrieved = answer_question(
                             question=question,
-                            index=index,
+                            index=retriever,
                             chat_history=st.session_state.chat_history,
                         )
                         st.markdown(answer)
@@ -388,7 +429,7 @@ def main() -> None:
         with col_left:
             if st.button("Generate report from latest knowledge base"):
                 with st.spinner("Generating report..."):
-                    report = generate_and_save_report(chunks)
+                    report = generate_and_save_report(index.all_chunks())
                 st.success(f"Report generated: {report.id}")
 
         reports = load_all_reports()
@@ -428,8 +469,10 @@ def main() -> None:
             unsafe_allow_html=True,
         )
 
-        num_articles = len({c.article_id for c in chunks})
-        num_chunks = len(chunks)
+        chunk_ids = index.chunk_ids
+        num_chunks = len(chunk_ids)
+        show_articles = st.checkbox("Count ingested articles (reads every chunk)")
+        num_articles = count_articles() if show_articles else "–"
 
         st.markdown("<div class='metric-row'>", unsafe_allow_html=True)
         st.markdown(
@@ -455,7 +498,7 @@ def main() -> None:
         st.markdown("#### Sample chunks")
         st.caption("Example chunks showing how the text is split semantically rather than by fixed size.")
 
-        for c in chunks[:8]:
+        for c in (index.chunks_by_id[cid] for cid in chunk_ids[:8]):
             st.markdown(f"**article_id**: `{c.article_id}` | **order**: {c.order}")
             st.markdown(shorten(c.text, width=230))
             st.markdown("---")
@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Coalesce items submitted from many threads into batches for one handler.
+
+    A background thread waits for the first pending item, then keeps collecting
+    until the batch weighs `max_batch` (by `weight`, default 1 per item) or
+    `max_wait` seconds have passed since that first item. `handler` receives
+    the batch and must return one result per item, in order; an exception
+    instance in place of a result fails just that item. If the handler raises,
+    every item in the batch fails with that exception.
+
+    close() handles the items already submitted, then stops the thread; submit()
+    raises RuntimeError after that.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], List[R]],
+        max_batch: int = 64,
+        max_wait: float = 0.005,
+        weight: Callable[[T], int] = lambda item: 1,
+        name: str = "micro-batcher",
+    ) -> None:
+        self.handler = handler
+        self.max_batch = max(max_batch, 1)
+        self.max_wait = max(max_wait, 0.0)
+        self.weight = weight
+        self.batches = 0
+        self.items = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._carry: Optional[Tuple[T, Future]] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        future: "Future[R]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: T, timeout: Optional[float] = None) -> R:
+        return self.submit(item).result(timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self, first: Tuple[T, Future]) -> Tuple[List[Tuple[T, Future]], bool]:
+        batch = [first]
+        size = self.weight(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            item_size = self.weight(entry[0])
+            if size + item_size > self.max_batch:
+                self._carry = entry  # starts the next batch
+                break
+            batch.append(entry)
+            size += item_size
+        return batch, False
+
+    def _loop(self) -> None:
+        try:
+            self._run()
+        finally:
+            self._fail_pending(RuntimeError("MicroBatcher is closed"))
+
+    def _fail_pending(self, error: Exception) -> None:
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                pending.append(entry)
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            if self._carry is not None:
+                first, self._carry = self._carry, None
+            else:
+                first = self._queue.get()
+                if first is _STOP:
+                    return
+            batch, stop = self._collect(first)
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.handler(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"Batch handler returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                logger.warning("Batch of %d items failed: %s", len(items), e)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
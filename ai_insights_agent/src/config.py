@@ -9,8 +9,24 @@ PROCESSED_DIR = DATA_DIR / "processed"
 REPORTS_DIR = DATA_DIR / "reports"
 EXAMPLES_DIR = BASE_DIR / "examples"
 CHAT_DIR = DATA_DIR / "chat"
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+BLOB_DIR = DATA_DIR / "blobs"
+FRONTIER_DB_PATH = DATA_DIR / "frontier.sqlite3"
+HTTP_ARCHIVE_DIR = DATA_DIR / "http_archive"
+EMBEDDING_CACHE_DIR = DATA_DIR / "embedding_cache"
+INDEX_DIR = DATA_DIR / "index"
 
-for p in (DATA_DIR, RAW_DIR, PROCESSED_DIR, REPORTS_DIR, EXAMPLES_DIR, CHAT_DIR):
+for p in (
+    DATA_DIR,
+    RAW_DIR,
+    PROCESSED_DIR,
+    REPORTS_DIR,
+    EXAMPLES_DIR,
+    CHAT_DIR,
+    HTTP_CACHE_DIR,
+    BLOB_DIR,
+    EMBEDDING_CACHE_DIR,
+):
     p.mkdir(parents=True, exist_ok=True)
 
 # Topic
@@ -34,8 +50,111 @@ GOVUK_ARTICLE_URLS = [
     "use-of-biometrics-facial-recognition-and-similar-technologies",
 ]
 
+# How GOV.UK pages are ingested: "html" scrapes the rendered page,
+# "content_api" reads the structured JSON from https://www.gov.uk/api/content/...
+GOVUK_INGEST_MODE = os.getenv("GOVUK_INGEST_MODE", "html")
+
+# Fetching
+# Upper bound on concurrent page downloads across all hosts.
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+# Politeness: concurrent requests and minimum seconds between request starts, per host.
+FETCH_PER_HOST_CONCURRENCY = int(os.getenv("FETCH_PER_HOST_CONCURRENCY", "4"))
+FETCH_PER_HOST_MIN_INTERVAL = float(os.getenv("FETCH_PER_HOST_MIN_INTERVAL", "0.2"))
+
+# HTTP transport: "live", "record" (live + save responses to HTTP_ARCHIVE_DIR)
+# or "replay" (serve saved responses offline, with synthetic per-request latency).
+FETCH_TRANSPORT = os.getenv("FETCH_TRANSPORT", "live")
+HTTP_ARCHIVE_DIR = Path(os.getenv("HTTP_ARCHIVE_DIR", str(HTTP_ARCHIVE_DIR)))
+FETCH_REPLAY_LATENCY = float(os.getenv("FETCH_REPLAY_LATENCY", "0.0"))
+FETCH_REPLAY_JITTER = float(os.getenv("FETCH_REPLAY_JITTER", "0.0"))
+
+# Crawl frontier scheduling (seconds)
+FRONTIER_MIN_INTERVAL = float(os.getenv("FRONTIER_MIN_INTERVAL", str(60 * 60)))
+FRONTIER_MAX_INTERVAL = float(os.getenv("FRONTIER_MAX_INTERVAL", str(14 * 24 * 60 * 60)))
+FRONTIER_DEFAULT_INTERVAL = float(os.getenv("FRONTIER_DEFAULT_INTERVAL", str(24 * 60 * 60)))
+FRONTIER_LEASE_SECONDS = float(os.getenv("FRONTIER_LEASE_SECONDS", str(30 * 60)))
+# Politeness: at most this many URLs per host in one crawl batch
+FRONTIER_MAX_PER_HOST = int(os.getenv("FRONTIER_MAX_PER_HOST", "50"))
+
+# HTTP response cache (conditional GET).
+# Modes: "on" (revalidate stale entries), "offline" (serve cache only), "off".
+HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "on")
+HTTP_CACHE_TTL_SECONDS = int(os.getenv("HTTP_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Parsing
+# "bs4" (BeautifulSoup's html.parser) is the reference; "lxml" is faster and falls
+# back to bs4 on pages where it would close a <p> elsewhere, so text (and article
+# IDs) match. "auto" uses lxml when installed.
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto")
+# Processes for the parse stage (1 = parse inline, 0 = one per CPU). Small batches
+# are parsed inline either way.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+
+# Raw HTML blob store: "auto" uses zstd when the zstandard package is installed, else gzip.
+BLOB_COMPRESSION = os.getenv("BLOB_COMPRESSION", "auto")
+
 # Embeddings
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Encoder runtime: "torch" (sentence-transformers, reference) or "onnx" (ONNX Runtime;
+# needs onnxruntime + tokenizers). EMBEDDING_ONNX_FILE is a local path or a file in the
+# model's Hugging Face repo; the default is its int8-quantized export.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+# Intra-op threads for the encoder (0 = runtime default).
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("EMBEDDING_MAX_SEQ_LENGTH", "256"))
+# Texts per encoder batch; corpus-level chunking embeds all sentences in batches of this size.
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "128"))
+# Processes for sentence splitting and grouping in corpus chunking (1 = inline,
+# 0 = one per CPU). Sentences are still embedded once, by the calling process.
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", "1"))
+# Near-duplicate chunks (MinHash/LSH over word shingles): "drop" removes them before
+# indexing, "flag" keeps them with Chunk.duplicate_of set, "off" disables the check.
+# A chunk is a duplicate when this share of its shingles occurs in a kept chunk.
+CHUNK_DEDUP = os.getenv("CHUNK_DEDUP", "drop")
+CHUNK_DEDUP_THRESHOLD = float(os.getenv("CHUNK_DEDUP_THRESHOLD", "0.9"))
+# Streaming ingest (run_reporting_cycle.py --mode stream): articles chunked and embedded
+# per batch, and the max batches buffered between consecutive pipeline stages.
+STREAM_BATCH_ARTICLES = int(os.getenv("STREAM_BATCH_ARTICLES", "16"))
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "2"))
+# Chunk vectors for the index: "encode" re-encodes each chunk's text,
+# "pooled" reuses the mean of its sentence embeddings from chunking (no second encoder pass).
+INDEX_VECTOR_SOURCE = os.getenv("INDEX_VECTOR_SOURCE", "encode")
+# Saved ChunkIndex in INDEX_DIR: "on" loads it at startup (memory-mapped) when it matches
+# the configured embedding model and saves one after a rebuild; "off" always rebuilds.
+INDEX_SNAPSHOT = os.getenv("INDEX_SNAPSHOT", "on")
+# FAISS index type: "flat" (exact), "ivf_flat", "ivf_pq", "hnsw", or "auto" (by chunk count:
+# flat below 50k, HNSW below 1M, IVF-PQ above). Query-time knobs: IVF lists probed and HNSW
+# candidate list size. IVF/PQ training uses a random sample of at most INDEX_TRAIN_SAMPLE vectors.
+INDEX_TYPE = os.getenv("INDEX_TYPE", "auto")
+INDEX_NPROBE = int(os.getenv("INDEX_NPROBE", "16"))
+INDEX_EF_SEARCH = int(os.getenv("INDEX_EF_SEARCH", "64"))
+INDEX_HNSW_M = int(os.getenv("INDEX_HNSW_M", "32"))
+INDEX_TRAIN_SAMPLE = int(os.getenv("INDEX_TRAIN_SAMPLE", "100000"))
+# ChunkIndex.remove() leaves tombstones; compact once they exceed this share of rows.
+INDEX_COMPACT_RATIO = float(os.getenv("INDEX_COMPACT_RATIO", "0.2"))
+# ChunkIndex.query retrieval: "dense" (embeddings), "lexical" (BM25 over chunk
+# texts) or "hybrid" (both, fused by reciprocal rank; opt-in).
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense")
+# Shared local embedding server (python -m src.processing.embedding_server):
+# a Unix socket path or host:port. Empty = always encode in-process; when set but
+# unreachable, processes fall back to in-process encoding.
+EMBEDDING_SERVER_ADDRESS = os.getenv("EMBEDDING_SERVER_ADDRESS", "")
+# Server-side micro-batching: max texts per encoder call and max wait to fill it.
+EMBEDDING_SERVER_MAX_BATCH = int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", "256"))
+EMBEDDING_SERVER_MAX_WAIT_MS = float(os.getenv("EMBEDDING_SERVER_MAX_WAIT_MS", "5"))
+# Query scheduler (UI): concurrent questions are answered with one batched
+# embedding + search of up to QUERY_BATCH_MAX questions. 0 ms batches whatever
+# queued up while the previous batch ran (no added latency for a lone user);
+# a positive wait holds each batch open that long to collect more.
+QUERY_BATCH_MAX = int(os.getenv("QUERY_BATCH_MAX", "32"))
+QUERY_BATCH_MAX_WAIT_MS = float(os.getenv("QUERY_BATCH_MAX_WAIT_MS", "0"))
+# Persistent embedding cache keyed by model + normalised text ("on" / "off").
+EMBEDDING_CACHE = os.getenv("EMBEDDING_CACHE", "on")
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Vectors kept in the in-memory LRU in front of the on-disk store.
+EMBEDDING_CACHE_LRU_ITEMS = int(os.getenv("EMBEDDING_CACHE_LRU_ITEMS", "20000"))
 
 # LLM model names (can be overridden by env vars)
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
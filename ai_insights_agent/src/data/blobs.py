@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ..config import BLOB_COMPRESSION, BLOB_DIR
+from ..logging_utils import get_logger
+
+try:  # optional, faster and smaller than gzip
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+logger = get_logger(__name__)
+
+_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def blob_key(text: str) -> str:
+    """
+    Content address of a text blob (sha256 of its UTF-8 bytes).
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """
+    Content-addressed, compressed store for large text payloads (raw HTML).
+
+    Blobs live at <root>/<key[:2]>/<key><suffix>. Writing an existing key is a
+    no-op, so repeated snapshots of unchanged pages cost nothing. Either
+    compression format can be read back regardless of the configured one.
+    """
+
+    def __init__(self, root: Path = BLOB_DIR, compression: str = BLOB_COMPRESSION) -> None:
+        self.root = Path(root)
+        if compression == "auto":
+            compression = "zstd" if zstandard is not None else "gzip"
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unknown blob compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("BLOB_COMPRESSION=zstd but zstandard is not installed")
+        self.compression = compression
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str, compression: str) -> Path:
+        return self.root / key[:2] / f"{key}{_SUFFIXES[compression]}"
+
+    def _existing(self, key: str) -> Optional[Path]:
+        for compression in _SUFFIXES:
+            path = self._path(key, compression)
+            if path.exists():
+                return path
+        return None
+
+    def has(self, key: str) -> bool:
+        return self._existing(key) is not None
+
+    def put(self, text: str) -> str:
+        key = blob_key(text)
+        if self._existing(key) is not None:
+            return key
+
+        data = text.encode("utf-8")
+        if self.compression == "zstd":
+            payload = zstandard.ZstdCompressor(level=10).compress(data)
+        else:
+            payload = gzip.compress(data, compresslevel=6)
+
+        path = self._path(key, self.compression)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+        return key
+
+    def get(self, key: str) -> str:
+        path = self._existing(key)
+        if path is None:
+            raise KeyError(f"Blob not found: {key}")
+
+        payload = path.read_bytes()
+        if path.suffix == _SUFFIXES["zstd"]:
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            data = zstandard.ZstdDecompressor().decompress(payload)
+        else:
+            data = gzip.decompress(payload)
+        return data.decode("utf-8")
+
+
+_default_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = BlobStore()
+    return _default_store
@@ -2,10 +2,11 @@ import json
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional
 
 from ..config import RAW_DIR, PROCESSED_DIR, REPORTS_DIR, CHAT_DIR
 from ..models import Article, Chunk, Report
+from .blobs import get_blob_store
 from ..logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -15,34 +16,116 @@ def _timestamp() -> str:
     return datetime.utcnow().strftime("%Y%m%dT%H%M%S")
 
 
+class SnapshotWriter:
+    """
+    Write a `<prefix>_<timestamp>.jsonl` snapshot one record at a time.
+
+    Lines go to a hidden `.part` file that is renamed into place by close(),
+    so load_latest_* never picks up a snapshot that is still being written.
+    close() on an empty snapshot discards it and raises ValueError.
+    """
+
+    def __init__(self, directory: Path, prefix: str, timestamp: Optional[str] = None) -> None:
+        self.prefix = prefix
+        self.path = directory / f"{prefix}_{timestamp or _timestamp()}.jsonl"
+        self._tmp = self.path.with_name(f".{self.path.name}.part")
+        self._f = self._tmp.open("w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, data: dict) -> None:
+        self._f.write(json.dumps(data, default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> Path:
+        self._f.close()
+        if not self.count:
+            self._tmp.unlink()
+            raise ValueError(f"No {self.prefix} to save")
+        self._tmp.replace(self.path)
+        logger.info("Saved %d %s to %s", self.count, self.prefix, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._f.close()
+        self._tmp.unlink(missing_ok=True)
+
+
 # -------- Articles --------
 
-def save_articles(articles: Iterable[Article]) -> Path:
-    articles = list(articles)
-    if not articles:
-        raise ValueError("No articles to save")
+def article_record(art: Article) -> dict:
+    data = art.dict()
+    # Raw HTML goes to the blob store; the snapshot only keeps its key
+    html = data.pop("raw_html", None)
+    if html is not None and not data.get("raw_html_key"):
+        data["raw_html_key"] = get_blob_store().put(html)
+    return data
 
-    path = RAW_DIR / f"articles_{_timestamp()}.jsonl"
-    with path.open("w", encoding="utf-8") as f:
+
+def save_articles(articles: Iterable[Article]) -> Path:
+    writer = SnapshotWriter(RAW_DIR, "articles")
+    try:
         for art in articles:
-            f.write(json.dumps(art.dict(), default=str) + "\n")
-    logger.info("Saved %d articles to %s", len(articles), path)
-    return path
+            writer.write(article_record(art))
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def _read_articles(path: Path) -> Iterator[Article]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            data = json.loads(line)
+            # Older snapshots carry raw_html inline: move it to the blob store
+            html = data.pop("raw_html", None)
+            if html is not None and not data.get("raw_html_key"):
+                data["raw_html_key"] = get_blob_store().put(html)
+            yield Article(**data)
+
+
+def load_latest_articles() -> List[Article]:
+    files = sorted(RAW_DIR.glob("articles_*.jsonl"))
+    if not files:
+        return []
+
+    latest = files[-1]
+    articles = list(_read_articles(latest))
+    logger.info("Loaded %d articles from %s", len(articles), latest)
+    return articles
+
+
+def iter_latest_articles() -> Iterator[Article]:
+    """
+    Stream the latest article snapshot one record at a time.
+    """
+    files = sorted(RAW_DIR.glob("articles_*.jsonl"))
+    return _read_articles(files[-1]) if files else iter(())
+
+
+def load_raw_html(art: Article) -> str:
+    """
+    Return an article's page HTML, reading it from the blob store on demand.
+
+    Only needed when re-parsing; the pipeline itself works from clean_text.
+    """
+    if art.raw_html is not None:
+        return art.raw_html
+    if art.raw_html_key is None:
+        raise ValueError(f"Article {art.id} has no stored HTML")
+    return get_blob_store().get(art.raw_html_key)
 
 
 # -------- Chunks --------
 
 def save_chunks(chunks: Iterable[Chunk]) -> Path:
-    chunks = list(chunks)
-    if not chunks:
-        raise ValueError("No chunks to save")
-
-    path = PROCESSED_DIR / f"chunks_{_timestamp()}.jsonl"
-    with path.open("w", encoding="utf-8") as f:
+    writer = SnapshotWriter(PROCESSED_DIR, "chunks")
+    try:
         for ch in chunks:
-            f.write(json.dumps(ch.dict(), default=str) + "\n")
-    logger.info("Saved %d chunks to %s", len(chunks), path)
-    return path
+            writer.write(ch.dict())
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
 
 
 def load_latest_chunks() -> List[Chunk]:
@@ -60,6 +143,24 @@ def load_latest_chunks() -> List[Chunk]:
     return chunks
 
 
+def save_chunkless_ids(article_ids: Iterable[str]) -> Path:
+    """
+    Record the articles that have no chunks (e.g. all of them were dropped as
+    near-duplicates), so incremental runs do not re-chunk them every cycle.
+    """
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROCESSED_DIR / "chunkless_articles.json"
+    path.write_text(json.dumps(sorted(set(article_ids))), encoding="utf-8")
+    return path
+
+
+def load_chunkless_ids() -> List[str]:
+    path = PROCESSED_DIR / "chunkless_articles.json"
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
 # -------- Reports --------
 
 def save_report(report: Report) -> Path:
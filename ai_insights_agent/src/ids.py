@@ -0,0 +1,55 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalise a URL so trivially different spellings map to the same identity:
+    lowercase scheme/host, no default port, fragment or trailing slash, sorted query.
+    """
+    parts = urlsplit(str(url).strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (
+        (scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash of text with whitespace collapsed, so re-wrapping does not count as a change.
+    """
+    return _sha256(_WS_RE.sub(" ", text).strip())
+
+
+def url_key(url: str) -> str:
+    return _sha256(canonical_url(url))[:16]
+
+
+def make_article_id(url: str, title: str, clean_text: str) -> str:
+    """
+    Deterministic article ID: "<url key>-<content key>".
+
+    The URL part is stable for a page; the content part changes whenever the
+    extracted title or text changes.
+    """
+    return f"{url_key(url)}-{content_hash(title + chr(10) + clean_text)[:16]}"
+
+
+def make_chunk_id(article_id: str, start: int, end: int, text: str) -> str:
+    """
+    Deterministic chunk ID from the parent article, the sentence span [start, end]
+    and the chunk text.
+    """
+    return _sha256(f"{article_id}:{start}:{end}:{content_hash(text)}")[:32]
@@ -1,8 +1,8 @@
 import os
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
 
 from dotenv import load_dotenv
-from openai import OpenAI
 
 from ..config import OPENAI_MODEL
 from ..logging_utils import get_logger
@@ -11,11 +11,29 @@ logger = get_logger(__name__)
 
 load_dotenv()
 
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise RuntimeError("OPENAI_API_KEY not set. Please add it to .env or export it.")
+_client = None
+_client_lock = threading.Lock()
 
-client = OpenAI(api_key=api_key)
+
+def get_client():
+    """
+    Shared OpenAI client, created on first use.
+
+    Importing openai and checking OPENAI_API_KEY is deferred until a completion
+    is actually requested, so modules that only reference the LLM layer import
+    quickly and without credentials.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    raise RuntimeError("OPENAI_API_KEY not set. Please add it to .env or export it.")
+                from openai import OpenAI
+
+                _client = OpenAI(api_key=api_key)
+    return _client
 
 
 def chat_completion(
@@ -29,7 +47,7 @@ def chat_completion(
     Keeps the rest of the system decoupled from a specific provider.
     """
     logger.info("Calling OpenAI model=%s, messages=%d", model, len(messages))
-    resp = client.chat.completions.create(
+    resp = get_client().chat.completions.create(
         model=model,
         messages=messages,
         temperature=temperature,
@@ -9,7 +9,9 @@ class Article(BaseModel):
     url: HttpUrl
     title: str
     published_at: Optional[datetime]
-    raw_html: str
+    updated_at: Optional[datetime] = None  # source-reported last change, when available
+    raw_html: Optional[str] = None         # inline HTML (legacy snapshots / tests)
+    raw_html_key: Optional[str] = None     # content hash of the raw page (HTML or Content API JSON) in the blob store
     clean_text: str
 
 
@@ -21,6 +23,7 @@ class Chunk(BaseModel):
     section: Optional[str] = None
     topic_label: Optional[str] = None
     created_at: datetime
+    duplicate_of: Optional[str] = None  # id of the chunk this one near-duplicates (CHUNK_DEDUP=flag)
 
 
 class Report(BaseModel):
@@ -0,0 +1,186 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TypeVar
+
+import numpy as np
+
+from .config import (
+    INDEX_VECTOR_SOURCE,
+    PROCESSED_DIR,
+    RAW_DIR,
+    STREAM_BATCH_ARTICLES,
+    STREAM_QUEUE_SIZE,
+)
+from .data.storage import SnapshotWriter, article_record
+from .logging_utils import get_logger
+from .models import Article, Chunk
+from .processing.chunking import semantic_chunk_corpus_with_vectors
+from .processing.embeddings import embed_texts
+from .retrieval.index import ChunkIndex
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def buffered(items: Iterable[T], maxsize: int = STREAM_QUEUE_SIZE, name: str = "stage") -> Iterator[T]:
+    """
+    Run `items` (usually a generator stage) in a background thread and hand its
+    results over through a queue of at most `maxsize` entries.
+
+    The producer blocks while the queue is full, so each stage holds a bounded
+    number of items, and consecutive stages run concurrently. Exceptions are
+    re-raised in the consumer; closing the returned generator stops the producer.
+    """
+    handoff: "queue.Queue" = queue.Queue(maxsize=max(maxsize, 1))
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((True, item)):
+                    break
+            else:
+                put((False, _DONE))
+        except BaseException as e:
+            put((False, e))
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()  # lets upstream stages shut down too
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, value = handoff.get()
+            if ok:
+                yield value
+            elif value is _DONE:
+                return
+            else:
+                raise value
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _batched(items: Iterable[T], n: int) -> Iterator[List[T]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, max(n, 1)))
+        if not batch:
+            return
+        yield batch
+
+
+# -------- Stages --------
+
+@dataclass
+class StreamBatch:
+    articles: List[Article]
+    chunks: List[Chunk]
+    vectors: Optional[np.ndarray] = None
+
+
+def _chunk_stage(articles: Iterable[Article], batch_articles: int) -> Iterator[StreamBatch]:
+    for batch in _batched(articles, batch_articles):
+        # Stages already overlap, so chunk inline rather than per-batch process pools.
+        # Near-duplicates are only detected within the batch.
+        per_article, pooled = semantic_chunk_corpus_with_vectors(batch, workers=1)
+        yield StreamBatch(batch, [c for chunks in per_article for c in chunks], pooled)
+
+
+def _embed_stage(batches: Iterable[StreamBatch], vector_source: str) -> Iterator[StreamBatch]:
+    for batch in batches:
+        if vector_source != "pooled" and batch.chunks:
+            batch.vectors = embed_texts([c.text for c in batch.chunks])
+        yield batch
+
+
+def _index_stage(batches: Iterable[StreamBatch], index: ChunkIndex) -> Iterator[StreamBatch]:
+    for batch in batches:
+        index.add(batch.chunks, batch.vectors)
+        yield batch
+
+
+# -------- Driver --------
+
+@dataclass
+class StreamResult:
+    index: ChunkIndex
+    articles_path: Path
+    chunks_path: Path
+    articles: int
+    chunks: int
+
+
+def stream_ingest(
+    articles: Iterable[Article],
+    vector_source: str = INDEX_VECTOR_SOURCE,
+    batch_articles: int = STREAM_BATCH_ARTICLES,
+    queue_size: int = STREAM_QUEUE_SIZE,
+) -> Optional[StreamResult]:
+    """
+    Streaming ingest: collect -> chunk -> embed -> index-add -> persist.
+
+    Articles move through the stages in batches of `batch_articles`, each stage
+    in its own thread with at most `queue_size` batches buffered in front of the
+    next, so working memory is bounded by the batch size rather than the corpus
+    and fetching, chunking and encoding overlap in time. Article and chunk
+    snapshots are written as batches complete and appear atomically at the end.
+
+    Returns None when `articles` is empty or yields no chunks.
+    """
+    start = time.perf_counter()
+    index = ChunkIndex()
+    stages = buffered(articles, queue_size, "stream-collect")
+    stages = buffered(_chunk_stage(stages, batch_articles), queue_size, "stream-chunk")
+    stages = buffered(_embed_stage(stages, vector_source), queue_size, "stream-embed")
+    stages = buffered(_index_stage(stages, index), queue_size, "stream-index")
+
+    article_writer = SnapshotWriter(RAW_DIR, "articles")
+    chunk_writer = SnapshotWriter(PROCESSED_DIR, "chunks")
+    try:
+        for batch in stages:
+            for art in batch.articles:
+                article_writer.write(article_record(art))
+            for chunk in batch.chunks:
+                chunk_writer.write(chunk.dict())
+        if not article_writer.count or not chunk_writer.count:
+            if article_writer.count:
+                logger.warning("%d articles produced no chunks; no snapshot written", article_writer.count)
+            article_writer.abort()
+            chunk_writer.abort()
+            return None
+        chunks_path = chunk_writer.close()
+    except BaseException:
+        article_writer.abort()
+        chunk_writer.abort()
+        raise
+    articles_path = article_writer.close()
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Streaming ingest: %d articles, %d chunks in %.1fs (%.1f articles/s)",
+        article_writer.count,
+        chunk_writer.count,
+        elapsed,
+        article_writer.count / elapsed if elapsed else 0.0,
+    )
+    return StreamResult(index, articles_path, chunks_path, article_writer.count, chunk_writer.count)
@@ -1,30 +1,151 @@
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List
-import uuid
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
-import nltk
-from nltk.tokenize import sent_tokenize
 
+from ..config import CHUNK_DEDUP, CHUNK_WORKERS, EMBEDDING_BATCH_SIZE
+from ..ids import make_chunk_id
 from ..models import Article, Chunk
 from ..logging_utils import get_logger
+from .dedup import dedup_chunk_lists
 from .embeddings import embed_texts
 
 logger = get_logger(__name__)
 
-# Ensure sentence tokeniser is available
-for resource in ["punkt", "punkt_tab"]:
-    try:
-        nltk.data.find(f"tokenizers/{resource}")
-    except LookupError:
-        nltk.download(resource)
+_punkt_ready = False
+_punkt_lock = threading.Lock()
+
+
+def sent_tokenize(text: str) -> List[str]:
+    """
+    NLTK sentence tokenizer. nltk is imported, and its punkt data downloaded
+    if missing, on first use rather than at import time.
+    """
+    global _punkt_ready
+    import nltk
+
+    if not _punkt_ready:
+        with _punkt_lock:
+            if not _punkt_ready:
+                for resource in ["punkt", "punkt_tab"]:
+                    try:
+                        nltk.data.find(f"tokenizers/{resource}")
+                    except LookupError:
+                        nltk.download(resource)
+                _punkt_ready = True
+    return nltk.tokenize.sent_tokenize(text)
+
+
+def _group_sentences(
+    sent_embs: np.ndarray,
+    sim_threshold: float,
+    max_sentences: int,
+    overlap: int,
+) -> List[Tuple[int, int]]:
+    """
+    Group consecutive sentences into inclusive (first, last) index ranges.
+
+    A sentence joins the current group while the group has room and its cosine
+    similarity to the group centroid is at least sim_threshold; otherwise the
+    group is closed and the next one starts `overlap` sentences back.
+
+    The centroid is tracked as a running sum (same direction as the mean) with
+    its norm, and candidates are pre-normalised, so each sentence costs
+    one dot product regardless of group size.
+    """
+    n = sent_embs.shape[0]
+    if n == 0:
+        return []
+
+    embs = np.asarray(sent_embs, dtype=np.float64)
+    norms = np.linalg.norm(embs, axis=1)
+    unit = np.divide(embs, norms[:, None], out=np.zeros_like(embs), where=norms[:, None] > 0)
+    # Similarity of each sentence to the previous one, used for single-sentence groups
+    adjacent = np.einsum("ij,ij->i", unit[:-1], unit[1:]).tolist()
+    norms = norms.tolist()
+
+    groups: List[Tuple[int, int]] = []
+    start = 0
+    total = embs[0].copy()
+    total_norm = norms[0]
+
+    for i in range(1, n):
+        if i - start < max_sentences:
+            if total_norm == 0.0:
+                sim = 0.0
+            elif i - start == 1:
+                sim = adjacent[i - 1]
+            else:
+                sim = float(total @ unit[i]) / total_norm
+            if sim >= sim_threshold:
+                # |s + e|^2 = |s|^2 + 2 s.e + |e|^2, with s.e = sim * |s| * |e|
+                total_sq = total_norm * total_norm + norms[i] * (2.0 * sim * total_norm + norms[i])
+                total += embs[i]
+                total_norm = math.sqrt(max(total_sq, 0.0))
+                continue
+
+        groups.append((start, i - 1))
+        # start new group with overlap
+        start = max(0, i - overlap)
+        total = embs[start : i + 1].sum(axis=0)
+        total_norm = math.sqrt(float(total @ total))
 
+    groups.append((start, n - 1))
+    return groups
 
-def _cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
-    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
-    if denom == 0.0:
-        return 0.0
-    return float(np.dot(a, b) / denom)
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in sent_tokenize(text) if s.strip()]
+
+
+def pool_chunk_vectors(sent_embs: np.ndarray, groups: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    Chunk vectors as the L2-normalised mean of each group's sentence embeddings.
+    """
+    prefix = np.zeros((sent_embs.shape[0] + 1, sent_embs.shape[1]), dtype=np.float64)
+    np.cumsum(sent_embs, axis=0, dtype=np.float64, out=prefix[1:])
+    firsts = np.array([first for first, _ in groups], dtype=np.int64)
+    lasts = np.array([last for _, last in groups], dtype=np.int64)
+    sums = prefix[lasts + 1] - prefix[firsts]
+    norms = np.linalg.norm(sums, axis=1, keepdims=True)
+    return np.divide(sums, norms, out=np.zeros_like(sums), where=norms > 0).astype("float32")
+
+
+def _build_chunks(
+    article: Article,
+    sentences: List[str],
+    sent_embs: np.ndarray,
+    sim_threshold: float,
+    max_sentences: int,
+    overlap: int,
+) -> Tuple[List[Chunk], np.ndarray]:
+    groups = _group_sentences(sent_embs, sim_threshold, max_sentences, overlap)
+
+    chunks: List[Chunk] = []
+    for order, (first, last) in enumerate(groups):
+        text = " ".join(sentences[first : last + 1])
+        chunks.append(
+            Chunk(
+                id=make_chunk_id(article.id, first, last, text),
+                article_id=article.id,
+                order=order,
+                text=text,
+                section=None,
+                topic_label=None,
+                created_at=datetime.utcnow(),
+            )
+        )
+
+    logger.info(
+        "Semantic chunking produced %d chunks for article '%s'",
+        len(chunks),
+        article.title[:80],
+    )
+    return chunks, pool_chunk_vectors(sent_embs, groups)
 
 
 def semantic_chunk(
@@ -39,50 +160,134 @@ def semantic_chunk(
     - Use sentence embeddings to group semantically similar sentences
     - Limit chunk size and add overlapping sentences for continuity
     """
-    sentences = [s.strip() for s in sent_tokenize(article.clean_text) if s.strip()]
+    sentences = split_sentences(article.clean_text)
     if not sentences:
         return []
 
     sent_embs = embed_texts(sentences)
-    chunks: List[Chunk] = []
+    chunks, _ = _build_chunks(article, sentences, sent_embs, sim_threshold, max_sentences, overlap)
+    return chunks
+
+
+def _build_job(
+    job: Tuple[Article, List[str], np.ndarray, float, int, int]
+) -> Tuple[List[Chunk], np.ndarray]:
+    return _build_chunks(*job)
+
 
-    current_ids = [0]
-    current_embs = [sent_embs[0]]
-
-    def make_chunk(sent_ids: List[int], order: int) -> Chunk:
-        text = " ".join(sentences[i] for i in sent_ids)
-        return Chunk(
-            id=str(uuid.uuid4()),
-            article_id=article.id,
-            order=order,
-            text=text,
-            section=None,
-            topic_label=None,
-            created_at=datetime.utcnow(),
+def _pool_chunksize(n: int, workers: int) -> int:
+    # A few tasks per worker: amortises pickling without leaving cores idle at the tail
+    return max(1, n // (workers * 4))
+
+
+def semantic_chunk_corpus_with_vectors(
+    articles: List[Article],
+    sim_threshold: float = 0.75,
+    max_sentences: int = 6,
+    overlap: int = 1,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    workers: int = CHUNK_WORKERS,
+    dedup: str = CHUNK_DEDUP,
+    dedup_against: Sequence[Chunk] = (),
+) -> Tuple[List[List[Chunk]], np.ndarray]:
+    """
+    semantic_chunk for many articles with a single embedding pass.
+
+    All articles are sentence-split first and every distinct sentence is embedded
+    once, in large length-sorted batches, instead of one small batch per article.
+    Grouping then runs per article.
+
+    Sentence splitting and grouping are spread over a process pool when
+    workers != 1 (0 = one per CPU); embedding stays in this process, so the
+    model is loaded once. Results do not depend on the number of workers.
+
+    Near-duplicate chunks across these articles, and of the `dedup_against`
+    chunks (an existing corpus being extended), are then dropped or flagged
+    according to `dedup` (see processing.dedup).
+
+    Returns one chunk list per article (in input order) and, for every chunk in
+    that flattened order, its mean-pooled sentence vector (see pool_chunk_vectors),
+    which ChunkIndex.build can use instead of re-encoding chunk texts.
+    """
+    workers = min(workers or os.cpu_count() or 1, max(len(articles), 1))
+    pool: Optional[ProcessPoolExecutor] = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        results, vectors = _chunk_corpus(
+            articles, sim_threshold, max_sentences, overlap, batch_size, pool, workers
         )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return dedup_chunk_lists(results, vectors, mode=dedup, kept=dedup_against)
 
-    order = 0
-    for i in range(1, len(sentences)):
-        centroid = np.mean(np.stack(current_embs, axis=0), axis=0)
-        sim = _cosine_sim(centroid, sent_embs[i])
-
-        if sim >= sim_threshold and len(current_ids) < max_sentences:
-            current_ids.append(i)
-            current_embs.append(sent_embs[i])
-        else:
-            chunks.append(make_chunk(current_ids, order))
-            order += 1
-
-            # start new chunk with overlap
-            start = max(0, current_ids[-1] - overlap + 1)
-            current_ids = list(range(start, i + 1))
-            current_embs = [sent_embs[j] for j in current_ids]
-
-    # Final chunk
-    chunks.append(make_chunk(current_ids, order))
+
+def _chunk_corpus(
+    articles: List[Article],
+    sim_threshold: float,
+    max_sentences: int,
+    overlap: int,
+    batch_size: int,
+    pool: Optional[ProcessPoolExecutor],
+    workers: int,
+) -> Tuple[List[List[Chunk]], np.ndarray]:
+    texts = [a.clean_text for a in articles]
+    if pool is None:
+        per_article = [split_sentences(t) for t in texts]
+    else:
+        chunksize = _pool_chunksize(len(texts), workers)
+        per_article = list(pool.map(split_sentences, texts, chunksize=chunksize))
+
+    unique = list(dict.fromkeys(s for sentences in per_article for s in sentences))
+    row_of = {s: i for i, s in enumerate(unique)}
     logger.info(
-        "Semantic chunking produced %d chunks for article '%s'",
-        len(chunks),
-        article.title[:80],
+        "Corpus chunking: %d articles, %d sentences (%d distinct)",
+        len(articles),
+        sum(len(sentences) for sentences in per_article),
+        len(unique),
     )
-    return chunks
+    embs = embed_texts(unique, batch_size=batch_size)
+
+    jobs = [
+        (article, sentences, embs[[row_of[s] for s in sentences]], sim_threshold, max_sentences, overlap)
+        for article, sentences in zip(articles, per_article)
+        if sentences
+    ]
+    if pool is None:
+        built = [_build_job(job) for job in jobs]
+    else:
+        chunksize = _pool_chunksize(len(jobs), workers)
+        built = list(pool.map(_build_job, jobs, chunksize=chunksize))
+
+    # Merge in input order; articles without sentences get an empty chunk list
+    results: List[List[Chunk]] = []
+    vectors: List[np.ndarray] = [np.zeros((0, embs.shape[1]), dtype="float32")]
+    outputs = iter(built)
+    for sentences in per_article:
+        if not sentences:
+            results.append([])
+            continue
+        chunks, chunk_vecs = next(outputs)
+        results.append(chunks)
+        vectors.append(chunk_vecs)
+    return results, np.vstack(vectors)
+
+
+def semantic_chunk_corpus(
+    articles: List[Article],
+    sim_threshold: float = 0.75,
+    max_sentences: int = 6,
+    overlap: int = 1,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    workers: int = CHUNK_WORKERS,
+    dedup: str = CHUNK_DEDUP,
+    dedup_against: Sequence[Chunk] = (),
+) -> List[List[Chunk]]:
+    """
+    Chunk lists from semantic_chunk_corpus_with_vectors, without the vectors.
+    """
+    results, _ = semantic_chunk_corpus_with_vectors(
+        articles, sim_threshold, max_sentences, overlap, batch_size, workers, dedup, dedup_against
+    )
+    return results
@@ -0,0 +1,156 @@
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import CHUNK_DEDUP, CHUNK_DEDUP_THRESHOLD
+from ..models import Chunk
+from ..logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_PRIME = np.uint64((1 << 32) + 15)  # smallest prime above 2^32
+
+
+def shingles(text: str, k: int = 5) -> np.ndarray:
+    """
+    Distinct hashed word k-grams of lowercased text (one shingle for texts
+    shorter than k words, none for empty text), as sorted uint64 values < 2^32.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    grams = {" ".join(words[i : i + k]) for i in range(max(len(words) - k + 1, 1))}
+    return np.unique(np.array([zlib.crc32(g.encode("utf-8")) for g in grams], dtype=np.uint64))
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with banded locality-sensitive hashing.
+
+    Signatures use `num_perm` hash functions (a * x + b) mod p. With `bands`
+    bands of num_perm / bands rows, two sets whose Jaccard similarity is J share
+    a bucket with probability 1 - (1 - J^rows)^bands; the defaults (64 bands of 2)
+    make a candidate of nearly every pair with J >= 0.3, which covers chunks
+    contained in larger ones.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 64, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        rng = np.random.default_rng(seed)
+        # a, b < 2^32 and shingles < 2^32, so a * x + b never overflows uint64
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        return ((hashes[:, None] * self.a + self.b) % _PRIME).min(axis=0)
+
+    def _keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def candidates(self, signature: np.ndarray) -> List[int]:
+        found = set()
+        for key in self._keys(signature):
+            found.update(self._buckets.get(key, ()))
+        return sorted(found)
+
+    def insert(self, item: int, signature: np.ndarray) -> None:
+        for key in self._keys(signature):
+            self._buckets.setdefault(key, []).append(item)
+
+
+def find_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = CHUNK_DEDUP_THRESHOLD,
+    k: int = 5,
+    reference: Sequence[str] = (),
+) -> List[Optional[int]]:
+    """
+    For each text, the index of a kept text it near-duplicates, or None.
+
+    A text is a near-duplicate when at least `threshold` of its shingles also
+    occur in a kept text (containment, so a chunk that is mostly another
+    chunk's overlap counts). Texts are visited largest first, so the more
+    complete version survives. LSH only proposes candidates; every match is
+    confirmed on the exact shingle sets.
+
+    `reference` texts (e.g. chunks already indexed) are always kept and are
+    matched before any of `texts`; an index of len(texts) + j points at
+    reference[j].
+    """
+    sets = [shingles(t, k) for t in texts] + [shingles(t, k) for t in reference]
+    lsh = MinHashLSH()
+    dup_of: List[Optional[int]] = [None] * len(texts)
+
+    for j in range(len(texts), len(sets)):
+        if len(sets[j]):
+            lsh.insert(j, lsh.signature(sets[j]))
+    for i in sorted(range(len(texts)), key=lambda i: (-len(sets[i]), i)):
+        if not len(sets[i]):
+            continue
+        sig = lsh.signature(sets[i])
+        for j in lsh.candidates(sig):
+            shared = np.intersect1d(sets[i], sets[j], assume_unique=True).size
+            if shared >= threshold * len(sets[i]):
+                dup_of[i] = j
+                break
+        else:
+            lsh.insert(i, sig)
+    return dup_of
+
+
+def dedup_chunk_lists(
+    per_article: List[List[Chunk]],
+    vectors: np.ndarray,
+    mode: str = CHUNK_DEDUP,
+    threshold: float = CHUNK_DEDUP_THRESHOLD,
+    kept: Sequence[Chunk] = (),
+) -> Tuple[List[List[Chunk]], np.ndarray]:
+    """
+    Apply near-duplicate detection across per-article chunk lists whose chunks,
+    flattened in order, correspond to the rows of `vectors`, and against the
+    `kept` chunks of an existing corpus (which are never dropped).
+
+    "drop" removes duplicates (and their rows), "flag" keeps them with
+    Chunk.duplicate_of set, "off" returns the input unchanged.
+    """
+    if mode == "off":
+        return per_article, vectors
+    if mode not in ("drop", "flag"):
+        raise ValueError(f"Unknown dedup mode: {mode}")
+
+    flat = [c for chunks in per_article for c in chunks]
+    dup_of = find_near_duplicates([c.text for c in flat], threshold, reference=[c.text for c in kept])
+    duplicates = sum(d is not None for d in dup_of)
+    if not duplicates:
+        return per_article, vectors
+
+    saved_chars = sum(len(c.text) for c, d in zip(flat, dup_of) if d is not None)
+    logger.info(
+        "Near-duplicate chunks: %d of %d %s (%d chars)",
+        duplicates,
+        len(flat),
+        "removed" if mode == "drop" else "flagged",
+        saved_chars,
+    )
+
+    if mode == "flag":
+        targets = flat + list(kept)
+        for chunk, d in zip(flat, dup_of):
+            if d is not None:
+                chunk.duplicate_of = targets[d].id
+        return per_article, vectors
+
+    keep = np.array([d is None for d in dup_of], dtype=bool)
+    rows = iter(keep.tolist())
+    kept_lists = [[c for c in chunks if next(rows)] for chunks in per_article]
+    return kept_lists, vectors[keep]
@@ -0,0 +1,179 @@
+import importlib.util
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from ..config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MAX_SEQ_LENGTH,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_ONNX_FILE,
+    EMBEDDING_THREADS,
+)
+from ..logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class EmbeddingBackend(ABC):
+    """
+    Text encoder interface used by processing.embeddings.
+
+    `cache_id` names the exact encoder (model + runtime + weights) so cached
+    vectors from different backends never mix.
+    """
+
+    name: str = ""
+    cache_id: str = ""
+    dimension: int = 0
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Embed texts as a (len(texts), dimension) float32 array.
+        """
+
+
+def mean_pool(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """
+    Mask-aware mean over tokens followed by L2 normalisation, matching the
+    pooling + Normalize modules of all-MiniLM-L6-v2.
+    """
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (hidden * mask).sum(axis=1)
+    pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return (pooled / np.clip(norms, 1e-12, None)).astype("float32")
+
+
+# -------- sentence-transformers / PyTorch (reference) --------
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    name = "torch"
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, threads: int = EMBEDDING_THREADS) -> None:
+        from sentence_transformers import SentenceTransformer
+
+        if threads > 0:
+            import torch
+
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name)
+        self.cache_id = backend_cache_id("torch", model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        emb = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return emb.astype("float32")
+
+
+# -------- ONNX Runtime (int8-quantized by default) --------
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime encoder with a fast tokenizers tokenizer.
+
+    `onnx_file` is a local .onnx path or a file in the model's Hugging Face repo;
+    the default is the int8 (dynamically quantized, AVX2) export published with
+    all-MiniLM-L6-v2. Texts are sorted by length so each batch pads tightly.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        onnx_file: str = EMBEDDING_ONNX_FILE,
+        threads: int = EMBEDDING_THREADS,
+        max_seq_length: int = EMBEDDING_MAX_SEQ_LENGTH,
+    ) -> None:
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        model_path = Path(onnx_file)
+        if not model_path.exists():
+            model_path = Path(hf_hub_download(model_name, onnx_file))
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(model_name, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.cache_id = backend_cache_id("onnx", model_name, onnx_file)
+        self.dimension = int(self.encode(["dimension probe"], batch_size=1).shape[1])
+        logger.info("ONNX embedding backend ready: %s (threads=%s)", model_path.name, threads or "auto")
+
+    def _run(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {k: v for k, v in feeds.items() if k in self.input_names}
+        hidden = self.session.run(None, feeds)[0]
+        return mean_pool(hidden, feeds["attention_mask"])
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimension), dtype="float32")
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out: Optional[np.ndarray] = None
+        for start in range(0, len(order), batch_size):
+            idx = order[start : start + batch_size]
+            emb = self._run([texts[i] for i in idx])
+            if out is None:
+                out = np.empty((len(texts), emb.shape[1]), dtype="float32")
+            out[idx] = emb
+        return out
+
+
+# -------- Selection --------
+
+def backend_cache_id(
+    name: Optional[str] = None,
+    model_name: str = EMBEDDING_MODEL_NAME,
+    onnx_file: str = EMBEDDING_ONNX_FILE,
+) -> str:
+    """
+    The cache_id a backend would report, without loading it. Used to check that
+    stored vectors (embedding cache, index snapshots) match the configured encoder.
+    """
+    name = (name or EMBEDDING_BACKEND).lower()
+    if name == "onnx":
+        return f"{model_name}#onnx:{Path(onnx_file).name}"
+    return model_name
+
+
+def available_backends() -> List[str]:
+    backends = []
+    if importlib.util.find_spec("sentence_transformers") is not None:
+        backends.append("torch")
+    if all(importlib.util.find_spec(m) is not None for m in ("onnxruntime", "tokenizers")):
+        backends.append("onnx")
+    return backends
+
+
+def create_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    name = (name or EMBEDDING_BACKEND).lower()
+    if name == "torch":
+        return SentenceTransformerBackend()
+    if name == "onnx":
+        if "onnx" not in available_backends():
+            raise RuntimeError("EMBEDDING_BACKEND=onnx but onnxruntime/tokenizers are not installed")
+        return OnnxBackend()
+    raise ValueError(f"Unknown embedding backend: {name}")
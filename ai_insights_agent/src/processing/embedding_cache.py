@@ -0,0 +1,314 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_LRU_ITEMS, EMBEDDING_CACHE_MAX_BYTES
+from ..ids import content_hash
+from ..logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Another process's segment counts as closed (safe to compact) once it has
+# not been written to for this long
+SEGMENT_IDLE_SECONDS = 10 * 60
+# A compaction lock file older than this was left by a crashed process
+LOCK_STALE_SECONDS = 5 * 60
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """
+    Cache key: model name + hash of the whitespace-normalised text.
+    """
+    return hashlib.sha256(f"{model_name}:{content_hash(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent text -> embedding cache for one model.
+
+    On disk, vectors live in append-only segments under <root>/<model slug>-<dim>/:
+    "<segment>.f32" holds raw float32 rows (read back via np.memmap) and
+    "<segment>.keys" the matching keys, one per line. Each process appends to
+    its own segment, so concurrent writers never share a file.
+
+    Recently used vectors are also kept in an in-memory LRU. When the segments
+    grow past `max_bytes`, compact() rewrites the most recently used entries
+    (this process's hits and writes first, then newest segments) into a single
+    segment, down to 3/4 of the budget. Only closed segments are compacted:
+    this process's own, earlier compactions, and segments idle for
+    `segment_idle` seconds. Compaction runs under a lock file; a writer that
+    has been idle for half that long takes the lock too, and starts a new
+    segment if its old one was compacted away.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        root: Path = EMBEDDING_CACHE_DIR,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+        lru_items: int = EMBEDDING_CACHE_LRU_ITEMS,
+        segment_idle: float = SEGMENT_IDLE_SECONDS,
+    ) -> None:
+        self.model_name = model_name
+        self.dim = dim
+        self.dir = Path(root) / f"{_SLUG_RE.sub('_', model_name)}-{dim}"
+        self.max_bytes = max_bytes
+        self.lru_items = lru_items
+        self.segment_idle = segment_idle
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._index: Dict[str, Tuple[str, int]] = {}
+        self._maps: Dict[str, np.ndarray] = {}
+        self._used: Dict[str, int] = {}
+        self._tick = 0
+        self._segment: Optional[str] = None
+        self._segment_rows = 0
+        self._written_at = 0.0
+        self._compact_at = max_bytes
+        self._lock_path = self.dir / "compact.lock"
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+        if self.disk_bytes() > self._compact_at:
+            self.compact()
+
+    # -------- Disk layout --------
+
+    def _segments(self) -> List[str]:
+        # Segment names start with a hex timestamp, so sorting is oldest first
+        return sorted(p.stem for p in self.dir.glob("*.keys"))
+
+    def _load(self) -> None:
+        self._index.clear()
+        self._maps.clear()
+        for seg in self._segments():
+            keys = (self.dir / f"{seg}.keys").read_text(encoding="ascii").split()
+            rows = min(len(keys), self._file_rows(seg))
+            for row, key in enumerate(keys[:rows]):
+                self._index[key] = (seg, row)
+
+    def _file_rows(self, seg: str) -> int:
+        path = self.dir / f"{seg}.f32"
+        return path.stat().st_size // (4 * self.dim) if path.exists() else 0
+
+    def _map(self, seg: str, row: int) -> np.ndarray:
+        mapped = self._maps.get(seg)
+        if mapped is None or row >= mapped.shape[0]:
+            rows = self._file_rows(seg)
+            mapped = np.memmap(self.dir / f"{seg}.f32", dtype="float32", mode="r", shape=(rows, self.dim))
+            self._maps[seg] = mapped
+        return mapped
+
+    def _size(self, seg: str) -> int:
+        try:
+            return (self.dir / f"{seg}.f32").stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _closed(self, seg: str, own: Optional[str], now: float) -> bool:
+        if seg == own or seg.endswith("-compact"):
+            return True
+        try:
+            written = (self.dir / f"{seg}.keys").stat().st_mtime
+        except FileNotFoundError:
+            return True
+        return now - written > self.segment_idle
+
+    def disk_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.dir.glob("*.f32"))
+
+    # -------- Cross-process lock --------
+
+    def _try_lock(self) -> bool:
+        try:
+            fd = os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - self._lock_path.stat().st_mtime > LOCK_STALE_SECONDS:
+                    logger.warning("Removing stale embedding cache lock %s", self._lock_path)
+                    self._lock_path.unlink()
+            except FileNotFoundError:
+                pass
+            return False
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        os.close(fd)
+        return True
+
+    @contextmanager
+    def _dir_lock(self, wait: bool) -> Iterator[bool]:
+        """
+        Hold the directory's compaction lock. Yields False if wait is False
+        and another process holds it.
+        """
+        acquired = self._try_lock()
+        while wait and not acquired:
+            time.sleep(0.01)
+            acquired = self._try_lock()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._lock_path.unlink(missing_ok=True)
+
+    # -------- Lookup / insert --------
+
+    def _touch(self, key: str, vec: np.ndarray) -> None:
+        self._tick += 1
+        self._used[key] = self._tick
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_items:
+            self._lru.popitem(last=False)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Cached vectors for texts, None where missing.
+        """
+        out: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                key = embedding_key(self.model_name, text)
+                vec = self._lru.get(key)
+                if vec is None and key in self._index:
+                    vec = self._read(key)
+                if vec is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._touch(key, vec)
+                out.append(vec)
+        return out
+
+    def _read(self, key: str) -> Optional[np.ndarray]:
+        seg, row = self._index[key]
+        try:
+            return np.array(self._map(seg, row)[row])
+        except (OSError, ValueError, IndexError):
+            pass
+        # The segment was compacted away by another process: reload and retry once
+        self._load()
+        if key not in self._index:
+            return None
+        seg, row = self._index[key]
+        try:
+            return np.array(self._map(seg, row)[row])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _intact(self, seg: str) -> bool:
+        keys = self.dir / f"{seg}.keys"
+        return keys.exists() and self._size(seg) == self._segment_rows * 4 * self.dim
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        with self._lock:
+            keys = [embedding_key(self.model_name, t) for t in texts]
+            if self._segment is not None and time.time() - self._written_at > self.segment_idle / 2:
+                # Another process may compact our segment from now on
+                with self._dir_lock(wait=True):
+                    if not self._intact(self._segment):
+                        logger.info("Embedding cache segment %s was compacted; starting a new one", self._segment)
+                        self._segment = None
+                        self._load()
+                    self._append(keys, vectors)
+            else:
+                self._append(keys, vectors)
+
+        if self.disk_bytes() > self._compact_at:
+            self.compact()
+
+    def _append(self, keys: List[str], vectors: np.ndarray) -> None:
+        if self._segment is None:
+            self._segment = f"{int(time.time() * 1000):012x}-{os.getpid()}-{os.urandom(3).hex()}"
+            self._segment_rows = 0
+
+        # Vectors before keys: a crash can only leave rows without keys
+        with open(self.dir / f"{self._segment}.f32", "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.dir / f"{self._segment}.keys", "a", encoding="ascii") as f:
+            f.write("".join(f"{k}\n" for k in keys))
+        self._written_at = time.time()
+
+        for i, key in enumerate(keys):
+            self._index[key] = (self._segment, self._segment_rows + i)
+            self._touch(key, vectors[i].copy())
+        self._segment_rows += len(keys)
+
+    # -------- Eviction --------
+
+    def compact(self) -> None:
+        """
+        Rewrite the closed segments as one segment of the most recently used
+        entries. Skipped while another process is compacting.
+        """
+        kept: List[str] = []
+        with self._lock, self._dir_lock(wait=False) as locked:
+            if not locked:
+                return
+            own, self._segment = self._segment, None
+            # Pick up entries other processes wrote since this one loaded
+            self._load()
+            now = time.time()
+            segments = self._segments()
+            closed = {seg for seg in segments if self._closed(seg, own, now)}
+            open_bytes = sum(self._size(seg) for seg in segments if seg not in closed)
+            budget_rows = max(int(self.max_bytes * 0.75) - open_bytes, 0) // (4 * self.dim)
+            candidates = [key for key, (seg, _) in self._index.items() if seg in closed]
+
+            if len(closed) > 1 or len(candidates) > budget_rows:
+                seg_rank = {seg: i for i, seg in enumerate(segments)}
+                ranked = sorted(
+                    candidates,
+                    key=lambda k: (self._used.get(k, 0), seg_rank[self._index[k][0]]),
+                    reverse=True,
+                )
+                kept = ranked[:budget_rows]
+
+                name = f"{int(now * 1000):012x}-{os.getpid()}-compact"
+                vectors = np.empty((len(kept), self.dim), dtype="float32")
+                for i, key in enumerate(kept):
+                    seg, row = self._index[key]
+                    vectors[i] = self._map(seg, row)[row]
+                # Write keys last under a temporary name so a partial segment is never loaded
+                (self.dir / f"{name}.f32").write_bytes(vectors.tobytes())
+                tmp = self.dir / f"{name}.keys.tmp"
+                tmp.write_text("".join(f"{k}\n" for k in kept), encoding="ascii")
+                os.replace(tmp, self.dir / f"{name}.keys")
+
+                for seg in closed:
+                    self._maps.pop(seg, None)
+                    for suffix in (".keys", ".f32"):
+                        try:
+                            (self.dir / f"{seg}{suffix}").unlink()
+                        except OSError:  # still mapped elsewhere (Windows); retried next compaction
+                            pass
+
+                self._index = {key: loc for key, loc in self._index.items() if loc[0] not in closed}
+                self._index.update((key, (name, row)) for row, key in enumerate(kept))
+                self._lru = OrderedDict((k, v) for k, v in self._lru.items() if k in self._index)
+                logger.info(
+                    "Embedding cache compacted %d segments to %d entries (%.1f MB)",
+                    len(closed),
+                    len(kept),
+                    len(kept) * self.dim * 4 / 1e6,
+                )
+            # Segments other processes still write to can keep the cache over
+            # budget; wait for some growth before trying again
+            self._compact_at = max(self.max_bytes, self.disk_bytes() + self.max_bytes // 8)
+
+    def __len__(self) -> int:
+        return len(self._index)
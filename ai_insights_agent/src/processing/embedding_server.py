@@ -0,0 +1,278 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..batching import MicroBatcher
+from ..config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_SERVER_ADDRESS,
+    EMBEDDING_SERVER_MAX_BATCH,
+    EMBEDDING_SERVER_MAX_WAIT_MS,
+)
+from ..logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Wire format: every message is a 4-byte big-endian length followed by the payload.
+# Request:  JSON {"texts": [...]}
+# Response: JSON {"ok": true, "rows": n, "dim": d} then float32 row-major bytes,
+#           or JSON {"ok": false, "error": "..."}
+_LEN = struct.Struct(">I")
+
+EmbedFn = Callable[[List[str], int], np.ndarray]
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """
+    "host:port" -> TCP; anything else is a Unix socket path.
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address and "\\" not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(f"Unix sockets are not supported here; use host:port, got {address}")
+    return socket.AF_UNIX, address
+
+
+def _send(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_LEN.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("Embedding server connection closed")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _recv(sock: socket.socket) -> bytes:
+    (length,) = _LEN.unpack(_recv_exact(sock, _LEN.size))
+    return _recv_exact(sock, length)
+
+
+# -------- Server --------
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                request = json.loads(_recv(self.request))
+            except (ConnectionError, OSError):
+                return
+            try:
+                emb = self.server.batcher(request["texts"])
+                header = {"ok": True, "rows": int(emb.shape[0]), "dim": int(emb.shape[1])}
+                _send(self.request, json.dumps(header).encode("utf-8"))
+                _send(self.request, np.ascontiguousarray(emb, dtype="float32").tobytes())
+            except Exception as e:
+                _send(self.request, json.dumps({"ok": False, "error": str(e)}).encode("utf-8"))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    block_on_close = False
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        block_on_close = False
+
+
+class EmbeddingServer:
+    """
+    Local embedding service: one model shared by every process on the host.
+
+    Each connection is served by its own thread; requests from all connections
+    are merged by a MicroBatcher into encoder calls of up to `max_batch` texts,
+    waiting at most `max_wait` seconds to fill a batch.
+    """
+
+    def __init__(
+        self,
+        address: str = EMBEDDING_SERVER_ADDRESS,
+        embed_fn: Optional[EmbedFn] = None,
+        max_batch: int = EMBEDDING_SERVER_MAX_BATCH,
+        max_wait: float = EMBEDDING_SERVER_MAX_WAIT_MS / 1000,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+    ) -> None:
+        if embed_fn is None:
+            from .embeddings import embed_texts_local as embed_fn
+        self.embed_fn = embed_fn
+        self.batch_size = batch_size
+        self.batcher = MicroBatcher(
+            self._embed_batch,
+            max_batch=max_batch,
+            max_wait=max_wait,
+            weight=lambda texts: max(len(texts), 1),
+            name="embedding-batcher",
+        )
+
+        family, sockaddr = parse_address(address)
+        self._family = family
+        if family == socket.AF_INET:
+            self._server = _TCPServer(sockaddr, _Handler)
+            host, port = self._server.server_address[:2]
+            self.address = f"{host}:{port}"
+        else:
+            if os.path.exists(sockaddr):
+                os.unlink(sockaddr)  # stale socket from a previous run
+            self._server = _UnixServer(sockaddr, _Handler)
+            self.address = sockaddr
+        self._server.batcher = self.batcher
+        self._thread: Optional[threading.Thread] = None
+
+    def _embed_batch(self, requests: List[List[str]]) -> List[Union[np.ndarray, Exception]]:
+        texts = [t for req in requests for t in req]
+        try:
+            emb = self.embed_fn(texts, self.batch_size)
+        except Exception as e:
+            if len(requests) == 1:
+                return [e]
+            # One client's texts can fail the merged call: retry each request
+            # alone so only the failing ones get an error
+            logger.warning("Batch of %d requests failed (%s); retrying them one by one", len(requests), e)
+            return [self._embed_batch([req])[0] for req in requests]
+        out, start = [], 0
+        for req in requests:
+            out.append(emb[start : start + len(req)])
+            start += len(req)
+        return out
+
+    def serve_forever(self) -> None:
+        logger.info("Embedding server listening on %s", self.address)
+        self._server.serve_forever()
+
+    def start(self) -> "EmbeddingServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="embedding-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()  # only valid while serve_forever is running
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self.batcher.close()
+        if self._family != socket.AF_INET and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+# -------- Client --------
+
+class EmbeddingClient:
+    """
+    Client for EmbeddingServer; keeps one connection per thread.
+    Raises OSError/ConnectionError when the server is unreachable.
+    """
+
+    def __init__(self, address: str = EMBEDDING_SERVER_ADDRESS, timeout: float = 60.0) -> None:
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            family, sockaddr = parse_address(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(sockaddr)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        sock = self._connect()
+        try:
+            _send(sock, json.dumps({"texts": texts}).encode("utf-8"))
+            header = json.loads(_recv(sock))
+            if not header.get("ok"):
+                raise RuntimeError(f"Embedding server error: {header.get('error')}")
+            data = _recv(sock)
+        except OSError:
+            self.close()
+            raise
+        return np.frombuffer(data, dtype="float32").reshape(header["rows"], header["dim"]).copy()
+
+
+_client: Optional[EmbeddingClient] = None
+_down_until = 0.0
+_RETRY_SECONDS = 30.0
+
+
+def remote_embed(texts: List[str]) -> Optional[np.ndarray]:
+    """
+    Embed via the configured server, or return None when none is configured,
+    reachable or able to serve the request (callers then encode in-process).
+    After a failed connection the server is not retried for a short while, to
+    keep the fallback cheap.
+    """
+    global _client, _down_until
+    if not EMBEDDING_SERVER_ADDRESS or time.monotonic() < _down_until:
+        return None
+    if _client is None:
+        _client = EmbeddingClient(EMBEDDING_SERVER_ADDRESS)
+    try:
+        return _client.embed(texts)
+    except OSError as e:
+        _down_until = time.monotonic() + _RETRY_SECONDS
+        logger.warning(
+            "Embedding server %s unavailable (%s); encoding in-process", EMBEDDING_SERVER_ADDRESS, e
+        )
+        return None
+    except RuntimeError as e:
+        logger.warning("%s; encoding in-process", e)
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve embeddings to local processes.")
+    parser.add_argument(
+        "--address",
+        default=EMBEDDING_SERVER_ADDRESS,
+        help="Unix socket path or host:port (default: EMBEDDING_SERVER_ADDRESS)",
+    )
+    parser.add_argument("--max-batch", type=int, default=EMBEDDING_SERVER_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=EMBEDDING_SERVER_MAX_WAIT_MS)
+    args = parser.parse_args()
+    if not args.address:
+        parser.error("set EMBEDDING_SERVER_ADDRESS or pass --address")
+
+    from .embeddings import get_backend
+
+    get_backend()  # load the model before accepting connections
+    server = EmbeddingServer(args.address, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,97 @@
-from typing import List
+import threading
+from typing import List, Optional
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-from ..config import EMBEDDING_MODEL_NAME
+from ..config import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE
 from ..logging_utils import get_logger
+from .embedding_backends import EmbeddingBackend, create_backend
+from .embedding_cache import EmbeddingCache
+from .embedding_server import remote_embed
 
 logger = get_logger(__name__)
 
-# Load once per process
-_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+_backend: Optional[EmbeddingBackend] = None
+_backend_lock = threading.Lock()
+_cache: Optional[EmbeddingCache] = None
 
 
-def embed_texts(texts: List[str]) -> np.ndarray:
+def get_backend() -> EmbeddingBackend:
+    """
+    The configured embedding backend (see EMBEDDING_BACKEND), created once per
+    process on first use. Importing the model runtime is deferred until then too.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+                logger.info("Embedding backend: %s (%s)", _backend.name, _backend.cache_id)
+    return _backend
+
+
+def embedding_dimension() -> int:
+    return get_backend().dimension
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    global _cache
+    if EMBEDDING_CACHE == "off":
+        return None
+    if _cache is None:
+        backend = get_backend()
+        _cache = EmbeddingCache(backend.cache_id, backend.dimension)
+    return _cache
+
+
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
+    backend = get_backend()
+    logger.info("Embedding %d texts using %s", len(texts), backend.cache_id)
+    return backend.encode(texts, batch_size)
+
+
+def embed_texts(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
     """
     Encode a list of texts into a 2D numpy array of embeddings.
+
+    Uses the shared embedding server when EMBEDDING_SERVER_ADDRESS is set and it
+    is reachable, otherwise encodes in-process (embed_texts_local).
+    """
+    emb = remote_embed(list(texts))
+    if emb is not None:
+        return emb
+    return embed_texts_local(texts, batch_size)
+
+
+def embed_texts_local(texts: List[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """
+    Encode texts with the in-process backend.
+
+    Backends sort texts by length before batching, so one call over many
+    texts gets tightly padded batches of `batch_size`. Texts already in the
+    embedding cache (see EMBEDDING_CACHE) are not re-encoded.
     """
     if not texts:
-        return np.zeros((0, _model.get_sentence_embedding_dimension()), dtype="float32")
-    logger.info("Embedding %d texts using %s", len(texts), EMBEDDING_MODEL_NAME)
-    emb = _model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-    return emb.astype("float32")
+        return np.zeros((0, embedding_dimension()), dtype="float32")
+
+    cache = get_embedding_cache()
+    if cache is None:
+        return _encode(texts, batch_size)
+
+    cached = cache.get_many(texts)
+    missing = list(dict.fromkeys(t for t, vec in zip(texts, cached) if vec is None))
+    fresh = {}
+    if missing:
+        emb = _encode(missing, batch_size)
+        cache.put_many(missing, emb)
+        fresh = dict(zip(missing, emb))
+
+    hits = len(texts) - sum(vec is None for vec in cached)
+    logger.info(
+        "Embedding cache: %d/%d hits (%.0f%%), %.0f%% since start",
+        hits,
+        len(texts),
+        100.0 * hits / len(texts),
+        100.0 * cache.hits / max(cache.hits + cache.misses, 1),
+    )
+    return np.stack([vec if vec is not None else fresh[t] for t, vec in zip(texts, cached)])
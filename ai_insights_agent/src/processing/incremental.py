@@ -0,0 +1,164 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..ids import canonical_url
+from ..models import Article, Chunk
+from ..logging_utils import get_logger
+from .chunking import semantic_chunk_corpus_with_vectors
+
+logger = get_logger(__name__)
+
+Chunker = Callable[[Article], List[Chunk]]
+
+
+@dataclass
+class ArticleDiff:
+    """
+    Result of comparing a fresh collection against the previous snapshot.
+
+    Articles are matched by canonical URL; since IDs are content-addressed,
+    a matching URL with a different ID means the page was modified.
+    """
+
+    added: List[Article] = field(default_factory=list)
+    modified: List[Article] = field(default_factory=list)
+    unchanged: List[Article] = field(default_factory=list)
+    # IDs whose chunks are stale: previous versions of modified pages and removed pages
+    stale_ids: List[str] = field(default_factory=list)
+    removed_ids: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> List[Article]:
+        return self.added + self.modified
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.removed_ids)
+
+
+@dataclass
+class ChunkDelta:
+    """
+    Changes to apply to a stored chunk set (and any index built over it).
+    """
+
+    added: List[Chunk] = field(default_factory=list)
+    removed_ids: List[str] = field(default_factory=list)
+    # Live articles that have no chunks (e.g. all dropped as near-duplicates)
+    chunkless_ids: List[str] = field(default_factory=list)
+    # Mean-pooled sentence vectors of `added`, row for row (None with a custom chunker)
+    vectors: Optional[np.ndarray] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed_ids)
+
+
+def diff_articles(current: Iterable[Article], previous: Iterable[Article]) -> ArticleDiff:
+    prev_by_url: Dict[str, Article] = {canonical_url(str(a.url)): a for a in previous}
+    diff = ArticleDiff()
+
+    seen_urls = set()
+    for art in current:
+        key = canonical_url(str(art.url))
+        seen_urls.add(key)
+        old = prev_by_url.get(key)
+        if old is None:
+            diff.added.append(art)
+        elif old.id != art.id:
+            diff.modified.append(art)
+            diff.stale_ids.append(old.id)
+        else:
+            diff.unchanged.append(art)
+
+    for key, old in prev_by_url.items():
+        if key not in seen_urls:
+            diff.removed_ids.append(old.id)
+            diff.stale_ids.append(old.id)
+
+    logger.info(
+        "Article diff: %d added, %d modified, %d unchanged, %d removed",
+        len(diff.added),
+        len(diff.modified),
+        len(diff.unchanged),
+        len(diff.removed_ids),
+    )
+    return diff
+
+
+def build_chunk_delta(
+    diff: ArticleDiff,
+    previous_chunks: Iterable[Chunk],
+    chunker: Optional[Chunker] = None,
+    chunkless_ids: Iterable[str] = (),
+) -> ChunkDelta:
+    """
+    Chunk only new/modified articles and collect the chunk IDs that must be dropped.
+
+    Any previous chunk not owned by an unchanged article is dropped (this covers
+    stale versions, removed pages and orphans). Unchanged articles with no chunks
+    in the previous snapshot are re-chunked, so a partial snapshot heals itself,
+    unless `chunkless_ids` (a previous delta's chunkless_ids) says they had none.
+
+    By default all articles to chunk share one embedding pass
+    (semantic_chunk_corpus_with_vectors, whose pooled vectors the delta keeps),
+    with near-duplicates detected against the chunks that are kept as well;
+    `chunker` swaps in a per-article chunker instead.
+    """
+    live = {a.id for a in diff.unchanged}
+    kept: List[Chunk] = []
+    removed_ids: List[str] = []
+    for c in previous_chunks:
+        if c.article_id not in live:
+            removed_ids.append(c.id)
+        else:
+            kept.append(c)
+
+    has_chunks = {c.article_id for c in kept}
+    known_chunkless = live.intersection(chunkless_ids)
+    to_chunk = diff.changed + [
+        a for a in diff.unchanged if a.id not in has_chunks and a.id not in known_chunkless
+    ]
+    vectors: Optional[np.ndarray] = None
+    if chunker is None:
+        per_article: List[List[Chunk]] = []
+        if to_chunk:
+            per_article, vectors = semantic_chunk_corpus_with_vectors(to_chunk, dedup_against=kept)
+    else:
+        per_article = [chunker(art) for art in to_chunk]
+    added = [c for chunks in per_article for c in chunks]
+    chunkless = sorted(known_chunkless - has_chunks)
+    chunkless += [art.id for art, chunks in zip(to_chunk, per_article) if not chunks]
+
+    logger.info(
+        "Chunk delta: %d chunks added from %d articles, %d chunks removed",
+        len(added),
+        len(to_chunk),
+        len(removed_ids),
+    )
+    return ChunkDelta(added=added, removed_ids=removed_ids, chunkless_ids=chunkless, vectors=vectors)
+
+
+def apply_chunk_delta(
+    chunks: Iterable[Chunk],
+    delta: ChunkDelta,
+    article_order: Optional[List[str]] = None,
+) -> List[Chunk]:
+    """
+    Return the chunk set after applying a delta.
+
+    If article_order is given, chunks are grouped by article in that order
+    (and by chunk order within an article), matching a full rebuild.
+    """
+    removed = set(delta.removed_ids)
+    added_ids = {c.id for c in delta.added}
+    result = [c for c in chunks if c.id not in removed and c.id not in added_ids]
+    result.extend(delta.added)
+
+    if article_order is not None:
+        rank = {aid: i for i, aid in enumerate(article_order)}
+        result = [c for c in result if c.article_id in rank]
+        result.sort(key=lambda c: (rank[c.article_id], c.order))
+    return result
@@ -0,0 +1,216 @@
+import json
+import math
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens. Numbers and single letters are kept: section
+    numbers, dates and annex letters are what lexical matching is for.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _int32s(values: array) -> np.ndarray:
+    return np.frombuffer(values, dtype=np.int32) if len(values) else np.zeros(0, dtype=np.int32)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an in-process inverted index.
+
+    Documents are numbered 0..n-1 in the order they are added (ChunkIndex
+    keeps them aligned with its rows). Postings live in a CSR block (term ->
+    document numbers and term frequencies), which save() writes and load()
+    can memory-map, plus in-memory per-term tails for documents added since.
+    remove() marks documents dead, which takes them out of N, avgdl and df
+    immediately; compact() folds the tails in, drops dead documents and
+    renumbers the survivors in order.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._vocab: Dict[str, int] = {}
+        # Postings of term t are [_offsets[t], _offsets[t + 1]) in _docs / _tfs
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.int32)
+        self._tails: Dict[int, Tuple[array, array]] = {}
+        self._doc_len = array("i")
+        self._alive = array("b")
+        self._live = 0
+        self._live_len = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def n_docs(self) -> int:
+        """
+        Documents added since the last compaction, dead ones included.
+        """
+        return len(self._doc_len)
+
+    @property
+    def n_terms(self) -> int:
+        return len(self._vocab)
+
+    @property
+    def n_postings(self) -> int:
+        return len(self._docs) + sum(len(docs) for docs, _ in self._tails.values())
+
+    def add(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            doc = len(self._doc_len)
+            tokens = tokenize(text)
+            for term, tf in Counter(tokens).items():
+                tid = self._vocab.setdefault(term, len(self._vocab))
+                tail = self._tails.get(tid)
+                if tail is None:
+                    tail = self._tails[tid] = (array("i"), array("i"))
+                tail[0].append(doc)
+                tail[1].append(tf)
+            self._doc_len.append(len(tokens))
+            self._alive.append(1)
+            self._live += 1
+            self._live_len += len(tokens)
+
+    def remove(self, docs: Iterable[int]) -> None:
+        for doc in docs:
+            if self._alive[doc]:
+                self._alive[doc] = 0
+                self._live -= 1
+                self._live_len -= self._doc_len[doc]
+
+    def _postings(self, tid: int) -> Tuple[np.ndarray, np.ndarray]:
+        parts = []
+        if tid + 1 < len(self._offsets):
+            start, end = self._offsets[tid], self._offsets[tid + 1]
+            parts.append((self._docs[start:end], self._tfs[start:end]))
+        if tid in self._tails:
+            docs, tfs = self._tails[tid]
+            parts.append((_int32s(docs), _int32s(tfs)))
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k live documents for a query as (scores, document numbers), best first.
+        """
+        terms = {self._vocab[t] for t in tokenize(query) if t in self._vocab}
+        if not terms or not self._live:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int64)
+
+        alive = np.frombuffer(self._alive, dtype=np.int8)
+        doc_len = _int32s(self._doc_len)
+        avgdl = max(self._live_len / self._live, 1e-9)
+        hits, contributions = [], []
+        for tid in terms:
+            docs, tfs = self._postings(tid)
+            keep = alive[docs] != 0
+            docs, tf = docs[keep], tfs[keep].astype(np.float32)
+            if not len(docs):
+                continue
+            idf = math.log(1.0 + (self._live - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * doc_len[docs] / avgdl)
+            hits.append(docs)
+            contributions.append(idf * tf * (self.k1 + 1.0) / (tf + norm))
+        if not hits:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int64)
+
+        docs, inverse = np.unique(np.concatenate(hits), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(contributions))
+        top = np.argsort(-totals, kind="stable")[:k]
+        return totals[top].astype(np.float32), docs[top].astype(np.int64)
+
+    def compact(self, drop_dead: bool = True) -> None:
+        """
+        Merge tails into the CSR block, drop dead documents and renumber the
+        rest (in order), so document i is the i-th live document. With
+        drop_dead=False dead documents stay (still marked dead) and keep their
+        numbers.
+        """
+        dropping = drop_dead and self._live != len(self._doc_len)
+        if not self._tails and not dropping:
+            return
+        if dropping:
+            alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+        else:
+            alive = np.ones(len(self._doc_len), dtype=bool)
+        renumber = np.cumsum(alive, dtype=np.int64) - 1
+
+        base_terms = np.repeat(np.arange(len(self._offsets) - 1, dtype=np.int64), np.diff(self._offsets))
+        term_parts, doc_parts, tf_parts = [base_terms], [np.asarray(self._docs)], [np.asarray(self._tfs)]
+        for tid, (docs, tfs) in self._tails.items():
+            term_parts.append(np.full(len(docs), tid, dtype=np.int64))
+            doc_parts.append(_int32s(docs))
+            tf_parts.append(_int32s(tfs))
+        terms, docs, tfs = (np.concatenate(p) for p in (term_parts, doc_parts, tf_parts))
+
+        keep = alive[docs]
+        terms, docs, tfs = terms[keep], renumber[docs[keep]], tfs[keep]
+        # Stable sort: within a term, block postings precede tail postings, so documents stay ascending
+        order = np.argsort(terms, kind="stable")
+        offsets = np.zeros(len(self._vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self._vocab)), out=offsets[1:])
+
+        self._offsets = offsets
+        self._docs = docs[order].astype(np.int32)
+        self._tfs = tfs[order].astype(np.int32)
+        self._tails = {}
+        if dropping:
+            self._doc_len = array("i", _int32s(self._doc_len)[alive].tobytes())
+            self._alive = array("b", bytes([1]) * len(self._doc_len))
+
+    def save(self, directory: Path, gen: str) -> Dict[str, str]:
+        """
+        Write the index into `directory` as generation-suffixed files; returns
+        them by role for the caller's manifest. Tails are merged first, but dead
+        documents are written too so numbering stays aligned with the caller's
+        rows: after load(), the caller marks them dead again with remove().
+        """
+        self.compact(drop_dead=False)
+        directory = Path(directory)
+        files = {
+            "bm25_vocab": f"bm25-vocab-{gen}.json",
+            "bm25_offsets": f"bm25-offsets-{gen}.npy",
+            "bm25_postings": f"bm25-postings-{gen}.npy",
+            "bm25_doc_len": f"bm25-doc-len-{gen}.npy",
+        }
+        terms = sorted(self._vocab, key=self._vocab.__getitem__)
+        vocab = {"k1": self.k1, "b": self.b, "terms": terms}
+        (directory / files["bm25_vocab"]).write_text(json.dumps(vocab), encoding="utf-8")
+        np.save(directory / files["bm25_offsets"], self._offsets)
+        np.save(directory / files["bm25_postings"], np.stack([self._docs, self._tfs]))
+        np.save(directory / files["bm25_doc_len"], _int32s(self._doc_len))
+        return files
+
+    @classmethod
+    def load(cls, directory: Path, files: Dict[str, str], mmap: bool = True) -> "BM25Index":
+        """
+        Load an index written by save(); with mmap=True the postings are
+        memory-mapped. Documents added later go to in-memory tails.
+        """
+        directory = Path(directory)
+        vocab = json.loads((directory / files["bm25_vocab"]).read_text(encoding="utf-8"))
+        loaded = cls(k1=vocab["k1"], b=vocab["b"])
+        loaded._vocab = {term: tid for tid, term in enumerate(vocab["terms"])}
+        loaded._offsets = np.load(directory / files["bm25_offsets"])
+        postings = np.load(directory / files["bm25_postings"], mmap_mode="r" if mmap else None)
+        loaded._docs, loaded._tfs = postings[0], postings[1]
+        doc_len = np.load(directory / files["bm25_doc_len"]).astype(np.int32)
+        loaded._doc_len = array("i", doc_len.tobytes())
+        loaded._alive = array("b", bytes([1]) * len(doc_len))
+        loaded._live = len(doc_len)
+        loaded._live_len = int(doc_len.sum())
+        return loaded
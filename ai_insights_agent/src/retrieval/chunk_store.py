@@ -0,0 +1,101 @@
+import json
+import mmap
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, MutableMapping, Set, Tuple
+
+import numpy as np
+
+from ..models import Chunk
+
+
+def write_chunk_store(path: Path, chunks: Iterable[Chunk]) -> Tuple[List[str], np.ndarray]:
+    """
+    Write chunks as JSON lines and return their ids and the byte offset of every
+    line (plus the end of file), which ChunkStore uses for random access.
+    """
+    ids: List[str] = []
+    offsets = [0]
+    with Path(path).open("wb") as f:
+        for chunk in chunks:
+            line = (json.dumps(chunk.dict(), default=str) + "\n").encode("utf-8")
+            f.write(line)
+            ids.append(chunk.id)
+            offsets.append(offsets[-1] + len(line))
+    return ids, np.array(offsets, dtype=np.int64)
+
+
+class ChunkStore(Mapping[str, Chunk]):
+    """
+    Read-only chunk id -> Chunk mapping over a memory-mapped JSON-lines file.
+
+    Only the ids and line offsets are held in memory; a chunk is parsed when it
+    is looked up, so opening a large store is cheap and processes that open
+    the same file share its pages.
+    """
+
+    def __init__(self, path: Path, ids: List[str], offsets: np.ndarray) -> None:
+        if len(offsets) != len(ids) + 1:
+            raise ValueError(f"Chunk store has {len(offsets) - 1} offsets for {len(ids)} ids")
+        self.path = Path(path)
+        self._rows = {cid: i for i, cid in enumerate(ids)}
+        self._offsets = offsets
+        with self.path.open("rb") as f:
+            # mmap of an empty file is an error; an empty store never reads it
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if ids else b""
+
+    def __getitem__(self, chunk_id: str) -> Chunk:
+        row = self._rows[chunk_id]
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return Chunk(**json.loads(self._data[start:end]))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, chunk_id: object) -> bool:
+        return chunk_id in self._rows
+
+
+class ChunkOverlay(MutableMapping[str, Chunk]):
+    """
+    Writable view over a read-only chunk mapping (a ChunkStore): additions and
+    deletions are kept in memory, so modifying a loaded index does not parse
+    every stored chunk.
+    """
+
+    def __init__(self, base: Mapping[str, Chunk]) -> None:
+        self.base = base
+        self._added: Dict[str, Chunk] = {}
+        self._deleted: Set[str] = set()
+
+    def __getitem__(self, chunk_id: str) -> Chunk:
+        if chunk_id in self._added:
+            return self._added[chunk_id]
+        if chunk_id in self._deleted:
+            raise KeyError(chunk_id)
+        return self.base[chunk_id]
+
+    def __setitem__(self, chunk_id: str, chunk: Chunk) -> None:
+        self._added[chunk_id] = chunk
+
+    def __delitem__(self, chunk_id: str) -> None:
+        if chunk_id not in self:
+            raise KeyError(chunk_id)
+        self._added.pop(chunk_id, None)
+        if chunk_id in self.base:
+            self._deleted.add(chunk_id)
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk_id in self.base:
+            if chunk_id not in self._deleted and chunk_id not in self._added:
+                yield chunk_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        shadowed = sum(1 for cid in self._added if cid in self.base and cid not in self._deleted)
+        return len(self.base) - len(self._deleted) + len(self._added) - shadowed
+
+    def __contains__(self, chunk_id: object) -> bool:
+        return chunk_id in self._added or (chunk_id not in self._deleted and chunk_id in self.base)
@@ -1,61 +1,729 @@
-from typing import List, Tuple, Optional
+import json
+import math
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple
 
 import faiss
 import numpy as np
 
+from ..config import (
+    INDEX_COMPACT_RATIO,
+    INDEX_DIR,
+    INDEX_EF_SEARCH,
+    INDEX_HNSW_M,
+    INDEX_NPROBE,
+    INDEX_TRAIN_SAMPLE,
+    INDEX_TYPE,
+    INDEX_VECTOR_SOURCE,
+    RETRIEVAL_MODE,
+)
 from ..models import Chunk
 from ..logging_utils import get_logger
+from ..processing.embedding_backends import backend_cache_id
 from ..processing.embeddings import embed_texts
+from .bm25 import BM25Index
+from .chunk_store import ChunkOverlay, ChunkStore, write_chunk_store
 
 logger = get_logger(__name__)
 
+# Bump when the snapshot layout changes; older snapshots are then rebuilt.
+INDEX_FORMAT_VERSION = 4
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+# "auto" policy: exact search while a scan is cheap, HNSW while its graph fits
+# comfortably in memory, IVF-PQ (compressed codes) beyond that.
+AUTO_FLAT_MAX = 50_000
+AUTO_HNSW_MAX = 1_000_000
+# IVF-PQ scores are approximate: fetch this many times k candidates and
+# rerank them on the exact stored vectors.
+PQ_RERANK_FACTOR = 4
+
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+# Hybrid retrieval ranks the top (k * HYBRID_FETCH_FACTOR) dense and BM25
+# results by reciprocal rank fusion: sum over lists of 1 / (RRF_K + rank).
+HYBRID_FETCH_FACTOR = 4
+RRF_K = 60
+
+
+def choose_index_type(n: int, requested: str = INDEX_TYPE) -> str:
+    requested = requested.lower()
+    if requested == "auto":
+        if n < AUTO_FLAT_MAX:
+            return "flat"
+        return "hnsw" if n < AUTO_HNSW_MAX else "ivf_pq"
+    if requested not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type: {requested}")
+    return requested
+
+
+def ivf_nlist(n: int) -> int:
+    # ~4 sqrt(n) lists, keeping at least 39 training points per list (FAISS's minimum)
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def pq_subquantizers(dim: int) -> int:
+    # Largest divisor of dim giving sub-vectors of at least 8 dimensions
+    return max(m for m in range(1, max(dim // 8, 1) + 1) if dim % m == 0)
+
+
+def training_sample(emb: np.ndarray, nlist: int, max_rows: int = INDEX_TRAIN_SAMPLE) -> np.ndarray:
+    """
+    Rows to train IVF centroids / PQ codebooks on: everything for small sets,
+    otherwise a fixed-seed random sample of max_rows (never fewer than 39 per list).
+    """
+    size = max(max_rows, 39 * nlist)
+    if emb.shape[0] <= size:
+        return emb
+    rows = np.sort(np.random.default_rng(0).choice(emb.shape[0], size, replace=False))
+    return emb[rows]
+
+
+def make_faiss_index(
+    emb: np.ndarray,
+    index_type: str = INDEX_TYPE,
+    ids: Optional[np.ndarray] = None,
+) -> Tuple[faiss.Index, str]:
+    """
+    Build and fill an inner-product FAISS index of the requested (or "auto")
+    type over normalised vectors, wrapped in an IndexIDMap2 so results carry
+    `ids` (default: row numbers). Returns the index and the type actually used.
+    """
+    n, dim = emb.shape
+    kind = choose_index_type(n, index_type)
+    if kind == "ivf_pq" and n < 256:
+        logger.warning("Too few vectors (%d) to train PQ codebooks; using a flat index", n)
+        kind = "flat"
+
+    if kind == "flat":
+        index = faiss.IndexFlatIP(dim)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, INDEX_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    else:
+        nlist = ivf_nlist(n)
+        quantizer = faiss.IndexFlatIP(dim)
+        if kind == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_subquantizers(dim), 8, faiss.METRIC_INNER_PRODUCT)
+        sample = training_sample(emb, nlist)
+        start = time.perf_counter()
+        index.train(sample)
+        index.nprobe = INDEX_NPROBE
+        logger.info(
+            "Trained %s (nlist=%d) on %d of %d vectors in %.1fs",
+            kind,
+            nlist,
+            sample.shape[0],
+            n,
+            time.perf_counter() - start,
+        )
+    mapped = faiss.IndexIDMap2(index)
+    mapped.add_with_ids(emb, np.arange(n, dtype=np.int64) if ids is None else ids)
+    return mapped, kind
+
+
+def search_params(
+    index: faiss.Index,
+    k: int,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    sel: Optional[faiss.IDSelector] = None,
+) -> Optional[faiss.SearchParameters]:
+    """
+    Per-call search parameters: the IVF / HNSW knobs of approximate indexes
+    and an optional id selector. None when neither applies.
+    """
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(nprobe=nprobe or INDEX_NPROBE, sel=sel)
+    if isinstance(inner, faiss.IndexHNSW):
+        # efSearch below k would cap the number of results
+        return faiss.SearchParametersHNSW(efSearch=max(ef_search or INDEX_EF_SEARCH, k), sel=sel)
+    return faiss.SearchParameters(sel=sel) if sel is not None else None
+
+
+def rerank_exact(
+    vectors: np.ndarray,
+    q_emb: np.ndarray,
+    indices: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Re-score candidate rows (-1 = no result) by exact inner product against
+    `vectors` and keep the top k per query.
+    """
+    scores = np.full((len(q_emb), k), -np.inf, dtype="float32")
+    top = np.full((len(q_emb), k), -1, dtype=np.int64)
+    for i, (q, rows) in enumerate(zip(q_emb, indices)):
+        rows = np.sort(rows[rows >= 0])  # ascending rows read mapped vectors in file order
+        exact = np.asarray(vectors[rows]) @ q
+        order = np.argsort(-exact, kind="stable")[:k]
+        scores[i, : len(order)] = exact[order]
+        top[i, : len(order)] = rows[order]
+    return scores, top
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[int]],
+    k: int,
+    rrf_k: int = RRF_K,
+) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked lists of items into the top k (item, score) pairs, where an
+    item scores sum(1 / (rrf_k + rank)) over the lists it appears in (rank
+    from 1). Ties keep the order items were first seen in.
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda kv: -kv[1])[:k]
+
+
+def _unique_ids(chunks: List[Chunk]) -> List[str]:
+    ids = [c.id for c in chunks]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Chunk ids must be unique")
+    return ids
+
+
+def _append_rows(
+    buf: Optional[np.ndarray],
+    current: np.ndarray,
+    new: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Geometric over-allocation keeps repeated adds linear overall. Returns the
+    # filled part of the buffer (a view) and the buffer itself.
+    n = current.shape[0]
+    if buf is None or current.base is not buf or buf.shape[0] < n + new.shape[0]:
+        grown = np.empty((max(2 * n, n + new.shape[0]),) + current.shape[1:], dtype=current.dtype)
+        grown[:n] = current
+        buf = grown
+    buf[n : n + new.shape[0]] = new
+    return buf[: n + new.shape[0]], buf
+
 
 class ChunkIndex:
     """
     FAISS-based index over semantic chunks.
 
     - Normalises embeddings to use inner product as cosine similarity.
+    - Keeps the normalised vectors (row i <-> chunk_ids[i]) so deltas can be
+      applied without re-embedding unchanged chunks.
+    - The FAISS index type is chosen at build time (see make_faiss_index);
+      query() takes nprobe / ef_search for IVF / HNSW indexes.
+    - A BM25 inverted index over the chunk texts is kept alongside (document
+      i <-> row i) for lexical and hybrid (reciprocal-rank fused) retrieval.
+    - add() / remove() / upsert() update it in place. Each chunk gets a 64-bit
+      FAISS id it keeps until it is removed; removed chunks are tombstoned
+      (filtered out of searches) until compact() drops them, which happens
+      automatically once INDEX_COMPACT_RATIO of the rows are tombstones.
+    - save() / load() persist it as a snapshot directory, tombstones included;
+      a loaded index is memory-mapped and read-only until it is next modified.
     """
 
-    def __init__(self) -> None:
-        self.index: Optional[faiss.IndexFlatIP] = None
-        self.chunk_ids: List[str] = []
-        self.chunks_by_id: dict[str, Chunk] = {}
+    def __init__(self, index_type: str = INDEX_TYPE) -> None:
+        self.index_type = index_type
+        self.kind = ""  # type actually built, e.g. "flat" when auto picks it
+        self.index: Optional[faiss.Index] = None
+        self.bm25 = BM25Index()
+        self.chunks_by_id: Mapping[str, Chunk] = {}  # live chunks only
+        # Per-row state, tombstoned rows included: vectors, FAISS ids (ascending)
+        # and chunk ids. Buffers hold spare capacity for add().
+        self._vectors: Optional[np.ndarray] = None
+        self._fids: Optional[np.ndarray] = None
+        self._row_ids: List[str] = []
+        self._row_of: Dict[str, int] = {}  # live chunk id -> row
+        self._dead: Set[int] = set()  # tombstoned rows
+        self._selector = None  # (id batch, selector excluding it) for tombstoned FAISS ids
+        self._next_fid = 0
+        self._vector_buf: Optional[np.ndarray] = None
+        self._fid_buf: Optional[np.ndarray] = None
+        self._mapped = False
+
+    @property
+    def chunk_ids(self) -> List[str]:
+        """
+        Live chunk ids in row order.
+        """
+        if not self._dead:
+            return list(self._row_ids)
+        return [cid for row, cid in enumerate(self._row_ids) if row not in self._dead]
+
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        """
+        Normalised vectors of live chunks, aligned with chunk_ids.
+        """
+        if self._vectors is None or not self._dead:
+            return self._vectors
+        return self._vectors[self._live_rows()]
+
+    def _live_rows(self) -> np.ndarray:
+        live = np.ones(len(self._row_ids), dtype=bool)
+        live[list(self._dead)] = False
+        return live
 
-    def build(self, chunks: List[Chunk]) -> None:
+    def build(self, chunks: List[Chunk], vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Build the index from chunks, encoding their texts unless `vectors`
+        (one row per chunk, e.g. pooled sentence vectors from chunking) is given.
+        """
         if not chunks:
             raise ValueError("No chunks provided to build index")
 
-        texts = [c.text for c in chunks]
-        emb = embed_texts(texts)
+        emb = self._embed(chunks, vectors)
+        self._set(chunks, emb)
+
+        logger.info("Index built with %d chunks (dim=%d, type=%s)", len(chunks), emb.shape[1], self.kind)
+
+    def _embed(self, chunks: List[Chunk], vectors: Optional[np.ndarray] = None) -> np.ndarray:
+        if vectors is not None:
+            if len(vectors) != len(chunks):
+                raise ValueError(f"Got {len(vectors)} vectors for {len(chunks)} chunks")
+            emb = np.array(vectors, dtype="float32")
+        else:
+            emb = embed_texts([c.text for c in chunks])
         if emb.shape[0] == 0:
             raise ValueError("Failed to compute embeddings")
-
         faiss.normalize_L2(emb)
-        dim = emb.shape[1]
+        return emb
 
-        self.index = faiss.IndexFlatIP(dim)
-        self.index.add(emb)
+    def _set(self, chunks: List[Chunk], emb: np.ndarray) -> None:
+        ids = _unique_ids(chunks)
+        fids = np.arange(len(ids), dtype=np.int64)
+        self.index, self.kind = make_faiss_index(emb, self.index_type, fids)
+        self.bm25 = BM25Index()
+        self.bm25.add(c.text for c in chunks)
 
-        self.chunk_ids = [c.id for c in chunks]
+        self._vectors = emb
+        self._fids = fids
+        self._row_ids = ids
+        self._row_of = {cid: row for row, cid in enumerate(ids)}
         self.chunks_by_id = {c.id: c for c in chunks}
+        self._dead = set()
+        self._selector = None
+        self._next_fid = len(ids)
+        self._vector_buf = self._fid_buf = None
+        self._mapped = False
 
-        logger.info("Index built with %d chunks (dim=%d)", len(chunks), dim)
+    def all_chunks(self) -> List[Chunk]:
+        """
+        Indexed chunks in row order.
+        """
+        return [self.chunks_by_id[cid] for cid in self.chunk_ids]
+
+    def add(self, chunks: List[Chunk], vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Append chunks to the index (creating it on first use), encoding their
+        texts unless `vectors` is given. Chunk ids must not be indexed yet
+        (use upsert() to replace chunks). Used by the streaming pipeline to
+        grow the index batch by batch.
+        """
+        if not chunks:
+            return
+        _unique_ids(chunks)
+        emb = self._embed(chunks, vectors)
+        if self.index is None or self._vectors is None:
+            self._set(chunks, emb)
+            return
+        self._append(chunks, emb)
 
-    def query(self, question: str, k: int = 5) -> List[Tuple[Chunk, float]]:
+    def _append(self, chunks: List[Chunk], emb: np.ndarray) -> None:
+        existing = [c.id for c in chunks if c.id in self._row_of]
+        if existing:
+            raise ValueError(f"{len(existing)} chunks are already indexed (e.g. {existing[0]}); use upsert()")
+        if emb.shape[1] != self._vectors.shape[1]:
+            raise ValueError(f"Vector dim {emb.shape[1]} does not match index dim {self._vectors.shape[1]}")
+        self._writable()
+
+        fids = np.arange(self._next_fid, self._next_fid + len(chunks), dtype=np.int64)
+        self._next_fid += len(chunks)
+        start = len(self._row_ids)
+        self._vectors, self._vector_buf = _append_rows(self._vector_buf, self._vectors, emb)
+        self._fids, self._fid_buf = _append_rows(self._fid_buf, self._fids, fids)
+        for offset, chunk in enumerate(chunks):
+            self._row_ids.append(chunk.id)
+            self._row_of[chunk.id] = start + offset
+            self.chunks_by_id[chunk.id] = chunk
+        self.bm25.add(c.text for c in chunks)
+
+        if self.index_type.lower() == "auto" and choose_index_type(len(self._row_of), "auto") != self.kind:
+            # Grown past an "auto" size threshold: rebuild as the larger type once
+            self.compact(rebuild=True)
+            logger.info("Index rebuilt as %s at %d chunks", self.kind, len(self._row_of))
+        else:
+            self.index.add_with_ids(emb, fids)
+
+    def remove(self, chunk_ids: Iterable[str]) -> int:
+        """
+        Remove chunks by id (unknown ids are ignored) and return how many were
+        removed. Their rows become tombstones until the next compaction.
+        """
         if self.index is None:
             raise RuntimeError("Index not built")
+        rows = {self._row_of[cid] for cid in set(chunk_ids) if cid in self._row_of}
+        if not rows:
+            return 0
 
-        q_emb = embed_texts([question])
-        faiss.normalize_L2(q_emb)
-        scores, indices = self.index.search(q_emb, k)
+        self._writable_chunks()
+        for row in rows:
+            chunk_id = self._row_ids[row]
+            del self._row_of[chunk_id]
+            del self.chunks_by_id[chunk_id]
+        self._dead |= rows
+        self._selector = None
+        self.bm25.remove(rows)
+        self._compact_if_needed()
+        return len(rows)
+
+    def _compact_if_needed(self) -> None:
+        if len(self._dead) > INDEX_COMPACT_RATIO * len(self._row_ids):
+            self.compact()
+
+    def upsert(self, chunks: List[Chunk], vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Add chunks, replacing any already indexed under the same ids.
+        """
+        if not chunks:
+            return
+        _unique_ids(chunks)
+        emb = self._embed(chunks, vectors)
+        if self.index is None or self._vectors is None:
+            self._set(chunks, emb)
+            return
+        self.remove(c.id for c in chunks)
+        self._append(chunks, emb)
+
+    def compact(self, rebuild: bool = False) -> int:
+        """
+        Drop tombstoned rows from the vectors and the FAISS index and return
+        how many were dropped. Flat and IVF indexes delete the ids in place;
+        HNSW graphs cannot delete nodes, so they (and any index when `rebuild`
+        is set) are rebuilt from the stored vectors without re-embedding.
+        """
+        if self.index is None or self._vectors is None:
+            raise RuntimeError("Index not built")
+        dropped = len(self._dead)
+        if not dropped and not rebuild:
+            return 0
+
+        self._writable()
+        self.bm25.compact()
+        live = self._live_rows()
+        dead_fids = self._fids[~live]
+        self._vectors = np.ascontiguousarray(self._vectors[live])
+        self._fids = self._fids[live]
+        self._row_ids = [cid for cid, keep in zip(self._row_ids, live.tolist()) if keep]
+        self._row_of = {cid: row for row, cid in enumerate(self._row_ids)}
+        self._dead = set()
+        self._selector = None
+        self._vector_buf = self._fid_buf = None
+
+        if rebuild or self.kind == "hnsw":
+            self.index, self.kind = make_faiss_index(self._vectors, self.index_type, self._fids)
+        else:
+            self.index.remove_ids(faiss.IDSelectorBatch(dead_fids))
+        if dropped:
+            logger.info("Index compacted: %d tombstones dropped (%d chunks)", dropped, len(self._row_ids))
+        return dropped
 
-        results: List[Tuple[Chunk, float]] = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < 0 or idx >= len(self.chunk_ids):
-                continue
-            chunk_id = self.chunk_ids[int(idx)]
-            results.append((self.chunks_by_id[chunk_id], float(score)))
+    def _writable_chunks(self) -> None:
+        if not isinstance(self.chunks_by_id, MutableMapping):
+            self.chunks_by_id = ChunkOverlay(self.chunks_by_id)
 
+    def _writable(self) -> None:
+        # Mapped snapshots are read-only (FAISS aborts on writes to mapped
+        # storage): copy the index and arrays into memory before changing them.
+        # Chunk texts stay mapped behind an overlay.
+        if self._mapped:
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self._vectors = np.array(self._vectors, dtype="float32")
+            self._fids = np.array(self._fids, dtype=np.int64)
+            self._mapped = False
+        self._writable_chunks()
+
+    def apply_delta(
+        self,
+        added: List[Chunk],
+        removed_ids: Iterable[str],
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Apply an incremental chunk update: drop removed chunks, embed only the
+        added ones (or use `vectors`, one row per added chunk, e.g. pooled
+        sentence vectors for an index built from them) and keep the stored
+        vectors for everything else.
+        """
+        if self.index is None or self._vectors is None:
+            raise RuntimeError("Index not built")
+
+        added_ids = set(_unique_ids(added))
+        drop = (set(removed_ids) | added_ids) & self._row_of.keys()
+        if len(self._row_of) - len(drop) + len(added) == 0:
+            raise ValueError("Delta would leave the index empty")
+
+        emb = self._embed(added, vectors) if added else None
+        removed_count = self.remove(drop)
+        if added:
+            self._append(added, emb)
+        logger.info(
+            "Index delta applied: +%d / -%d chunks (now %d)",
+            len(added),
+            removed_count,
+            len(self._row_of),
+        )
+
+    def _tombstone_selector(self) -> Optional[faiss.IDSelector]:
+        if not self._dead:
+            return None
+        if self._selector is None:
+            batch = faiss.IDSelectorBatch(self._fids[sorted(self._dead)])
+            # IDSelectorNot does not own `batch`; keep both alive together
+            self._selector = (batch, faiss.IDSelectorNot(batch))
+        return self._selector[1]
+
+    def _rows_for(self, fids: np.ndarray) -> np.ndarray:
+        # FAISS ids are allocated in increasing order as rows are appended
+        rows = np.searchsorted(self._fids, fids)
+        rows[fids < 0] = -1
+        return rows
+
+    def query(
+        self,
+        question: str,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        mode: str = RETRIEVAL_MODE,
+    ) -> List[Tuple[Chunk, float]]:
+        """
+        Top-k chunks for a question. `nprobe` (IVF lists scanned) and `ef_search`
+        (HNSW candidate list size) trade recall for speed on approximate
+        indexes; they default to INDEX_NPROBE / INDEX_EF_SEARCH. IVF-PQ
+        candidates are reranked on the exact vectors.
+
+        `mode` is "dense" (cosine similarity scores), "lexical" (BM25 scores)
+        or "hybrid" (dense and BM25 rankings fused by reciprocal rank, with
+        cosine similarity scores), defaulting to RETRIEVAL_MODE. RRF values
+        only order hybrid results: they are not comparable relevance scores.
+        """
+        results = self.query_many([question], k, nprobe, ef_search, mode)[0]
         logger.info("Index query returned %d chunks", len(results))
         return results
+
+    def query_many(
+        self,
+        questions: List[str],
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        mode: str = RETRIEVAL_MODE,
+    ) -> List[List[Tuple[Chunk, float]]]:
+        """
+        query() for many questions at once: one embedding batch and one FAISS
+        search over all of them. Returns one result list per question, in order.
+        """
+        if self.index is None:
+            raise RuntimeError("Index not built")
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if not questions:
+            return []
+
+        depth = k if mode == "dense" else k * HYBRID_FETCH_FACTOR
+        if mode == "lexical":
+            ranked = self._lexical_search(questions, k)
+        elif mode == "dense":
+            ranked = self._dense_search(self._embed_questions(questions), k, nprobe, ef_search)
+        else:
+            q_emb = self._embed_questions(questions)
+            dense = self._dense_search(q_emb, depth, nprobe, ef_search)
+            lexical = self._lexical_search(questions, depth)
+            ranked = []
+            for q, d, lx in zip(q_emb, dense, lexical):
+                rows = [row for row, _ in reciprocal_rank_fusion([[r for r, _ in d], [r for r, _ in lx]], k)]
+                # Score fused hits by cosine (exact, from the stored vectors) so
+                # callers see a similarity rather than an RRF value
+                cosines = np.asarray(self._vectors[rows], dtype="float32") @ q
+                ranked.append(list(zip(rows, cosines.tolist())))
+
+        return [[(self.chunks_by_id[self._row_ids[row]], score) for row, score in hits] for hits in ranked]
+
+    def _embed_questions(self, questions: List[str]) -> np.ndarray:
+        q_emb = embed_texts(list(questions))
+        faiss.normalize_L2(q_emb)
+        return q_emb
+
+    def _dense_search(
+        self,
+        q_emb: np.ndarray,
+        k: int,
+        nprobe: Optional[int],
+        ef_search: Optional[int],
+    ) -> List[List[Tuple[int, float]]]:
+        # (row, cosine) pairs per normalised query vector, best first
+        fetch = k * PQ_RERANK_FACTOR if self.kind == "ivf_pq" else k
+        params = search_params(self.index, fetch, nprobe, ef_search, self._tombstone_selector())
+        scores, fids = self.index.search(q_emb, fetch, params=params)
+        rows = self._rows_for(fids)
+        if self.kind == "ivf_pq":
+            scores, rows = rerank_exact(self._vectors, q_emb, rows, k)
+        return [
+            [(row, score) for row, score in zip(row_ids, row_scores) if row >= 0]
+            for row_scores, row_ids in zip(scores.tolist(), rows.tolist())
+        ]
+
+    def _lexical_search(self, questions: List[str], k: int) -> List[List[Tuple[int, float]]]:
+        # (row, BM25 score) pairs per question, best first; BM25 documents are rows
+        ranked = []
+        for question in questions:
+            scores, rows = self.bm25.search(question, k)
+            ranked.append(list(zip(rows.tolist(), scores.tolist())))
+        return ranked
+
+    # -------- Snapshots --------
+
+    def save(
+        self,
+        path: Path = INDEX_DIR,
+        embedding_model: Optional[str] = None,
+        vector_source: str = INDEX_VECTOR_SOURCE,
+    ) -> Path:
+        """
+        Save the index to a snapshot directory: the FAISS index, the vectors,
+        the FAISS ids, the BM25 index, the chunks (as a ChunkStore) and a
+        manifest naming the embedding model and the vector source ("encode"
+        or "pooled", see INDEX_VECTOR_SOURCE). Tombstoned rows are saved as such
+        (compacting rebuilds HNSW graphs), unless INDEX_COMPACT_RATIO of the
+        rows are tombstones.
+
+        Files carry a generation suffix and manifest.json is replaced last, so
+        readers (including processes with the previous snapshot mapped) always
+        see a complete snapshot. Only the files of the snapshot it replaces are
+        deleted, so other files in the directory are left alone.
+        """
+        if self.index is None or self._vectors is None:
+            raise RuntimeError("Index not built")
+        self._compact_if_needed()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        try:
+            previous = json.loads((path / "manifest.json").read_text(encoding="utf-8")).get("files", {})
+        except (OSError, ValueError, AttributeError):
+            previous = {}
+
+        gen = f"{time.time_ns():x}"
+        files = {
+            "index": f"index-{gen}.faiss",
+            "vectors": f"vectors-{gen}.npy",
+            "ids": f"ids-{gen}.npy",
+            "chunks": f"chunks-{gen}.jsonl",
+            "offsets": f"offsets-{gen}.npy",
+        }
+        faiss.write_index(self.index, str(path / files["index"]))
+        files.update(self.bm25.save(path, gen))
+        np.save(path / files["vectors"], np.ascontiguousarray(self._vectors, dtype="float32"))
+        np.save(path / files["ids"], np.asarray(self._fids, dtype=np.int64))
+        ids, offsets = write_chunk_store(path / files["chunks"], self.all_chunks())
+        np.save(path / files["offsets"], offsets)
+
+        manifest = {
+            "format": INDEX_FORMAT_VERSION,
+            "embedding_model": embedding_model or backend_cache_id(),
+            "vector_source": vector_source,
+            "index_type": self.kind,
+            "dim": int(self._vectors.shape[1]),
+            "count": len(self._row_ids),
+            "row_ids": self._row_ids,
+            "dead_rows": sorted(self._dead),
+            "next_id": self._next_fid,
+            "files": files,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        tmp = path / f"manifest-{gen}.json.tmp"
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, path / "manifest.json")
+
+        for name in set(previous.values()) - set(files.values()):
+            try:
+                (path / name).unlink()
+            except OSError:
+                pass  # already gone, or still mapped by another process (Windows)
+
+        logger.info("Saved index snapshot (%d chunks) to %s", len(ids), path)
+        return path
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = INDEX_DIR,
+        mmap: bool = True,
+        embedding_model: Optional[str] = None,
+        vector_source: str = INDEX_VECTOR_SOURCE,
+    ) -> "ChunkIndex":
+        """
+        Load a snapshot written by save(). With mmap=True the FAISS index, the
+        vectors and the chunk texts are memory-mapped rather than read, so loading
+        is near-instant and processes using the same snapshot share its pages.
+
+        Raises FileNotFoundError when there is no snapshot and ValueError when it
+        was written in another format, with another embedding model than
+        `embedding_model` (default: the configured one) or from other vectors
+        than `vector_source`.
+        """
+        path = Path(path)
+        manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+        if manifest.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Index snapshot format {manifest.get('format')} != {INDEX_FORMAT_VERSION}")
+        expected = embedding_model or backend_cache_id()
+        if manifest.get("embedding_model") != expected:
+            raise ValueError(
+                f"Index snapshot was built with {manifest.get('embedding_model')}, expected {expected}"
+            )
+        if manifest.get("vector_source") != vector_source:
+            raise ValueError(
+                f"Index snapshot was built from {manifest.get('vector_source')} vectors, expected {vector_source}"
+            )
+
+        files = manifest["files"]
+        index_file = str(path / files["index"])
+        if mmap:
+            try:
+                index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP_IFC)
+            except (AttributeError, RuntimeError):
+                index = faiss.read_index(index_file)  # this FAISS build cannot map flat codes
+        else:
+            index = faiss.read_index(index_file)
+
+        loaded = cls()
+        loaded.index = index
+        loaded.kind = manifest.get("index_type", "flat")
+        loaded._vectors = np.load(path / files["vectors"], mmap_mode="r" if mmap else None)
+        loaded._fids = np.load(path / files["ids"])
+        loaded._row_ids = list(manifest["row_ids"])
+        loaded._dead = set(manifest["dead_rows"])
+        loaded._row_of = {cid: row for row, cid in enumerate(loaded._row_ids) if row not in loaded._dead}
+        loaded._next_fid = int(manifest["next_id"])
+        offsets = np.load(path / files["offsets"])
+        store = ChunkStore(path / files["chunks"], loaded.chunk_ids, offsets)
+        loaded.chunks_by_id = store if mmap else dict(store.items())
+        loaded.bm25 = BM25Index.load(path, files, mmap=mmap)
+        loaded._mapped = mmap
+
+        rows = len(loaded._row_ids)
+        sizes = (index.ntotal, loaded._vectors.shape[0], loaded._fids.shape[0], loaded.bm25.n_docs, rows)
+        if any(size != manifest["count"] for size in sizes) or any(row >= rows for row in loaded._dead):
+            raise ValueError(f"Index snapshot in {path} is inconsistent")
+        loaded.bm25.remove(loaded._dead)
+        logger.info(
+            "Loaded index snapshot (%d chunks, %d tombstones, mmap=%s) from %s",
+            len(loaded._row_of),
+            len(loaded._dead),
+            mmap,
+            path,
+        )
+        return loaded
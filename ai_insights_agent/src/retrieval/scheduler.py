@@ -0,0 +1,92 @@
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..batching import MicroBatcher
+from ..config import QUERY_BATCH_MAX, QUERY_BATCH_MAX_WAIT_MS, RETRIEVAL_MODE
+from ..models import Chunk
+from .index import ChunkIndex
+
+# (question, k, nprobe, ef_search, mode)
+QueryRequest = Tuple[str, int, Optional[int], Optional[int], str]
+QueryResult = List[Tuple[Chunk, float]]
+
+
+class QueryScheduler:
+    """
+    Micro-batching front end for ChunkIndex.query, shared by concurrent callers
+    (UI sessions, API handlers).
+
+    Up to `max_batch` pending requests are answered by one
+    ChunkIndex.query_many call (one embedding batch, one FAISS search).
+    Requests that arrive while a batch is running queue up and form the next
+    one, so with `max_wait` 0 batches grow with load and a lone caller is not
+    delayed; a positive `max_wait` holds each batch open that long to fill it.
+    Requests with different search settings are answered by separate calls,
+    and an error in one of them fails only the requests it was answering.
+    """
+
+    def __init__(
+        self,
+        index: ChunkIndex,
+        max_batch: int = QUERY_BATCH_MAX,
+        max_wait: float = QUERY_BATCH_MAX_WAIT_MS / 1000,
+    ) -> None:
+        self.index = index
+        self._batcher: MicroBatcher[QueryRequest, QueryResult] = MicroBatcher(
+            self._run, max_batch=max_batch, max_wait=max_wait, name="query-scheduler"
+        )
+
+    def submit(
+        self,
+        question: str,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        mode: str = RETRIEVAL_MODE,
+    ) -> "Future[QueryResult]":
+        return self._batcher.submit((question, k, nprobe, ef_search, mode))
+
+    def query(
+        self,
+        question: str,
+        k: int = 5,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        mode: str = RETRIEVAL_MODE,
+        timeout: Optional[float] = None,
+    ) -> QueryResult:
+        """
+        Same arguments and results as ChunkIndex.query, batched with concurrent calls.
+        """
+        return self.submit(question, k, nprobe, ef_search, mode).result(timeout)
+
+    @property
+    def batches(self) -> int:
+        return self._batcher.batches
+
+    @property
+    def queries(self) -> int:
+        return self._batcher.items
+
+    def close(self) -> None:
+        self._batcher.close()
+
+    def _run(self, requests: List[QueryRequest]) -> List[Union[QueryResult, Exception]]:
+        # Requests with different search settings go to separate query_many calls
+        groups: Dict[Tuple[int, Optional[int], Optional[int], str], List[int]] = {}
+        for pos, (_, *settings) in enumerate(requests):
+            groups.setdefault(tuple(settings), []).append(pos)
+
+        results: List[Union[QueryResult, Exception]] = [[] for _ in requests]
+        for settings, positions in groups.items():
+            questions = [requests[pos][0] for pos in positions]
+            try:
+                found = self.index.query_many(questions, *settings)
+            except Exception as e:
+                # e.g. an unknown mode: fail only this group's requests
+                for pos in positions:
+                    results[pos] = e
+                continue
+            for pos, hits in zip(positions, found):
+                results[pos] = hits
+        return results
@@ -1,53 +1,373 @@
-from typing import List
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..config import (
     BBC_ARTICLE_URLS,
+    BBC_SOURCE_NAME,
+    FETCH_MAX_WORKERS,
     GOVUK_ARTICLE_URLS,
+    GOVUK_INGEST_MODE,
+    GOVUK_SOURCE_NAME,
+    PARSE_WORKERS,
 )
+from ..data.blobs import get_blob_store
+from ..ids import canonical_url
 from ..models import Article
 from ..logging_utils import get_logger
-from .fetch import fetch_html
+from .fetch import HostThrottle, fetch_html
+from .frontier import CrawlFrontier
+from .govuk_content_api import content_api_url, parse_govuk_content_item
 from .parse_bbc import parse_bbc_article
 from .parse_govuk import parse_govuk_article
 
 logger = get_logger(__name__)
 
+Parser = Callable[[str, str], Article]
 
-def collect_articles() -> List[Article]:
+# Below this many documents per process, parse_documents parses inline
+_MIN_DOCS_PER_WORKER = 8
+
+
+def _parser_for(source: str) -> Parser:
+    if source == BBC_SOURCE_NAME:
+        return parse_bbc_article
+    if source == GOVUK_SOURCE_NAME:
+        if GOVUK_INGEST_MODE == "content_api":
+            return parse_govuk_content_item
+        return parse_govuk_article
+    raise ValueError(f"No parser registered for source: {source}")
+
+
+def _source_jobs(
+    sources: Optional[Iterable[Tuple[str, str]]] = None,
+) -> List[Tuple[str, str, Parser]]:
+    """
+    (source, url, parser) jobs, in the order results are returned.
+    Defaults to all configured URLs.
+    """
+    if sources is None:
+        sources = [(BBC_SOURCE_NAME, url) for url in BBC_ARTICLE_URLS]
+        sources += [(GOVUK_SOURCE_NAME, url) for url in GOVUK_ARTICLE_URLS]
+    return [(source, url, _parser_for(source)) for source, url in sources]
+
+
+def _fetch_url(url: str, parser: Parser) -> str:
+    # Content API items live under /api/content/<page path>
+    if parser is parse_govuk_content_item:
+        return content_api_url(url)
+    return url
+
+
+def _fetch(
+    source: str,
+    url: str,
+    throttle: Optional[HostThrottle] = None,
+) -> Optional[str]:
+    try:
+        logger.info("Fetching %s article: %s", source, url)
+        if throttle is not None:
+            with throttle.slot(url):
+                html = fetch_html(url)
+        else:
+            html = fetch_html(url)
+        # Persist the raw page once, by content hash; articles only keep the key
+        get_blob_store().put(html)
+        return html
+    except Exception as e:
+        logger.warning("Skipping %s URL due to error: %s | %s", source, url, e)
+    return None
+
+
+def _parse(source: str, url: str, parser: Parser, html: str) -> Optional[Article]:
+    try:
+        art = parser(url, html)
+        if art.clean_text.strip():
+            return art
+        logger.warning("%s article had empty text: %s", source, url)
+    except Exception as e:
+        logger.warning("Skipping %s URL due to parse error: %s | %s", source, url, e)
+    return None
+
+
+def _parse_job(job: Tuple[str, str, Parser, str]) -> Optional[Article]:
+    return _parse(*job)
+
+
+def parse_documents(
+    docs: List[Tuple[str, str, Parser, str]],
+    workers: int = PARSE_WORKERS,
+) -> List[Optional[Article]]:
+    """
+    Parse (source, url, parser, html) documents, in a process pool when
+    workers != 1 so large pages are parsed in parallel across cores.
+    Each process gets at least _MIN_DOCS_PER_WORKER documents, since starting
+    one costs more than parsing a few pages. Results are returned in input order.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(docs) // _MIN_DOCS_PER_WORKER)
+    if workers <= 1:
+        return [_parse_job(doc) for doc in docs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_job, docs))
+
+
+def _fetch_pages(
+    jobs: List[Tuple[str, str, Parser]],
+    max_workers: int = FETCH_MAX_WORKERS,
+    throttle: Optional[HostThrottle] = None,
+) -> List[Optional[str]]:
+    """
+    Fetch stage (thread pool). Returns one page per job, in job order; None
+    marks a failed fetch.
+    """
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [
+            _fetch(source, _fetch_url(url, parser), throttle)
+            for source, url, parser in jobs
+        ]
+    throttle = throttle or HostThrottle()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        return list(
+            pool.map(
+                lambda job: _fetch(job[0], _fetch_url(job[1], job[2]), throttle=throttle),
+                jobs,
+            )
+        )
+
+
+def _parse_pages(
+    jobs: List[Tuple[str, str, Parser]],
+    pages: List[Optional[str]],
+    parse_workers: int = PARSE_WORKERS,
+) -> List[Optional[Article]]:
+    """
+    Parse stage (process pool) over fetched pages. Returns one result per job,
+    in job order; None marks a failed fetch or an unparseable or empty page.
+    """
+    fetched = [i for i, html in enumerate(pages) if html is not None]
+    docs = [(*jobs[i], pages[i]) for i in fetched]
+    results: List[Optional[Article]] = [None] * len(jobs)
+    for i, art in zip(fetched, parse_documents(docs, workers=parse_workers)):
+        results[i] = art
+    return results
+
+
+def _run_jobs(
+    jobs: List[Tuple[str, str, Parser]],
+    max_workers: int = FETCH_MAX_WORKERS,
+    throttle: Optional[HostThrottle] = None,
+    parse_workers: int = PARSE_WORKERS,
+) -> List[Optional[Article]]:
+    """
+    Fetch stage (thread pool) followed by parse stage (process pool).
+    Returns one result per job, in job order; None marks a failed or empty page.
+    """
+    return _parse_pages(jobs, _fetch_pages(jobs, max_workers, throttle), parse_workers)
+
+
+def collect_articles(
+    max_workers: int = FETCH_MAX_WORKERS,
+    throttle: Optional[HostThrottle] = None,
+    parse_workers: int = PARSE_WORKERS,
+    sources: Optional[Iterable[Tuple[str, str]]] = None,
+) -> List[Article]:
     """
     Fetch and parse all configured sources into Article models.
+    `sources` overrides the configured URLs with explicit (source, url) pairs.
 
     Currently:
     - GOV.UK AI regulation and safety policy documents
     - Optional BBC articles (if URLs configured)
-    """
-    articles: List[Article] = []
 
-    # BBC
-    for url in BBC_ARTICLE_URLS:
-        try:
-            logger.info("Fetching BBC article: %s", url)
-            html = fetch_html(url)
-            art = parse_bbc_article(url, html)
-            if art.clean_text.strip():
-                articles.append(art)
-            else:
-                logger.warning("BBC article had empty text: %s", url)
-        except Exception as e:
-            logger.warning("Skipping BBC URL due to error: %s | %s", url, e)
-
-    # GOV.UK
-    for url in GOVUK_ARTICLE_URLS:
-        try:
-            logger.info("Fetching GOV.UK article: %s", url)
-            html = fetch_html(url)
-            art = parse_govuk_article(url, html)
-            if art.clean_text.strip():
-                articles.append(art)
-            else:
-                logger.warning("GOV.UK article had empty text: %s", url)
-        except Exception as e:
-            logger.warning("Skipping GOV.UK URL due to error: %s | %s", url, e)
+    With max_workers > 1 pages are fetched concurrently over a shared keep-alive
+    session, subject to per-host limits. Parsing runs as a separate stage in a
+    process pool (see parse_documents). Results keep the configured URL order
+    (BBC first, then GOV.UK) regardless of completion order.
+    """
+    results = _run_jobs(_source_jobs(sources), max_workers, throttle, parse_workers)
 
+    articles = [art for art in results if art is not None]
     logger.info("Collected %d articles in total", len(articles))
     return articles
+
+
+def iter_articles(
+    max_workers: int = FETCH_MAX_WORKERS,
+    throttle: Optional[HostThrottle] = None,
+    sources: Optional[Iterable[Tuple[str, str]]] = None,
+    window: int = 0,
+) -> Iterator[Article]:
+    """
+    Streaming collect_articles: yield articles in configured order as their
+    pages arrive, with at most `window` pages (default 2 x max_workers) fetched
+    ahead of the consumer. Pages are parsed as they are consumed, so memory
+    does not grow with the number of sources.
+    """
+    count = 0
+    for (source, url, parser), html in _iter_pages(_source_jobs(sources), max_workers, throttle, window):
+        if html is None:
+            continue
+        art = _parse(source, url, parser, html)
+        if art is not None:
+            count += 1
+            yield art
+
+    logger.info("Streamed %d articles in total", count)
+
+
+def _iter_pages(
+    jobs: Iterable[Tuple[str, str, Parser]],
+    max_workers: int = FETCH_MAX_WORKERS,
+    throttle: Optional[HostThrottle] = None,
+    window: int = 0,
+) -> Iterator[Tuple[Tuple[str, str, Parser], Optional[str]]]:
+    """
+    Streaming fetch stage: yield (job, page) in job order, with at most
+    `window` pages (default 2 x max_workers) fetched ahead of the consumer.
+    None marks a failed fetch.
+    """
+    jobs = iter(jobs)
+    throttle = throttle or HostThrottle()
+    window = window or 2 * max(max_workers, 1)
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+        pending = deque()
+
+        def submit_next() -> None:
+            job = next(jobs, None)
+            if job is not None:
+                source, url, parser = job
+                pending.append((job, pool.submit(_fetch, source, _fetch_url(url, parser), throttle)))
+
+        for _ in range(window):
+            submit_next()
+        while pending:
+            job, future = pending.popleft()
+            submit_next()
+            yield job, future.result()
+
+
+# -------- Frontier-driven crawling --------
+
+def seed_frontier(frontier: CrawlFrontier, priority: int = 10) -> None:
+    """
+    Register the configured source URLs with the frontier.
+    """
+    frontier.add_many(BBC_ARTICLE_URLS, BBC_SOURCE_NAME, priority=priority)
+    frontier.add_many(GOVUK_ARTICLE_URLS, GOVUK_SOURCE_NAME, priority=priority)
+
+
+class FrontierCrawl:
+    """
+    One crawl of the URLs a frontier says are due.
+
+    collect() returns the full current corpus: fresh articles for crawled URLs,
+    previous versions for the rest. Failures are recorded as they happen (only
+    fetch errors back off the whole host). Successful fetches are recorded by
+    complete(), which callers run once the articles are saved: if the run dies
+    before that, the leases expire and the URLs are crawled again.
+
+    stream() yields the same corpus without holding it in memory. `previous`
+    is iterated once, so it can be a generator such as iter_latest_articles().
+    """
+
+    def __init__(
+        self,
+        frontier: CrawlFrontier,
+        previous: Iterable[Article] = (),
+        limit: int = 100,
+    ) -> None:
+        self.frontier = frontier
+        self.limit = limit
+        self._previous = previous
+        # Crawled URL -> content hash, until complete()
+        self.refreshed: Dict[str, str] = {}
+
+    def _record(self, url: str, html: Optional[str], art: Optional[Article]) -> None:
+        if html is None:
+            self.frontier.fail(url)
+        elif art is None:
+            self.frontier.fail(url, host_backoff=False)
+        else:
+            self.refreshed[url] = art.id
+
+    def collect(
+        self,
+        max_workers: int = FETCH_MAX_WORKERS,
+        throttle: Optional[HostThrottle] = None,
+        parse_workers: int = PARSE_WORKERS,
+    ) -> List[Article]:
+        leased = self.frontier.lease_due(self.limit)
+        jobs = [(e.source, e.url, _parser_for(e.source)) for e in leased]
+        pages = _fetch_pages(jobs, max_workers, throttle)
+        results = _parse_pages(jobs, pages, parse_workers)
+
+        fresh: Dict[str, Article] = {}
+        for entry, html, art in zip(leased, pages, results):
+            self._record(entry.url, html, art)
+            if art is not None:
+                fresh[entry.url] = art
+
+        previous = {canonical_url(str(a.url)): a for a in self._previous}
+        articles: List[Article] = []
+        for entry in self.frontier.all_entries():
+            art = fresh.get(entry.url) or previous.get(entry.url)
+            if art is not None:
+                articles.append(art)
+
+        logger.info(
+            "Frontier crawl: %d due, %d refreshed, %d articles in corpus",
+            len(leased),
+            len(fresh),
+            len(articles),
+        )
+        return articles
+
+    def stream(
+        self,
+        max_workers: int = FETCH_MAX_WORKERS,
+        throttle: Optional[HostThrottle] = None,
+        window: int = 0,
+    ) -> Iterator[Article]:
+        """
+        Streaming collect(): crawled articles first, parsed as their pages
+        arrive (see iter_articles), then previous versions of the other
+        frontier URLs, read one at a time from `previous`.
+        """
+        leased = self.frontier.lease_due(self.limit)
+        jobs = [(e.source, e.url, _parser_for(e.source)) for e in leased]
+        fresh = 0
+        for (source, url, parser), html in _iter_pages(jobs, max_workers, throttle, window):
+            art = _parse(source, url, parser, html) if html is not None else None
+            self._record(url, html, art)
+            if art is not None:
+                fresh += 1
+                yield art
+
+        remaining = {e.url for e in self.frontier.all_entries()}.difference(self.refreshed)
+        kept = 0
+        for art in self._previous:
+            url = canonical_url(str(art.url))
+            if url in remaining:
+                remaining.discard(url)
+                kept += 1
+                yield art
+
+        logger.info(
+            "Frontier crawl: %d due, %d refreshed, %d articles in corpus",
+            len(leased),
+            fresh,
+            fresh + kept,
+        )
+
+    def complete(self) -> int:
+        """
+        Mark the crawled URLs as done and schedule their next crawl.
+        """
+        for url, content_hash in self.refreshed.items():
+            self.frontier.complete(url, content_hash=content_hash)
+        done = len(self.refreshed)
+        self.refreshed = {}
+        return done
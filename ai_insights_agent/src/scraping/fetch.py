@@ -1,10 +1,28 @@
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
 from datetime import datetime
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+from ..config import (
+    FETCH_MAX_WORKERS,
+    FETCH_PER_HOST_CONCURRENCY,
+    FETCH_PER_HOST_MIN_INTERVAL,
+    FETCH_REPLAY_JITTER,
+    FETCH_REPLAY_LATENCY,
+    FETCH_TRANSPORT,
+    HTTP_ARCHIVE_DIR,
+    HTTP_CACHE_MODE,
+)
 from ..logging_utils import get_logger
+from .http_cache import CacheMissError, HttpCache, get_http_cache
+from .replay import HttpArchive, RecordingAdapter, ReplayAdapter
 
 logger = get_logger(__name__)
 
@@ -16,17 +34,174 @@ DEFAULT_HEADERS = {
     )
 }
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
-def fetch_html(url: str, timeout: int = 20) -> str:
+
+def get_session() -> requests.Session:
+    """
+    Process-wide HTTP session with keep-alive connection pools.
+
+    Pools are sized so every fetch worker can hold an open connection to the same host.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                configure_transport(session=session)
+                _session = session
+    return _session
+
+
+def configure_transport(
+    mode: str = FETCH_TRANSPORT,
+    archive_dir: Path = HTTP_ARCHIVE_DIR,
+    latency: float = FETCH_REPLAY_LATENCY,
+    jitter: float = FETCH_REPLAY_JITTER,
+    session: Optional[requests.Session] = None,
+) -> requests.Session:
+    """
+    Mount the HTTP transport on a session (the shared one by default).
+
+    - "live": plain keep-alive connection pools
+    - "record": live requests, with every response also written to archive_dir
+    - "replay": responses served from archive_dir without touching the network,
+      each delayed by `latency` (+ up to `jitter`) seconds
+    """
+    session = session or get_session()
+    pool = max(FETCH_MAX_WORKERS, 1)
+    if mode == "live":
+        adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+    elif mode == "record":
+        adapter = RecordingAdapter(HttpArchive(archive_dir), pool_connections=pool, pool_maxsize=pool)
+    elif mode == "replay":
+        adapter = ReplayAdapter(HttpArchive(archive_dir), latency=latency, jitter=jitter)
+    else:
+        raise ValueError(f"Unknown FETCH_TRANSPORT: {mode}")
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if mode != "live":
+        logger.info("HTTP transport: %s (archive: %s)", mode, archive_dir)
+    return session
+
+
+class HostThrottle:
+    """
+    Per-host politeness limits shared by concurrent fetch workers.
+
+    - At most `max_concurrency` in-flight requests per host
+    - At least `min_interval` seconds between request starts on the same host
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = FETCH_PER_HOST_CONCURRENCY,
+        min_interval: float = FETCH_PER_HOST_MIN_INTERVAL,
+    ) -> None:
+        self.max_concurrency = max(max_concurrency, 1)
+        self.min_interval = max(min_interval, 0.0)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.max_concurrency)
+                self._semaphores[host] = sem
+            return sem
+
+    def _reserve_start(self, host: str) -> float:
+        # Claim the next start slot for this host; returns how long to wait for it.
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).netloc.lower()
+        sem = self._semaphore(host)
+        with sem:
+            delay = self._reserve_start(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+
+def fetch_html(
+    url: str,
+    timeout: int = 20,
+    session: Optional[requests.Session] = None,
+    cache: Optional[HttpCache] = None,
+    cache_mode: Optional[str] = None,
+) -> str:
     """
     Fetch HTML from a URL with basic headers.
     Raises for 4xx/5xx to make failures explicit.
+
+    Responses are cached on disk (see HTTP_CACHE_MODE):
+    - "on": fresh entries are served directly; stale ones are revalidated with
+      If-None-Match / If-Modified-Since and reused on 304 Not Modified
+    - "offline": only cached bodies are served; a miss raises CacheMissError
+    - "off": always download
     """
-    resp = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
+    mode = cache_mode or HTTP_CACHE_MODE
+    session = session or get_session()
+
+    if mode == "off":
+        return _get(session, url, timeout, DEFAULT_HEADERS).text
+
+    cache = cache or get_http_cache()
+    entry = cache.get(url)
+
+    if mode == "offline":
+        if entry is None:
+            raise CacheMissError(f"No cached response for {url} (offline mode)")
+        return entry.body
+
+    if entry is not None and entry.is_fresh(cache.ttl):
+        logger.info("HTTP cache hit (fresh): %s", url)
+        return entry.body
+
+    headers = dict(DEFAULT_HEADERS)
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    resp = _get(session, url, timeout, headers)
+    if resp.status_code == 304 and entry is not None:
+        logger.info("HTTP cache hit (304 Not Modified): %s", url)
+        cache.touch(entry)
+        return entry.body
+
+    cache.put(
+        url,
+        resp.text,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+    )
+    return resp.text
+
+
+def _get(
+    session: requests.Session,
+    url: str,
+    timeout: int,
+    headers: Dict[str, str],
+) -> requests.Response:
+    resp = session.get(url, headers=headers, timeout=timeout)
     if resp.status_code >= 400:
         logger.warning("HTTP %s when fetching %s", resp.status_code, url)
         resp.raise_for_status()
-    return resp.text
+    return resp
 
 
 def parse_iso_datetime_maybe(dt_str: Optional[str]) -> Optional[datetime]:
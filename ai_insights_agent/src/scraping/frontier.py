@@ -0,0 +1,272 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from ..config import (
+    FRONTIER_DB_PATH,
+    FRONTIER_DEFAULT_INTERVAL,
+    FRONTIER_LEASE_SECONDS,
+    FRONTIER_MAX_INTERVAL,
+    FRONTIER_MAX_PER_HOST,
+    FRONTIER_MIN_INTERVAL,
+)
+from ..ids import canonical_url
+from ..logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url            TEXT PRIMARY KEY,
+    source         TEXT NOT NULL,
+    host           TEXT NOT NULL,
+    priority       INTEGER NOT NULL DEFAULT 0,
+    discovered_at  REAL NOT NULL,
+    last_seen      REAL,
+    next_due       REAL NOT NULL,
+    interval       REAL NOT NULL,
+    fail_count     INTEGER NOT NULL DEFAULT 0,
+    content_hash   TEXT,
+    lease_until    REAL
+);
+CREATE INDEX IF NOT EXISTS idx_urls_due ON urls (next_due, priority);
+CREATE TABLE IF NOT EXISTS hosts (
+    host          TEXT PRIMARY KEY,
+    next_allowed  REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class FrontierEntry:
+    url: str
+    source: str
+    host: str
+    priority: int
+    last_seen: Optional[float]
+    next_due: float
+    interval: float
+    fail_count: int
+    content_hash: Optional[str]
+
+
+class CrawlFrontier:
+    """
+    Persistent crawl queue backed by SQLite.
+
+    - Every known URL has a priority, last-seen time and next-due time
+    - lease_due() hands out due URLs, highest priority first, capped per host
+      and skipping hosts that are backing off after errors
+    - Leases expire, so URLs taken by a crashed run become due again
+    - Recrawl intervals adapt: halved when content changed, doubled when not
+    """
+
+    def __init__(
+        self,
+        path: Path = FRONTIER_DB_PATH,
+        min_interval: float = FRONTIER_MIN_INTERVAL,
+        max_interval: float = FRONTIER_MAX_INTERVAL,
+        default_interval: float = FRONTIER_DEFAULT_INTERVAL,
+        lease_seconds: float = FRONTIER_LEASE_SECONDS,
+        max_per_host: int = FRONTIER_MAX_PER_HOST,
+    ) -> None:
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.lease_seconds = lease_seconds
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -------- Discovery --------
+
+    def add(
+        self,
+        url: str,
+        source: str,
+        priority: int = 0,
+        due: Optional[float] = None,
+    ) -> None:
+        """
+        Register a URL. Re-adding a known URL only raises its priority and can
+        pull its next-due time earlier.
+        """
+        self.add_many([url], source, priority=priority, due=due)
+
+    def add_many(
+        self,
+        urls: Iterable[str],
+        source: str,
+        priority: int = 0,
+        due: Optional[float] = None,
+    ) -> int:
+        now = time.time()
+        due = now if due is None else due
+        rows = []
+        for url in urls:
+            key = canonical_url(url)
+            rows.append((key, source, urlsplit(key).netloc, priority, now, due, self.default_interval))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO urls (url, source, host, priority, discovered_at, next_due, interval)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    priority = MAX(priority, excluded.priority),
+                    next_due = MIN(next_due, excluded.next_due)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    # -------- Scheduling --------
+
+    def lease_due(self, limit: int = 100, now: Optional[float] = None) -> List[FrontierEntry]:
+        """
+        Take up to `limit` due URLs for crawling.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            blocked = {
+                row["host"]
+                for row in self._conn.execute(
+                    "SELECT host FROM hosts WHERE next_allowed > ?", (now,)
+                )
+            }
+            candidates = self._conn.execute(
+                """
+                SELECT * FROM urls
+                WHERE next_due <= ? AND (lease_until IS NULL OR lease_until <= ?)
+                ORDER BY priority DESC, next_due ASC
+                """,
+                (now, now),
+            )
+
+            leased: List[FrontierEntry] = []
+            per_host: Dict[str, int] = {}
+            for row in candidates:
+                host = row["host"]
+                if host in blocked or per_host.get(host, 0) >= self.max_per_host:
+                    continue
+                per_host[host] = per_host.get(host, 0) + 1
+                leased.append(_entry(row))
+                if len(leased) >= limit:
+                    break
+
+            self._conn.executemany(
+                "UPDATE urls SET lease_until = ? WHERE url = ?",
+                [(now + self.lease_seconds, e.url) for e in leased],
+            )
+
+        logger.info("Frontier leased %d due URLs across %d hosts", len(leased), len(per_host))
+        return leased
+
+    def complete(self, url: str, content_hash: Optional[str], now: Optional[float] = None) -> None:
+        """
+        Record a successful fetch and schedule the next one.
+        """
+        now = time.time() if now is None else now
+        key = canonical_url(url)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT * FROM urls WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return
+            if row["content_hash"] is None:
+                interval = row["interval"]
+            elif row["content_hash"] != content_hash:
+                interval = max(row["interval"] / 2, self.min_interval)
+            else:
+                interval = min(row["interval"] * 2, self.max_interval)
+            self._conn.execute(
+                """
+                UPDATE urls SET last_seen = ?, next_due = ?, interval = ?, fail_count = 0,
+                                content_hash = ?, lease_until = NULL
+                WHERE url = ?
+                """,
+                (now, now + interval, interval, content_hash, key),
+            )
+
+    def fail(self, url: str, now: Optional[float] = None, host_backoff: bool = True) -> None:
+        """
+        Record a failed crawl: exponential backoff for the URL and, unless
+        host_backoff is False (the page was fetched but could not be used),
+        for its host.
+        """
+        now = time.time() if now is None else now
+        key = canonical_url(url)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT * FROM urls WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return
+            fails = row["fail_count"] + 1
+            backoff = min(self.min_interval * (2 ** (fails - 1)), self.max_interval)
+            self._conn.execute(
+                """
+                UPDATE urls SET fail_count = ?, next_due = ?, lease_until = NULL
+                WHERE url = ?
+                """,
+                (fails, now + backoff, key),
+            )
+            if not host_backoff:
+                return
+            host_delay = min(60.0 * (2 ** (fails - 1)), self.min_interval)
+            self._conn.execute(
+                """
+                INSERT INTO hosts (host, next_allowed) VALUES (?, ?)
+                ON CONFLICT(host) DO UPDATE SET next_allowed = MAX(next_allowed, excluded.next_allowed)
+                """,
+                (row["host"], now + host_delay),
+            )
+
+    # -------- Inspection --------
+
+    def get(self, url: str) -> Optional[FrontierEntry]:
+        row = self._conn.execute(
+            "SELECT * FROM urls WHERE url = ?", (canonical_url(url),)
+        ).fetchone()
+        return _entry(row) if row is not None else None
+
+    def all_entries(self) -> List[FrontierEntry]:
+        return [_entry(row) for row in self._conn.execute("SELECT * FROM urls ORDER BY url")]
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, int]:
+        now = time.time() if now is None else now
+        total, due, leased = self._conn.execute(
+            """
+            SELECT COUNT(*),
+                   SUM(CASE WHEN next_due <= ? THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN lease_until > ? THEN 1 ELSE 0 END)
+            FROM urls
+            """,
+            (now, now),
+        ).fetchone()
+        return {"total": total or 0, "due": due or 0, "leased": leased or 0}
+
+
+def _entry(row: sqlite3.Row) -> FrontierEntry:
+    return FrontierEntry(
+        url=row["url"],
+        source=row["source"],
+        host=row["host"],
+        priority=row["priority"],
+        last_seen=row["last_seen"],
+        next_due=row["next_due"],
+        interval=row["interval"],
+        fail_count=row["fail_count"],
+        content_hash=row["content_hash"],
+    )
@@ -0,0 +1,206 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup
+
+from ..config import HTML_PARSER_BACKEND
+from ..logging_utils import get_logger
+
+try:  # optional fast backend
+    import lxml.html as lxml_html
+except ImportError:  # pragma: no cover - depends on environment
+    lxml_html = None
+
+logger = get_logger(__name__)
+
+# Body container candidates, tried in order: ("class", name) or ("tag", name).
+# The whole document is used when none match.
+Container = Tuple[str, str]
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+_SKIP_TEXT_TAGS = {"script", "style", "template"}
+
+# Inline elements lxml (libxml2) keeps a <p> open across, like html.parser.
+# Not every phrasing element: <embed>, <source>, <rt> and <rp> end up outside
+# the <p> in one of the two trees.
+_PHRASING_TAGS = {
+    "a", "abbr", "acronym", "area", "audio", "b", "bdi", "bdo", "big", "br",
+    "button", "canvas", "cite", "code", "data", "del", "dfn", "em", "font", "i",
+    "iframe", "img", "input", "ins", "kbd", "label", "map", "mark", "math", "meter",
+    "nobr", "noscript", "object", "output", "picture", "progress", "q", "ruby", "s",
+    "samp", "select", "small", "span", "strike", "strong", "sub", "sup", "svg",
+    "textarea", "time", "tt", "u", "var", "video", "wbr",
+}
+# Void elements: a closing tag for one of these is parsed differently
+_VOID_TAGS = {"area", "br", "img", "input", "wbr"}
+_RAW_TEXT_RE = re.compile(r"<!--.*?-->|<(script|style|template)\b.*?</\1\s*>", re.S | re.I)
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z][\w:-]*)[^>]*?(/?)>")
+
+
+@dataclass
+class ExtractedPage:
+    title: str
+    published_raw: Optional[str]
+    paragraphs: List[str] = field(default_factory=list)
+
+
+def available_backends() -> List[str]:
+    backends = ["bs4"]
+    if lxml_html is not None:
+        backends.append("lxml")
+    return backends
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    name = (name or HTML_PARSER_BACKEND).lower()
+    if name == "auto":
+        return "lxml" if lxml_html is not None else "bs4"
+    if name not in ("bs4", "lxml"):
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+    if name == "lxml" and lxml_html is None:
+        raise RuntimeError("HTML_PARSER_BACKEND=lxml but lxml is not installed")
+    return name
+
+
+def extract_page(
+    html: str,
+    containers: Sequence[Container],
+    backend: Optional[str] = None,
+) -> ExtractedPage:
+    """
+    Apply the shared extraction rules with the selected backend:
+    - first <h1> as title
+    - first <time>'s datetime attribute (if it has one)
+    - text of every <p> inside the first matching container
+    Text is whitespace-stripped per string and joined with single spaces,
+    like BeautifulSoup's get_text(" ", strip=True).
+
+    Output does not depend on the backend: documents where lxml would end a
+    <p> somewhere else than html.parser (see implies_paragraph_end) are
+    parsed with bs4.
+    """
+    if resolve_backend(backend) == "lxml" and not implies_paragraph_end(html):
+        return _extract_lxml(html, containers)
+    return _extract_bs4(html, containers)
+
+
+def implies_paragraph_end(html: str) -> bool:
+    """
+    True when lxml and html.parser may disagree on where a <p> ends.
+
+    html.parser keeps a <p> open until its </p>, while lxml closes it at the
+    next <p> or block element (<div>, <table>, ...), and also treats <p/> and
+    stray </p> differently. This flags any <p> that contains something other
+    than known inline elements before its </p> (including closing tags of
+    void elements), and nested, self-closing or stray <p> tags. Comments and
+    script/style/template contents are ignored. False positives only cost
+    the lxml speed-up.
+    """
+    open_p = False
+    for m in _TAG_RE.finditer(_RAW_TEXT_RE.sub(" ", html)):
+        closing, name, self_closing = m.group(1), m.group(2).lower(), m.group(3)
+        if name == "p":
+            if closing:
+                if not open_p:
+                    return True
+                open_p = False
+            elif open_p or self_closing:
+                return True
+            else:
+                open_p = True
+        elif open_p and (name not in _PHRASING_TAGS or (closing and name in _VOID_TAGS)):
+            return True
+    return False
+
+
+# -------- BeautifulSoup (reference) --------
+
+def _bs4_text(tag) -> str:
+    if tag is None:
+        return ""
+    return tag.get_text(" ", strip=True)
+
+
+def _extract_bs4(html: str, containers: Sequence[Container]) -> ExtractedPage:
+    soup = BeautifulSoup(html, "html.parser")
+
+    published_raw = None
+    time_tag = soup.find("time")
+    if time_tag and time_tag.has_attr("datetime"):
+        published_raw = time_tag["datetime"]
+
+    body = None
+    for kind, name in containers:
+        body = soup.find(class_=name) if kind == "class" else soup.find(name)
+        if body:
+            break
+    body = body or soup
+
+    return ExtractedPage(
+        title=_bs4_text(soup.find("h1")),
+        published_raw=published_raw,
+        paragraphs=[_bs4_text(p) for p in body.find_all("p")],
+    )
+
+
+# -------- lxml (fast) --------
+
+def _lxml_strings(el, out: List[str]) -> None:
+    if el.text:
+        out.append(el.text)
+    for child in el:
+        # Comments / processing instructions have non-string tags; keep only their tail
+        if isinstance(child.tag, str) and child.tag not in _SKIP_TEXT_TAGS:
+            _lxml_strings(child, out)
+        if child.tail:
+            out.append(child.tail)
+
+
+def _lxml_text(el) -> str:
+    if el is None:
+        return ""
+    parts: List[str] = []
+    _lxml_strings(el, parts)
+    return " ".join(s.strip() for s in parts if s.strip())
+
+
+def _first(root, xpath: str):
+    found = root.xpath(xpath)
+    return found[0] if found else None
+
+
+def _extract_lxml(html: str, containers: Sequence[Container]) -> ExtractedPage:
+    if not html.strip():
+        # lxml refuses empty documents; BeautifulSoup just finds nothing
+        return ExtractedPage(title="", published_raw=None)
+    # Bytes, so documents with an XML encoding declaration parse; the text is ours, so UTF-8
+    root = lxml_html.document_fromstring(
+        html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8")
+    )
+
+    published_raw = None
+    time_tag = _first(root, "(//time)[1]")
+    if time_tag is not None and "datetime" in time_tag.attrib:
+        published_raw = time_tag.get("datetime")
+
+    body = None
+    for kind, name in containers:
+        if kind == "class":
+            xpath = (
+                "(//*[contains(concat(' ', normalize-space(@class), ' '), "
+                f"' {name} ')])[1]"
+            )
+        else:
+            xpath = f"(//{name})[1]"
+        body = _first(root, xpath)
+        if body is not None:
+            break
+    if body is None:
+        body = root
+
+    return ExtractedPage(
+        title=_lxml_text(_first(root, "(//h1)[1]")),
+        published_raw=published_raw,
+        paragraphs=[_lxml_text(p) for p in body.iterdescendants("p")],
+    )
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL_SECONDS
+from ..logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheMissError(RuntimeError):
+    """Raised in offline mode when a URL has no cached response."""
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return (time.time() - self.fetched_at) < ttl
+
+
+class HttpCache:
+    """
+    On-disk HTTP response cache keyed by URL.
+
+    Each entry is one JSON file holding the body and its validators
+    (ETag / Last-Modified). File mtime doubles as the last-access time,
+    so eviction drops the least recently used entries once the cache
+    grows past `max_bytes`. The total size is kept as a running count
+    (one directory scan on the first write), so writes only scan the
+    directory when they push the cache over the bound.
+    """
+
+    def __init__(
+        self,
+        root: Path = HTTP_CACHE_DIR,
+        ttl: float = HTTP_CACHE_TTL_SECONDS,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Dropping unreadable cache entry %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            return None
+        if data.get("url") != url:
+            return None
+        return CacheEntry(**data)
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        entry = CacheEntry(
+            url=url,
+            body=body,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+        )
+        self._write(entry)
+        if self._size is not None and self._size > self.max_bytes:
+            self.evict()
+        return entry
+
+    def touch(self, entry: CacheEntry) -> CacheEntry:
+        """
+        Mark an entry as revalidated (e.g. after a 304) so the TTL restarts.
+        """
+        entry.fetched_at = time.time()
+        self._write(entry)
+        return entry
+
+    def _write(self, entry: CacheEntry) -> None:
+        path = self._path(entry.url)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry.__dict__), encoding="utf-8")
+        size = tmp.stat().st_size
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            try:
+                size -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, path)
+            self._size += size
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, Path]], int]:
+        files = []
+        total = 0
+        for path in self.root.glob("*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        return files, total
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            files, total = self._scan()
+            self._size = total
+            if total <= self.max_bytes:
+                return 0
+
+            removed = 0
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            self._size = total
+
+        logger.info("HTTP cache evicted %d entries (now %d bytes)", removed, total)
+        return removed
+
+
+_default_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> HttpCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HttpCache()
+    return _default_cache
@@ -1,14 +1,15 @@
-import uuid
-
-from bs4 import BeautifulSoup
-
 from ..config import BBC_SOURCE_NAME
+from ..data.blobs import blob_key
+from ..ids import make_article_id
 from ..models import Article
 from ..logging_utils import get_logger
-from .fetch import parse_iso_datetime_maybe, safe_get_text
+from .fetch import parse_iso_datetime_maybe
+from .html_backends import extract_page
 
 logger = get_logger(__name__)
 
+BBC_CONTAINERS = [("tag", "article")]
+
 
 def parse_bbc_article(url: str, html: str) -> Article:
     """
@@ -18,28 +19,20 @@ def parse_bbc_article(url: str, html: str) -> Article:
     - <h1> as title
     - <article> wrapper when present, otherwise the full document
     """
-    soup = BeautifulSoup(html, "html.parser")
-
-    title_tag = soup.find("h1")
-    title = safe_get_text(title_tag) or url
-
-    published_at = None
-    time_tag = soup.find("time")
-    if time_tag and time_tag.has_attr("datetime"):
-        published_at = parse_iso_datetime_maybe(time_tag["datetime"])
+    page = extract_page(html, BBC_CONTAINERS)
 
-    article_body = soup.find("article") or soup
-    paragraphs = [safe_get_text(p) for p in article_body.find_all("p")]
-    clean_text = "\n".join(p for p in paragraphs if p)
+    title = page.title or url
+    published_at = parse_iso_datetime_maybe(page.published_raw)
+    clean_text = "\n".join(p for p in page.paragraphs if p)
 
     logger.info("Parsed BBC article '%s' (%s)", title[:80], url)
 
     return Article(
-        id=str(uuid.uuid4()),
+        id=make_article_id(url, title, clean_text),
         source=BBC_SOURCE_NAME,
         url=url,
         title=title,
         published_at=published_at,
-        raw_html=html,
+        raw_html_key=blob_key(html),
         clean_text=clean_text,
     )
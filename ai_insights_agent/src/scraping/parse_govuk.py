@@ -1,45 +1,34 @@
-import uuid
-
-from bs4 import BeautifulSoup
-
 from ..config import GOVUK_SOURCE_NAME
+from ..data.blobs import blob_key
+from ..ids import make_article_id
 from ..models import Article
 from ..logging_utils import get_logger
-from .fetch import parse_iso_datetime_maybe, safe_get_text
+from .fetch import parse_iso_datetime_maybe
+from .html_backends import extract_page
 
 logger = get_logger(__name__)
 
+GOVUK_CONTAINERS = [("class", "gem-c-govspeak"), ("tag", "main")]
+
 
 def parse_govuk_article(url: str, html: str) -> Article:
     """
     Extract title, published_at and main body text from a GOV.UK policy/guidance page.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    page = extract_page(html, GOVUK_CONTAINERS)
 
-    title_tag = soup.find("h1")
-    title = safe_get_text(title_tag) or url
-
-    published_at = None
-    time_tag = soup.find("time")
-    if time_tag and time_tag.has_attr("datetime"):
-        published_at = parse_iso_datetime_maybe(time_tag["datetime"])
-
-    main = (
-        soup.find(class_="gem-c-govspeak")
-        or soup.find("main")
-        or soup
-    )
-    paragraphs = [safe_get_text(p) for p in main.find_all("p")]
-    clean_text = "\n".join(p for p in paragraphs if p)
+    title = page.title or url
+    published_at = parse_iso_datetime_maybe(page.published_raw)
+    clean_text = "\n".join(p for p in page.paragraphs if p)
 
     logger.info("Parsed GOV.UK article '%s' (%s)", title[:80], url)
 
     return Article(
-        id=str(uuid.uuid4()),
+        id=make_article_id(url, title, clean_text),
         source=GOVUK_SOURCE_NAME,
         url=url,
         title=title,
         published_at=published_at,
-        raw_html=html,
+        raw_html_key=blob_key(html),
         clean_text=clean_text,
     )
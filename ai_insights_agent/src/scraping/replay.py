@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Headers worth keeping in the archive (validators and content type)
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class HttpArchive:
+    """
+    Directory of recorded HTTP responses, one JSON file per request URL.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self.root / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def add(
+        self,
+        url: str,
+        body: str,
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        record = {"url": url, "status": status, "headers": headers or {}, "body": body}
+        path = self._path(url)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def get(self, url: str) -> Optional[dict]:
+        path = self._path(url)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.root.glob("*.json"))
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Live transport that also writes every successful response to an archive.
+    """
+
+    def __init__(self, archive: HttpArchive, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        resp = super().send(request, **kwargs)
+        if resp.status_code < 400 and resp.status_code != 304:
+            headers = {k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers}
+            self.archive.add(request.url, resp.text, resp.status_code, headers)
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Offline transport serving responses from an archive.
+
+    `latency` (+ up to `jitter`) seconds are slept per request to emulate the
+    network, so concurrency and caching effects stay measurable. Unknown URLs
+    fail like an unreachable host.
+    """
+
+    def __init__(self, archive: HttpArchive, latency: float = 0.0, jitter: float = 0.0) -> None:
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+
+    def send(self, request, **kwargs):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        record = self.archive.get(request.url)
+        if record is None:
+            raise requests.ConnectionError(f"URL not in replay archive: {request.url}")
+
+        resp = requests.Response()
+        resp.status_code = record["status"]
+        resp.headers = CaseInsensitiveDict(record.get("headers", {}))
+        resp._content = record["body"].encode("utf-8")
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,106 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.batching import MicroBatcher
+
+
+def test_concurrent_submits_are_batched_and_results_routed():
+    batches = []
+
+    def handler(items):
+        batches.append(list(items))
+        return [x * 10 for x in items]
+
+    batcher = MicroBatcher(handler, max_batch=8, max_wait=0.05)
+    results = {}
+    barrier = threading.Barrier(16)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher(i, timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    assert results == {i: i * 10 for i in range(16)}
+    assert all(len(b) <= 8 for b in batches)
+    assert len(batches) < 16
+
+
+def test_weighted_batches_respect_max_and_errors_propagate():
+    sizes = []
+
+    def handler(items):
+        sizes.append(sum(len(x) for x in items))
+        if any("bad" in x for x in items):
+            raise ValueError("bad input")
+        return [len(x) for x in items]
+
+    batcher = MicroBatcher(handler, max_batch=5, max_wait=0.05, weight=len)
+    futures = [batcher.submit(["a"] * 3), batcher.submit(["b"] * 3), batcher.submit(["c"])]
+    assert [f.result(timeout=5) for f in futures] == [3, 3, 1]
+    assert max(sizes) <= 5
+
+    with pytest.raises(ValueError):
+        batcher(["bad"], timeout=5)
+    batcher.close()
+
+
+def test_exception_results_fail_only_their_item():
+    batcher = MicroBatcher(
+        lambda items: [ValueError(x) if x < 0 else x for x in items], max_batch=8, max_wait=0.05
+    )
+    futures = [batcher.submit(x) for x in (1, -1, 2)]
+    assert futures[0].result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) == 2
+    batcher.close()
+
+
+def test_close_handles_queued_items_and_rejects_new_ones():
+    batcher = MicroBatcher(lambda items: [x + 1 for x in items], max_batch=2, max_wait=0.05)
+    futures = [batcher.submit(i) for i in range(5)]
+    batcher.close()
+    batcher.close()
+
+    assert [f.result(timeout=5) for f in futures] == [1, 2, 3, 4, 5]
+    with pytest.raises(RuntimeError):
+        batcher.submit(0)
+
+
+def test_submits_racing_close_either_resolve_or_raise():
+    batcher = MicroBatcher(lambda items: list(items), max_batch=4, max_wait=0.01)
+    futures, rejected = [], []
+    barrier = threading.Barrier(9)
+
+    def worker():
+        barrier.wait()
+        for i in range(50):
+            try:
+                futures.append(batcher.submit(i))
+            except RuntimeError:
+                rejected.append(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    batcher.close()
+    for t in threads:
+        t.join()
+
+    assert len(futures) + len(rejected) == 400
+    assert all(f.done() for f in futures)
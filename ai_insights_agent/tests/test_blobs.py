@@ -0,0 +1,51 @@
+import json
+import sys
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data import blobs, storage
+from src.data.blobs import BlobStore
+from src.data.storage import load_latest_articles, load_raw_html, save_articles
+from src.models import Article
+
+
+def test_blob_store_roundtrip_and_dedup(tmp_path):
+    store = BlobStore(root=tmp_path, compression="gzip")
+    html = "<html>" + "<p>repeated policy text</p>" * 500 + "</html>"
+
+    key = store.put(html)
+    assert store.put(html) == key
+    assert store.get(key) == html
+
+    files = list(tmp_path.rglob("*.gz"))
+    assert len(files) == 1
+    assert files[0].stat().st_size < len(html) // 10
+
+
+def test_snapshot_stores_html_by_reference(tmp_path, monkeypatch):
+    store = BlobStore(root=tmp_path / "blobs", compression="gzip")
+    monkeypatch.setattr(blobs, "_default_store", store)
+    monkeypatch.setattr(storage, "RAW_DIR", tmp_path, raising=False)
+
+    html = "<html><h1>Title</h1><p>Body</p></html>"
+    article = Article(
+        id="a1",
+        source="TEST",
+        url="https://example.com",
+        title="Title",
+        published_at=None,
+        raw_html=html,
+        clean_text="Body",
+    )
+    path = save_articles([article])
+
+    record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    assert "raw_html" not in record
+
+    loaded = load_latest_articles()[0]
+    assert loaded.raw_html is None
+    assert load_raw_html(loaded) == html
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.retrieval.bm25 import BM25Index, tokenize
+
+DOCS = [
+    "Annex C: correction published on 4 July 2023.",
+    "The white paper sets out five cross-sectoral principles for regulators.",
+    "Annex A lists the principles; Annex B covers the central functions.",
+    "Responses to the consultation closed on 21 June 2023.",
+]
+
+
+def _top(index, query, k=3):
+    return index.search(query, k)[1].tolist()
+
+
+def test_exact_terms_rank_their_documents_first():
+    assert tokenize("Annex C, 21 June") == ["annex", "c", "21", "june"]
+    index = BM25Index()
+    index.add(DOCS)
+
+    assert _top(index, "What changed in Annex C?")[0] == 0
+    assert _top(index, "what closed on 21 June")[0] == 3
+    assert _top(index, "no such words here") == []
+
+
+def test_remove_compact_and_reload_keep_scores(tmp_path):
+    index = BM25Index()
+    index.add(DOCS)
+    index.remove([0])
+    assert len(index) == 3 and index.n_docs == 4
+    assert 0 not in _top(index, "annex")
+    before = index.search("annex principles", 3)
+
+    index.compact()  # documents 1..3 become 0..2
+    assert index.n_docs == 3
+    after = index.search("annex principles", 3)
+    assert (after[1] + 1).tolist() == before[1].tolist()
+    assert after[0].tolist() == before[0].tolist()
+
+    files = index.save(tmp_path, "g1")
+    loaded = BM25Index.load(tmp_path, files, mmap=True)
+    assert loaded.search("annex principles", 3)[0].tolist() == after[0].tolist()
+
+    # Documents added after loading are searchable and survive the next compaction
+    loaded.add(["Annex D: transitional provisions"])
+    loaded.remove([1])
+    assert _top(loaded, "annex d", 1) == [3]
+    loaded.compact()
+    assert _top(loaded, "annex d", 1) == [2]
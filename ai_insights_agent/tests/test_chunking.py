@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -6,7 +7,17 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.processing.chunking import semantic_chunk
+import numpy as np
+import pytest
+
+from src.processing import chunking
+from src.processing.chunking import (
+    _group_sentences,
+    pool_chunk_vectors,
+    semantic_chunk,
+    semantic_chunk_corpus,
+    semantic_chunk_corpus_with_vectors,
+)
 from src.models import Article
 from datetime import datetime
 
@@ -29,3 +40,114 @@ def test_semantic_chunk_produces_non_empty_chunks():
     chunks = semantic_chunk(article, sim_threshold=0.5, max_sentences=3)
     assert len(chunks) >= 1
     assert all(c.text.strip() for c in chunks)
+
+
+def _reference_groups(sent_embs, sim_threshold, max_sentences, overlap):
+    # Original centroid loop: mean of the stacked group, cosine with fresh norms
+    def cosine(a, b):
+        denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return 0.0 if denom == 0.0 else float(np.dot(a, b) / denom)
+
+    groups = []
+    current = [0]
+    for i in range(1, len(sent_embs)):
+        centroid = np.mean(np.stack([sent_embs[j] for j in current]), axis=0)
+        if cosine(centroid, sent_embs[i]) >= sim_threshold and len(current) < max_sentences:
+            current.append(i)
+        else:
+            groups.append((current[0], current[-1]))
+            current = list(range(max(0, current[-1] - overlap + 1), i + 1))
+    groups.append((current[0], current[-1]))
+    return groups
+
+
+def test_group_sentences_matches_reference_loop():
+    rng = np.random.default_rng(7)
+    topics = rng.normal(size=(30, 16))
+    emb = (topics[np.repeat(np.arange(30), 10)] + 0.6 * rng.normal(size=(300, 16))).astype("float32")
+    emb[[5, 6, 120]] = 0.0  # zero vectors must not break the similarity
+
+    for threshold, max_sentences, overlap in [(0.75, 6, 1), (0.5, 12, 0), (0.6, 4, 2), (-1.0, 5, 1)]:
+        assert _group_sentences(emb, threshold, max_sentences, overlap) == _reference_groups(
+            emb, threshold, max_sentences, overlap
+        )
+
+
+def _fake_embed(texts, batch_size=None):
+    # Deterministic per-text vectors: texts sharing a first word are similar
+    rows = []
+    for t in texts:
+        topic = np.random.default_rng(sum(map(ord, t.split()[0]))).normal(size=8)
+        noise = np.random.default_rng(sum(map(ord, t))).normal(size=8)
+        rows.append(topic + 0.3 * noise)
+    return np.array(rows, dtype="float32").reshape(len(texts), 8)
+
+
+def _corpus_articles():
+    shared = "Regulators publish guidance. Regulators coordinate closely. "
+    return [
+        Article(
+            id=f"a{i}",
+            source="TEST",
+            url=f"https://example.com/{i}",
+            title=f"T{i}",
+            published_at=None,
+            clean_text=text,
+        )
+        for i, text in enumerate(
+            [
+                shared + "Safety institutes test models. Safety cases are reviewed",
+                "",
+                shared + "Funding supports compute. Funding rounds open yearly",
+            ]
+        )
+    ]
+
+
+def test_corpus_chunking_matches_per_article(monkeypatch):
+    monkeypatch.setattr(chunking, "sent_tokenize", lambda text: text.split(". "))
+    calls = []
+
+    def embed(texts, batch_size=None):
+        calls.append(len(texts))
+        return _fake_embed(texts)
+
+    monkeypatch.setattr(chunking, "embed_texts", embed)
+    articles = _corpus_articles()
+
+    batched = semantic_chunk_corpus(articles, sim_threshold=0.5, workers=1, dedup="off")
+    assert calls == [6]  # one pass over the 6 distinct sentences
+
+    expected = [semantic_chunk(a, sim_threshold=0.5) for a in articles]
+    strip = lambda chunks: [(c.id, c.order, c.text) for c in chunks]
+    assert [strip(c) for c in batched] == [strip(c) for c in expected]
+    assert batched[1] == []
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the patched tokenizer and embedder",
+)
+def test_parallel_corpus_chunking_matches_inline(monkeypatch):
+    monkeypatch.setattr(chunking, "sent_tokenize", lambda text: text.split(". "))
+    monkeypatch.setattr(chunking, "embed_texts", lambda texts, batch_size=None: _fake_embed(texts))
+    articles = _corpus_articles() * 3
+
+    inline, inline_vecs = semantic_chunk_corpus_with_vectors(articles, sim_threshold=0.5, workers=1)
+    parallel, parallel_vecs = semantic_chunk_corpus_with_vectors(articles, sim_threshold=0.5, workers=3)
+
+    strip = lambda chunks: [(c.id, c.article_id, c.order, c.text) for c in chunks]
+    assert [strip(c) for c in parallel] == [strip(c) for c in inline]
+    assert np.array_equal(parallel_vecs, inline_vecs)
+
+
+def test_pooled_chunk_vectors_are_normalised_group_means():
+    rng = np.random.default_rng(3)
+    emb = rng.normal(size=(10, 5)).astype("float32")
+    groups = [(0, 2), (2, 6), (6, 9), (9, 9)]
+
+    pooled = pool_chunk_vectors(emb, groups)
+
+    for row, (first, last) in zip(pooled, groups):
+        mean = emb[first : last + 1].mean(axis=0)
+        assert np.allclose(row, mean / np.linalg.norm(mean), atol=1e-6)
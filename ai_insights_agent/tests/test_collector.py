@@ -0,0 +1,160 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.blobs import BlobStore
+from src.models import Article
+from src.scraping import collector
+from src.scraping.fetch import HostThrottle
+from src.scraping.frontier import CrawlFrontier
+
+
+def _fake_parser(url, html):
+    return Article(
+        id=url,
+        source="TEST",
+        url=url,
+        title=url,
+        published_at=None,
+        raw_html=html,
+        clean_text=html,
+    )
+
+
+def test_concurrent_collect_keeps_configured_order(monkeypatch, tmp_path):
+    urls = [f"https://example.com/page-{i}" for i in range(12)]
+    jobs = [("TEST", u, _fake_parser) for u in urls]
+    monkeypatch.setattr(collector, "_source_jobs", lambda sources=None: jobs)
+
+    def fake_fetch(url, timeout=20, session=None):
+        # Later URLs finish first, so completion order is the reverse of job order.
+        time.sleep(0.002 * (len(urls) - urls.index(url)))
+        return "" if url.endswith("-3") else f"text for {url}"
+
+    monkeypatch.setattr(collector, "fetch_html", fake_fetch)
+    store = BlobStore(root=tmp_path)
+    monkeypatch.setattr(collector, "get_blob_store", lambda: store)
+
+    articles = collector.collect_articles(
+        max_workers=6,
+        throttle=HostThrottle(max_concurrency=6, min_interval=0.0),
+        parse_workers=1,
+    )
+
+    assert [str(a.url) for a in articles] == [u for u in urls if not u.endswith("-3")]
+
+
+def test_iter_articles_streams_in_order_within_window(monkeypatch, tmp_path):
+    urls = [f"https://example.com/page-{i}" for i in range(10)]
+    jobs = [("TEST", u, _fake_parser) for u in urls]
+    monkeypatch.setattr(collector, "_source_jobs", lambda sources=None: jobs)
+    fetched = []
+
+    def fake_fetch(url, timeout=20, session=None):
+        fetched.append(url)
+        return "" if url.endswith("-3") else f"text for {url}"
+
+    monkeypatch.setattr(collector, "fetch_html", fake_fetch)
+    store = BlobStore(root=tmp_path)
+    monkeypatch.setattr(collector, "get_blob_store", lambda: store)
+
+    stream = collector.iter_articles(
+        max_workers=2,
+        throttle=HostThrottle(max_concurrency=2, min_interval=0.0),
+        window=3,
+    )
+    first = next(stream)
+    assert str(first.url) == urls[0]
+    assert len(fetched) <= 4  # the window, plus the refill after the first page
+
+    rest = list(stream)
+    assert [str(a.url) for a in [first] + rest] == [u for u in urls if not u.endswith("-3")]
+
+
+def test_host_throttle_limits_concurrency_per_host():
+    throttle = HostThrottle(max_concurrency=2, min_interval=0.0)
+    active = {"n": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work():
+        with throttle.slot("https://example.com/x"):
+            with lock:
+                active["n"] += 1
+                active["peak"] = max(active["peak"], active["n"])
+            time.sleep(0.01)
+            with lock:
+                active["n"] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert active["peak"] <= 2
+
+
+def test_frontier_crawl_completes_leases_only_when_asked(monkeypatch, tmp_path):
+    frontier = CrawlFrontier(path=tmp_path / "f.sqlite3")
+    urls = [f"https://example.com/page-{i}" for i in range(3)]
+    frontier.add_many(urls, "TEST", due=0)
+    monkeypatch.setattr(collector, "_parser_for", lambda source: _fake_parser)
+    monkeypatch.setattr(
+        collector, "fetch_html", lambda url, timeout=20, session=None: "" if url.endswith("-1") else f"text for {url}"
+    )
+    store = BlobStore(root=tmp_path / "blobs")
+    monkeypatch.setattr(collector, "get_blob_store", lambda: store)
+
+    crawl = collector.FrontierCrawl(frontier)
+    articles = crawl.collect(max_workers=1, parse_workers=1)
+    assert [str(a.url) for a in articles] == [urls[0], urls[2]]
+    assert frontier.get(urls[1]).fail_count == 1  # empty page
+    # Not completed yet: a crash here leaves the leases to expire
+    assert frontier.get(urls[0]).last_seen is None
+    assert frontier.stats()["leased"] == 2
+
+    assert crawl.complete() == 2
+    assert frontier.get(urls[0]).content_hash == urls[0]
+    assert frontier.stats()["leased"] == 0
+    frontier.close()
+
+
+def test_frontier_crawl_stream_yields_fresh_then_previous_articles(monkeypatch, tmp_path):
+    frontier = CrawlFrontier(path=tmp_path / "f.sqlite3")
+    urls = [f"https://example.com/page-{i}" for i in range(4)]
+    frontier.add_many(urls[:2], "TEST", due=0)
+    frontier.add_many(urls[2:], "TEST", due=time.time() + 3600)
+    monkeypatch.setattr(collector, "_parser_for", lambda source: _fake_parser)
+    monkeypatch.setattr(collector, "fetch_html", lambda url, timeout=20, session=None: f"new {url}")
+    store = BlobStore(root=tmp_path / "blobs")
+    monkeypatch.setattr(collector, "get_blob_store", lambda: store)
+
+    consumed = []
+
+    def previous():
+        # page-1 is refreshed by this crawl; page-9 left the frontier
+        for url in [urls[1], urls[2], "https://example.com/page-9", urls[3]]:
+            consumed.append(url)
+            yield _fake_parser(url, f"old {url}")
+
+    crawl = collector.FrontierCrawl(frontier, previous=previous())
+    stream = crawl.stream(max_workers=1)
+    first = next(stream)
+    assert first.clean_text.startswith("new ")
+    assert not consumed  # the previous snapshot is read only after the crawl
+
+    articles = [first] + list(stream)
+    assert [a.clean_text for a in articles] == [
+        f"new {urls[0]}",
+        f"new {urls[1]}",
+        f"old {urls[2]}",
+        f"old {urls[3]}",
+    ]
+    assert crawl.complete() == 2
+    frontier.close()
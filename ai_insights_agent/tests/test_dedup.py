@@ -0,0 +1,86 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.models import Chunk
+from src.processing.dedup import dedup_chunk_lists, find_near_duplicates
+
+BASE = (
+    "The government will empower existing regulators to apply five cross-sectoral principles "
+    "within their remits, supported by central functions that monitor and evaluate the framework."
+)
+OTHER = "Funding of ten million pounds will help regulators build the technical capability they need."
+
+
+def _chunk(id_, article_id, text):
+    return Chunk(
+        id=id_,
+        article_id=article_id,
+        order=0,
+        text=text,
+        section=None,
+        topic_label=None,
+        created_at=datetime.utcnow(),
+    )
+
+
+def test_contained_and_repeated_texts_point_at_the_larger_kept_text():
+    texts = [
+        "Annex C: correction (4 July 2023)",
+        BASE + " " + OTHER,
+        BASE,  # fully inside text 1
+        OTHER,  # fully inside text 1
+        "Annex C: correction (4 July 2023)",
+        "Safety institutes evaluate frontier models before and after deployment.",
+        "",
+    ]
+
+    dup_of = find_near_duplicates(texts, threshold=0.9)
+
+    assert dup_of == [None, None, 1, 1, 0, None, None]
+
+
+def test_small_overlap_is_not_a_duplicate():
+    half = " ".join(BASE.split()[:14])
+    assert find_near_duplicates([BASE, half + " and then something else entirely different here"]) == [
+        None,
+        None,
+    ]
+
+
+def test_dedup_chunk_lists_drops_rows_or_flags():
+    per_article = [
+        [_chunk("a1", "A", BASE + " " + OTHER), _chunk("a2", "A", OTHER)],
+        [_chunk("b1", "B", BASE), _chunk("b2", "B", "Unrelated closing remarks on consultation dates.")],
+    ]
+    vectors = np.arange(8, dtype="float32").reshape(4, 2)
+
+    kept, kept_vecs = dedup_chunk_lists(per_article, vectors, mode="drop")
+    assert [[c.id for c in chunks] for chunks in kept] == [["a1"], ["b2"]]
+    assert kept_vecs.tolist() == [[0, 1], [6, 7]]
+
+    flagged, flagged_vecs = dedup_chunk_lists(per_article, vectors, mode="flag")
+    assert [c.duplicate_of for chunks in flagged for c in chunks] == [None, "a1", "a1", None]
+    assert flagged_vecs is vectors
+
+
+def test_new_chunks_are_checked_against_kept_chunks():
+    kept = [_chunk("k1", "K", BASE + " " + OTHER)]
+    per_article = [[_chunk("n1", "N", BASE), _chunk("n2", "N", "Unrelated closing remarks on consultation dates.")]]
+    vectors = np.arange(4, dtype="float32").reshape(2, 2)
+
+    assert find_near_duplicates([BASE, OTHER, "Something else"], reference=[BASE + " " + OTHER]) == [3, 3, None]
+
+    dropped, dropped_vecs = dedup_chunk_lists(per_article, vectors, mode="drop", kept=kept)
+    assert [[c.id for c in chunks] for chunks in dropped] == [["n2"]]
+    assert dropped_vecs.tolist() == [[2, 3]]
+
+    flagged, _ = dedup_chunk_lists(per_article, vectors, mode="flag", kept=kept)
+    assert [c.duplicate_of for c in flagged[0]] == ["k1", None]
@@ -0,0 +1,63 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.config import PROCESSED_DIR
+from src.processing.embedding_backends import EmbeddingBackend, available_backends, create_backend, mean_pool
+
+
+def test_mean_pool_ignores_padding_and_normalises():
+    hidden = np.array(
+        [[[1.0, 0.0], [3.0, 0.0], [100.0, 100.0]], [[0.0, 2.0], [0.0, 0.0], [0.0, 0.0]]],
+        dtype="float32",
+    )
+    mask = np.array([[1, 1, 0], [1, 0, 0]])
+
+    pooled = mean_pool(hidden, mask)
+
+    assert np.allclose(pooled, [[1.0, 0.0], [0.0, 1.0]])
+
+
+def test_backends_must_implement_encode():
+    class Incomplete(EmbeddingBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def _snapshot_texts(n=64):
+    paths = sorted(PROCESSED_DIR.glob("chunks_*.jsonl"))
+    if not paths:
+        pytest.skip("no chunk snapshot")
+    with paths[-1].open(encoding="utf-8") as f:
+        return [json.loads(line)["text"] for _, line in zip(range(n), f)]
+
+
+def test_onnx_backend_agrees_with_reference():
+    if not {"torch", "onnx"} <= set(available_backends()):
+        pytest.skip("needs both sentence-transformers and onnxruntime")
+    try:
+        reference, onnx = create_backend("torch"), create_backend("onnx")
+    except Exception as e:  # model files unavailable offline
+        pytest.skip(f"could not load models: {e}")
+
+    texts = _snapshot_texts()
+    ref = reference.encode(texts, batch_size=16)
+    got = onnx.encode(texts, batch_size=16)
+
+    assert got.shape == ref.shape
+    cosine = np.sum(ref * got, axis=1) / (
+        np.linalg.norm(ref, axis=1) * np.linalg.norm(got, axis=1)
+    )
+    assert cosine.mean() > 0.99
+    assert cosine.min() > 0.97
+    assert onnx.encode([], batch_size=16).shape == (0, ref.shape[1])
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.processing.embedding_cache import EmbeddingCache, embedding_key
+
+
+def _vecs(n, dim=4, start=0):
+    return np.arange(start, start + n * dim, dtype="float32").reshape(n, dim)
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    cache = EmbeddingCache("model-a", dim=4, root=tmp_path)
+    cache.put_many(["alpha", "beta"], _vecs(2))
+
+    reopened = EmbeddingCache("model-a", dim=4, root=tmp_path, lru_items=0)
+    got = reopened.get_many(["beta", "gamma", "alpha"])
+    assert np.array_equal(got[0], _vecs(2)[1])
+    assert got[1] is None
+    assert np.array_equal(got[2], _vecs(2)[0])
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+
+def test_keys_normalise_whitespace_and_separate_models(tmp_path):
+    assert embedding_key("m", "AI  safety\n institute") == embedding_key("m", "AI safety institute")
+    assert embedding_key("m", "text") != embedding_key("other", "text")
+
+    EmbeddingCache("model-a", dim=4, root=tmp_path).put_many(["text"], _vecs(1))
+    assert EmbeddingCache("model-b", dim=4, root=tmp_path).get_many(["text"]) == [None]
+
+
+def test_compaction_keeps_recently_used_entries(tmp_path):
+    # Budget of 10 rows; compaction keeps 3/4 of it
+    cache = EmbeddingCache("model-a", dim=4, root=tmp_path, max_bytes=10 * 16)
+    texts = [f"t{i}" for i in range(8)]
+    cache.put_many(texts, _vecs(8))
+    cache.get_many(["t0"])  # t0 is now the most recently used entry
+    cache.put_many(["t8", "t9", "t10"], _vecs(3, start=100))
+
+    assert cache.disk_bytes() <= 10 * 16
+    assert len(cache) == 7
+    reopened = EmbeddingCache("model-a", dim=4, root=tmp_path, max_bytes=10 * 16)
+    assert np.array_equal(reopened.get_many(["t0"])[0], _vecs(8)[0])
+    assert reopened.get_many(["t1"]) == [None]
+    assert np.array_equal(reopened.get_many(["t10"])[0], _vecs(3, start=100)[2])
+
+
+def test_compaction_leaves_other_writers_open_segments_alone(tmp_path):
+    # Two instances stand in for two processes sharing the directory
+    writer = EmbeddingCache("model-a", dim=4, root=tmp_path, lru_items=0)
+    writer.put_many(["w0", "w1"], _vecs(2))
+    other = EmbeddingCache("model-a", dim=4, root=tmp_path, max_bytes=10 * 16, lru_items=0)
+    other.put_many([f"o{i}" for i in range(12)], _vecs(12, start=100))
+
+    # The writer's segment is still open, so it survives and keeps growing
+    writer.put_many(["w2"], _vecs(1, start=50))
+    got = writer.get_many(["w0", "w1", "w2"])
+    assert np.array_equal(got[0], _vecs(2)[0])
+    assert np.array_equal(got[2], _vecs(1, start=50)[0])
+    reopened = EmbeddingCache("model-a", dim=4, root=tmp_path, lru_items=0)
+    assert np.array_equal(reopened.get_many(["w2"])[0], _vecs(1, start=50)[0])
+    assert not (tmp_path / "model-a-4" / "compact.lock").exists()
+
+
+def test_writer_starts_a_new_segment_after_its_segment_is_compacted(tmp_path):
+    writer = EmbeddingCache("model-a", dim=4, root=tmp_path, lru_items=0, segment_idle=0.0)
+    writer.put_many(["w0", "w1"], _vecs(2))
+    # Idle segments of other processes are closed: this compaction takes the writer's
+    other = EmbeddingCache("model-a", dim=4, root=tmp_path, max_bytes=10 * 16, segment_idle=0.0)
+    other.put_many([f"o{i}" for i in range(12)], _vecs(12, start=100))
+
+    writer.put_many(["w2", "w3"], _vecs(2, start=50))
+    got = writer.get_many(["w0", "w2", "w3"])
+    assert got[0] is None or np.array_equal(got[0], _vecs(2)[0])
+    assert np.array_equal(got[1], _vecs(2, start=50)[0])
+    assert np.array_equal(got[2], _vecs(2, start=50)[1])
+
+    reopened = EmbeddingCache("model-a", dim=4, root=tmp_path, lru_items=0)
+    assert np.array_equal(reopened.get_many(["w3"])[0], _vecs(2, start=50)[1])
@@ -0,0 +1,98 @@
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.processing import embedding_server, embeddings
+from src.processing.embedding_server import EmbeddingClient, EmbeddingServer
+
+
+def _fake_embed(calls):
+    def embed(texts, batch_size):
+        calls.append(len(texts))
+        return np.array([[len(t), i] for i, t in enumerate(texts)], dtype="float32")
+
+    return embed
+
+
+def test_server_micro_batches_requests_from_many_clients():
+    calls = []
+    server = EmbeddingServer("127.0.0.1:0", embed_fn=_fake_embed(calls), max_wait=0.05).start()
+    client = EmbeddingClient(server.address)
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = client.embed(["x" * i, "y" * (i + 1)])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.close()
+
+    for i, emb in results.items():
+        assert emb.shape == (2, 2)
+        assert emb[:, 0].tolist() == [i, i + 1]
+    assert sum(calls) == 16
+    assert len(calls) < 8
+
+
+def test_embed_texts_falls_back_when_server_is_absent(monkeypatch):
+    server = EmbeddingServer("127.0.0.1:0", embed_fn=_fake_embed([]))
+    address = server.address
+    server.close()  # nothing listens there any more
+
+    monkeypatch.setattr(embedding_server, "EMBEDDING_SERVER_ADDRESS", address)
+    monkeypatch.setattr(embedding_server, "_client", None)
+    monkeypatch.setattr(embedding_server, "_down_until", 0.0)
+    local = np.ones((1, 3), dtype="float32")
+    monkeypatch.setattr(embeddings, "embed_texts_local", lambda texts, batch_size=32: local)
+
+    assert embeddings.embed_texts(["hello"]) is local
+    assert embedding_server._down_until > 0.0
+
+
+def test_bad_request_fails_alone_and_embed_texts_falls_back(monkeypatch):
+    def embed(texts, batch_size):
+        if "bad" in texts:
+            raise ValueError("cannot encode")
+        return np.array([[len(t), 0] for t in texts], dtype="float32")
+
+    server = EmbeddingServer("127.0.0.1:0", embed_fn=embed, max_wait=0.05).start()
+    client = EmbeddingClient(server.address)
+    results = {}
+    barrier = threading.Barrier(4)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = client.embed(["bad"] if i == 0 else ["x" * i])
+        except RuntimeError as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert isinstance(results[0], RuntimeError)
+    assert [results[i][0, 0] for i in (1, 2, 3)] == [1, 2, 3]
+
+    monkeypatch.setattr(embedding_server, "EMBEDDING_SERVER_ADDRESS", server.address)
+    monkeypatch.setattr(embedding_server, "_client", None)
+    monkeypatch.setattr(embedding_server, "_down_until", 0.0)
+    local = np.ones((1, 3), dtype="float32")
+    monkeypatch.setattr(embeddings, "embed_texts_local", lambda texts, batch_size=32: local)
+    assert embeddings.embed_texts(["bad"]) is local
+    assert embedding_server._down_until == 0.0  # the server is still used for other requests
+    server.close()
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.scraping.frontier import CrawlFrontier
+
+
+def _frontier(path, **kwargs):
+    defaults = dict(
+        min_interval=100.0,
+        max_interval=10_000.0,
+        default_interval=1_000.0,
+        lease_seconds=50.0,
+        max_per_host=2,
+    )
+    defaults.update(kwargs)
+    return CrawlFrontier(path=path, **defaults)
+
+
+def test_priority_order_and_per_host_cap(tmp_path):
+    frontier = _frontier(tmp_path / "f.sqlite3")
+    frontier.add_many([f"https://a.gov.uk/{i}" for i in range(5)], "GOV.UK", due=0)
+    frontier.add("https://b.gov.uk/urgent", "GOV.UK", priority=5, due=0)
+
+    leased = frontier.lease_due(limit=10, now=10)
+
+    assert leased[0].url == "https://b.gov.uk/urgent"
+    assert sum(1 for e in leased if e.host == "a.gov.uk") == 2
+    # Leased URLs are not handed out again until the lease expires
+    again = frontier.lease_due(limit=10, now=20)
+    assert len(again) == 2
+    assert not {e.url for e in again} & {e.url for e in leased}
+
+
+def test_leases_survive_restart_and_intervals_adapt(tmp_path):
+    path = tmp_path / "f.sqlite3"
+    frontier = _frontier(path)
+    frontier.add("https://a.gov.uk/page", "GOV.UK", due=0)
+    assert len(frontier.lease_due(now=10)) == 1
+    frontier.close()
+
+    # Crash before completion: after the lease expires the URL is due again
+    frontier = _frontier(path)
+    assert frontier.lease_due(now=20) == []
+    assert [e.url for e in frontier.lease_due(now=61)] == ["https://a.gov.uk/page"]
+
+    frontier.complete("https://a.gov.uk/page", content_hash="v1", now=100)
+    assert frontier.get("https://a.gov.uk/page").next_due == 1_100
+
+    frontier.complete("https://a.gov.uk/page", content_hash="v1", now=1_100)
+    assert frontier.get("https://a.gov.uk/page").interval == 2_000  # unchanged: back off
+
+    frontier.complete("https://a.gov.uk/page", content_hash="v2", now=3_100)
+    assert frontier.get("https://a.gov.uk/page").interval == 1_000  # changed: check sooner
+
+
+def test_only_fetch_failures_back_off_the_host(tmp_path):
+    frontier = _frontier(tmp_path / "f.sqlite3")
+    frontier.add_many(["https://a.gov.uk/broken", "https://a.gov.uk/ok"], "GOV.UK", due=0)
+    frontier.add_many(["https://b.gov.uk/down", "https://b.gov.uk/ok"], "GOV.UK", due=0)
+    assert len(frontier.lease_due(now=10)) == 4
+
+    frontier.fail("https://a.gov.uk/broken", now=10, host_backoff=False)  # fetched, unparseable
+    frontier.fail("https://b.gov.uk/down", now=10)  # HTTP error
+    frontier.complete("https://a.gov.uk/ok", content_hash="v1", now=10)
+    frontier.complete("https://b.gov.uk/ok", content_hash="v1", now=10)
+    frontier.add_many(["https://a.gov.uk/new", "https://b.gov.uk/new"], "GOV.UK", due=0)
+
+    assert [e.url for e in frontier.lease_due(now=20)] == ["https://a.gov.uk/new"]
+    assert frontier.get("https://a.gov.uk/broken").next_due == 110
@@ -0,0 +1,71 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.blobs import BlobStore
+from src.scraping import govuk_content_api as api
+
+FIXTURES = ROOT / "tests" / "fixtures" / "govuk_content_api"
+URL = (
+    "https://www.gov.uk/government/publications/"
+    "online-safety-act-explainer/online-safety-act-explainer"
+)
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_content_item_maps_to_article():
+    assert api.content_api_url(URL + "/") == (
+        "https://www.gov.uk/api/content/government/publications/"
+        "online-safety-act-explainer/online-safety-act-explainer"
+    )
+
+    article = api.parse_govuk_content_item(URL, _fixture("online-safety-act-explainer.json"))
+
+    assert article.title == "Online Safety Act: explainer"
+    assert article.published_at.year == 2025
+    assert article.updated_at > article.published_at
+    assert article.clean_text.splitlines() == [
+        "The Online Safety Act 2023 (the Act) is a new set of laws that protects children and adults online.",
+        "It puts a range of new duties on social media companies and search services, "
+        "making them more responsible for their users’ safety on their platforms.",
+        "Ofcom is the independent regulator for online safety .",
+    ]
+
+
+def test_discovery_and_updated_at_change_detection(monkeypatch, tmp_path):
+    search = api.parse_search_results(_fixture("search.json"))
+    feed = api.parse_atom_feed(_fixture("feed.atom"))
+    assert [d.url for d in search][0] == URL
+    assert [d.url for d in feed] == [URL]
+
+    responses = {api.content_api_url(URL): _fixture("online-safety-act-explainer.json")}
+    fetched = []
+
+    def fake_fetch(url, **kwargs):
+        fetched.append(url)
+        return responses[url]
+
+    store = BlobStore(root=tmp_path)
+    monkeypatch.setattr(api, "fetch_html", fake_fetch)
+    monkeypatch.setattr(api, "get_blob_store", lambda: store)
+
+    first = api.collect_discovered_articles(search[:1])
+    assert len(fetched) == 1
+
+    # Unchanged public timestamp: stored article is reused without a request
+    second = api.collect_discovered_articles(search[:1], previous=first)
+    assert len(fetched) == 1
+    assert second[0].id == first[0].id
+
+    # A later public update triggers a refetch
+    search[0].updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    api.collect_discovered_articles(search[:1], previous=first)
+    assert len(fetched) == 2
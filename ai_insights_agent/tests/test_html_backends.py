@@ -0,0 +1,105 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.config import RAW_DIR
+from src.data.storage import load_raw_html
+from src.models import Article
+from src.scraping.html_backends import (
+    available_backends,
+    extract_page,
+    implies_paragraph_end,
+    resolve_backend,
+)
+from src.scraping.parse_govuk import GOVUK_CONTAINERS
+
+pytestmark = pytest.mark.skipif(
+    "lxml" not in available_backends(), reason="lxml backend not installed"
+)
+
+HTML = """
+<html><body>
+  <time datetime="2023-08-03T09:29:45Z">3 August</time>
+  <h1> AI <!-- note --> regulation </h1>
+  <div class="govuk-grid gem-c-govspeak">
+    <p>First &amp; <b>bold</b><script>var x = 1;</script> text.</p>
+    <p>   </p>
+    <p>Second<style>.a {}</style> para</p>
+  </div>
+  <main><p>Outside container</p></main>
+</body></html>
+"""
+
+
+def test_lxml_backend_matches_bs4_rules():
+    assert extract_page(HTML, GOVUK_CONTAINERS, backend="lxml") == extract_page(
+        HTML, GOVUK_CONTAINERS, backend="bs4"
+    )
+
+
+def test_lxml_backend_parses_encoding_declarations():
+    html = '<?xml version="1.0" encoding="iso-8859-1"?><html><body><h1>Caf\u00e9</h1><p>\u201cquoted\u201d</p></body></html>'
+    page = extract_page(html, GOVUK_CONTAINERS, backend="lxml")
+    assert page == extract_page(html, GOVUK_CONTAINERS, backend="bs4")
+    assert page.paragraphs == ["\u201cquoted\u201d"]
+
+
+# html.parser keeps unclosed <p> elements open; lxml closes them at the next block
+MALFORMED = [
+    ("<p>one<p>two", ["one two", "two"]),
+    ("<p>a<div>b</div>c</p>", ["a b c"]),
+    ("<p>a<table><tr><td>x</td></tr></table>b</p>", ["a x b"]),
+    ("<p>a<embed>b</p>", None),
+    ("<p>a<ruby>b<rt>c</rt></ruby>d</p>", None),
+    ("<p>a<br>b</br>c</p>", None),
+    ("<p>one</p></p><p/>two", None),
+]
+
+
+def test_default_backend_gives_bs4_output():
+    assert resolve_backend() in available_backends()
+    for html, paragraphs in MALFORMED:
+        expected = extract_page(html, GOVUK_CONTAINERS, backend="bs4").paragraphs
+        assert extract_page(html, GOVUK_CONTAINERS).paragraphs == expected
+        if paragraphs is not None:
+            assert expected == paragraphs
+
+
+@pytest.mark.parametrize("html, paragraphs", MALFORMED)
+def test_lxml_backend_matches_bs4_on_unclosed_paragraphs(html, paragraphs):
+    assert implies_paragraph_end(html)
+    assert extract_page(html, GOVUK_CONTAINERS, backend="lxml") == extract_page(
+        html, GOVUK_CONTAINERS, backend="bs4"
+    )
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        HTML,
+        "<p>a<span>b</span><noscript><img src='x.gif'></noscript>c</p><div><p>d</p></div>",
+        "<p>a<!-- <div> --><script>'<p>'</script>b</p>",
+    ],
+)
+def test_well_formed_paragraphs_stay_on_lxml(html):
+    assert not implies_paragraph_end(html)
+
+
+def test_lxml_backend_matches_bs4_on_raw_snapshot():
+    files = sorted(RAW_DIR.glob("articles_*.jsonl"))
+    if not files:
+        pytest.skip("no raw article snapshot available")
+
+    with files[-1].open("r", encoding="utf-8") as f:
+        for line in f:
+            html = load_raw_html(Article(**json.loads(line)))
+            assert extract_page(html, GOVUK_CONTAINERS, backend="lxml") == extract_page(
+                html, GOVUK_CONTAINERS, backend="bs4"
+            )
@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.scraping.fetch import fetch_html
+from src.scraping.http_cache import CacheMissError, HttpCache
+
+
+class _Resp:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent_headers.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def test_conditional_get_reuses_body_on_304(tmp_path):
+    cache = HttpCache(root=tmp_path, ttl=0)
+    session = _Session(
+        [
+            _Resp(200, "<p>v1</p>", {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _Resp(304),
+        ]
+    )
+    url = "https://www.gov.uk/x"
+
+    assert fetch_html(url, session=session, cache=cache, cache_mode="on") == "<p>v1</p>"
+    assert fetch_html(url, session=session, cache=cache, cache_mode="on") == "<p>v1</p>"
+
+    assert session.sent_headers[1]["If-None-Match"] == '"abc"'
+    assert session.sent_headers[1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+def test_fresh_entry_skips_network_and_offline_mode(tmp_path):
+    cache = HttpCache(root=tmp_path, ttl=3600)
+    cache.put("https://www.gov.uk/cached", "<p>cached</p>")
+    session = _Session([])
+
+    assert fetch_html("https://www.gov.uk/cached", session=session, cache=cache) == "<p>cached</p>"
+    assert fetch_html(
+        "https://www.gov.uk/cached", session=session, cache=cache, cache_mode="offline"
+    ) == "<p>cached</p>"
+    with pytest.raises(CacheMissError):
+        fetch_html("https://www.gov.uk/missing", session=session, cache=cache, cache_mode="offline")
+    assert session.sent_headers == []
+
+
+def test_eviction_keeps_cache_under_size_bound(tmp_path):
+    cache = HttpCache(root=tmp_path, ttl=3600, max_bytes=2500)
+    for i in range(5):
+        cache.put(f"https://www.gov.uk/{i}", "x" * 1000)
+
+    total = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+    assert total <= 2500
+    assert cache.get("https://www.gov.uk/4") is not None
+
+
+def test_put_scans_directory_only_when_over_bound(tmp_path):
+    cache = HttpCache(root=tmp_path, ttl=3600, max_bytes=2500)
+    scans = []
+    real_scan = cache._scan
+    cache._scan = lambda: scans.append(1) or real_scan()
+
+    cache.put("https://www.gov.uk/0", "x" * 1000)
+    cache.put("https://www.gov.uk/0", "y" * 1000)
+    cache.put("https://www.gov.uk/1", "x" * 1000)
+    assert len(scans) == 1  # initial size count only
+
+    cache.put("https://www.gov.uk/2", "x" * 1000)
+    assert len(scans) == 2
+    assert cache._size == sum(p.stat().st_size for p in tmp_path.glob("*.json")) <= 2500
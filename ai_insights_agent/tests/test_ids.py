@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.ids import canonical_url, make_article_id, make_chunk_id
+from src.scraping.parse_govuk import parse_govuk_article
+
+
+HTML = "<html><body><h1>Title</h1><div class='gem-c-govspeak'><p>Hello   world.</p></div></body></html>"
+
+
+def test_article_ids_are_stable_and_content_addressed():
+    a1 = parse_govuk_article("https://www.gov.uk/guidance/x", HTML)
+    a2 = parse_govuk_article("https://WWW.gov.uk/guidance/x/#section", HTML)
+    a3 = parse_govuk_article("https://www.gov.uk/guidance/x", HTML.replace("Hello", "Goodbye"))
+
+    assert a1.id == a2.id
+    assert a1.id != a3.id
+    # Same page, new content: URL part of the ID is unchanged
+    assert a1.id.split("-")[0] == a3.id.split("-")[0]
+
+
+def test_canonical_url_and_chunk_ids():
+    assert canonical_url("HTTPS://www.gov.uk:443/a/?b=2&a=1#frag") == "https://www.gov.uk/a?a=1&b=2"
+    assert make_article_id("https://x.org", "T", "a  b") == make_article_id("https://x.org/", "T", "a b")
+
+    c1 = make_chunk_id("art", 0, 2, "Some text.")
+    assert c1 == make_chunk_id("art", 0, 2, "Some text.")
+    assert c1 != make_chunk_id("art", 1, 2, "Some text.")
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+HEAVY_MODULES = ["sentence_transformers", "torch", "nltk", "openai"]
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["src", "src.app.cli", "src.retrieval.index", "src.reporting.generate_report"],
+)
+def test_entry_points_import_without_heavy_dependencies(module):
+    # Fresh interpreter without credentials: importing must not load models or clients
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    code = (
+        "import importlib, sys\n"
+        f"importlib.import_module({module!r})\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.ids import make_article_id
+from src.models import Article, Chunk
+from src.processing import incremental
+from src.processing.incremental import apply_chunk_delta, build_chunk_delta, diff_articles
+from src.retrieval import index as index_mod
+from src.retrieval.index import ChunkIndex
+
+
+def _article(url, text):
+    return Article(
+        id=make_article_id(url, "T", text),
+        source="TEST",
+        url=url,
+        title="T",
+        published_at=None,
+        raw_html="",
+        clean_text=text,
+    )
+
+
+def _fake_chunker(article):
+    return [
+        Chunk(
+            id=f"{article.id}:{i}",
+            article_id=article.id,
+            order=i,
+            text=part,
+            created_at=datetime.utcnow(),
+        )
+        for i, part in enumerate(article.clean_text.split("|"))
+    ]
+
+
+def test_delta_rechunks_only_changed_articles():
+    previous = [
+        _article("https://x.org/a", "a1|a2"),
+        _article("https://x.org/b", "b1"),
+        _article("https://x.org/c", "c1"),
+    ]
+    previous_chunks = [c for a in previous for c in _fake_chunker(a)]
+
+    current = [
+        previous[0],                                 # unchanged
+        _article("https://x.org/b", "b1 edited|b2"),  # modified
+        _article("https://x.org/d", "d1"),           # added; c removed
+    ]
+
+    chunked = []
+
+    def chunker(article):
+        chunked.append(article.id)
+        return _fake_chunker(article)
+
+    diff = diff_articles(current, previous)
+    delta = build_chunk_delta(diff, previous_chunks, chunker=chunker)
+
+    assert sorted(chunked) == sorted([current[1].id, current[2].id])
+    assert sorted(delta.removed_ids) == sorted(
+        [f"{previous[1].id}:0", f"{previous[2].id}:0"]
+    )
+
+    updated = apply_chunk_delta(previous_chunks, delta, article_order=[a.id for a in current])
+    expected = [c for a in current for c in _fake_chunker(a)]
+    assert [c.id for c in updated] == [c.id for c in expected]
+
+
+def test_delta_skips_known_chunkless_articles_and_records_new_ones():
+    previous = [_article("https://x.org/a", "a1"), _article("https://x.org/b", "b1")]
+    current = previous + [_article("https://x.org/c", "")]
+    previous_chunks = _fake_chunker(previous[0])  # b had all its chunks dropped
+    chunked = []
+
+    def chunker(article):
+        chunked.append(article.id)
+        return [] if not article.clean_text else _fake_chunker(article)
+
+    diff = diff_articles(current, previous)
+    healed = build_chunk_delta(diff, previous_chunks, chunker=chunker)
+    assert chunked == [current[2].id, previous[1].id]
+    assert [c.id for c in healed.added] == [f"{previous[1].id}:0"]
+    assert healed.chunkless_ids == [current[2].id]
+
+    chunked.clear()
+    delta = build_chunk_delta(diff, previous_chunks, chunker=chunker, chunkless_ids=[previous[1].id])
+    assert chunked == [current[2].id]
+    assert delta.added == []
+    assert delta.chunkless_ids == [previous[1].id, current[2].id]
+
+
+def test_pooled_delta_keeps_the_index_in_one_vector_space(tmp_path, monkeypatch):
+    previous = [_article("https://x.org/a", "a1|a2"), _article("https://x.org/b", "b1")]
+    current = [previous[0], _article("https://x.org/b", "b1 edited|b2")]
+    previous_chunks = [c for a in previous for c in _fake_chunker(a)]
+    pooled = np.array([[0.0, 3.0, 4.0], [1.0, 0.0, 0.0]], dtype="float32")
+
+    def fake_chunk_corpus(articles, dedup_against=()):
+        return [_fake_chunker(a) for a in articles], pooled[: sum(len(_fake_chunker(a)) for a in articles)]
+
+    def no_encoder(texts, *args, **kwargs):
+        raise AssertionError("added chunks must not be re-encoded")
+
+    monkeypatch.setattr(incremental, "semantic_chunk_corpus_with_vectors", fake_chunk_corpus)
+    delta = build_chunk_delta(diff_articles(current, previous), previous_chunks)
+    assert [c.id for c in delta.added] == [f"{current[1].id}:0", f"{current[1].id}:1"]
+    assert np.array_equal(delta.vectors, pooled)
+
+    index = ChunkIndex(index_type="flat")
+    index.build(previous_chunks, vectors=np.eye(3, dtype="float32"))
+    index.save(tmp_path, embedding_model="test-model", vector_source="pooled")
+    loaded = ChunkIndex.load(tmp_path, embedding_model="test-model", vector_source="pooled")
+    monkeypatch.setattr(index_mod, "embed_texts", no_encoder)
+    loaded.apply_delta(delta.added, delta.removed_ids, vectors=delta.vectors)
+    assert np.allclose(loaded.vectors[-2:], [[0.0, 0.6, 0.8], [1.0, 0.0, 0.0]])
+
+    # A snapshot built from pooled vectors is not taken for an encoded one
+    with pytest.raises(ValueError, match="pooled"):
+        ChunkIndex.load(tmp_path, embedding_model="test-model", vector_source="encode")
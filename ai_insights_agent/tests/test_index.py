@@ -7,8 +7,13 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from datetime import datetime
+
+import numpy as np
+import pytest
+
 from src.models import Chunk
-from src.retrieval.index import ChunkIndex
+from src.retrieval import index as index_mod
+from src.retrieval.index import ChunkIndex, choose_index_type
 
 
 def _chunk(id_, text):
@@ -35,3 +40,284 @@ def test_query_returns_relevant_chunk():
     (best_chunk, score) = results[0]
     assert best_chunk.id == "c1"
     assert score > 0.0
+
+
+def test_build_with_precomputed_vectors_skips_encoder(monkeypatch):
+    def no_encoder(texts, *args, **kwargs):
+        raise AssertionError("encoder should not run")
+
+    monkeypatch.setattr(index_mod, "embed_texts", no_encoder)
+    chunks = [_chunk("c1", "first"), _chunk("c2", "second")]
+    index = ChunkIndex()
+    index.build(chunks, vectors=np.array([[3.0, 4.0], [0.0, 2.0]], dtype="float32"))
+
+    assert index.chunk_ids == ["c1", "c2"]
+    assert np.allclose(index.vectors, [[0.6, 0.8], [0.0, 1.0]])
+
+    with pytest.raises(ValueError):
+        ChunkIndex().build(chunks, vectors=np.ones((1, 2), dtype="float32"))
+
+
+def test_add_grows_index_like_build():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(7, 4)).astype("float32")
+    chunks = [_chunk(f"c{i}", f"text {i}") for i in range(7)]
+
+    built = ChunkIndex()
+    built.build(chunks, vectors=vectors)
+    grown = ChunkIndex()
+    for start, stop in [(0, 2), (2, 3), (3, 7)]:
+        grown.add(chunks[start:stop], vectors=vectors[start:stop])
+    grown.add([])
+
+    assert grown.chunk_ids == built.chunk_ids
+    assert np.allclose(grown.vectors, built.vectors)
+    assert grown.index.ntotal == 7
+    q = vectors[5:6] / np.linalg.norm(vectors[5])
+    assert grown.index.search(q, 3)[1].tolist() == built.index.search(q, 3)[1].tolist()
+
+
+def test_snapshot_roundtrip_is_mapped_and_versioned(tmp_path, monkeypatch):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(6, 4)).astype("float32")
+    chunks = [_chunk(f"c{i}", f"text number {i}") for i in range(6)]
+    built = ChunkIndex()
+    built.build(chunks, vectors=vectors)
+    built.save(tmp_path, embedding_model="test-model")
+
+    monkeypatch.setattr(index_mod, "embed_texts", lambda texts: vectors[2:3].copy())
+    for mmap in (True, False):
+        loaded = ChunkIndex.load(tmp_path, mmap=mmap, embedding_model="test-model")
+        assert loaded.chunk_ids == built.chunk_ids
+        assert np.allclose(loaded.vectors, built.vectors)
+        assert [c.text for c in loaded.all_chunks()] == [c.text for c in chunks]
+        assert [c.id for c, _ in loaded.query("anything", k=3)] == [c.id for c, _ in built.query("anything", k=3)]
+
+    with pytest.raises(ValueError):
+        ChunkIndex.load(tmp_path, embedding_model="other-model")
+    with pytest.raises(FileNotFoundError):
+        ChunkIndex.load(tmp_path / "missing", embedding_model="test-model")
+
+    # A mapped index stays usable after modification and can be saved over itself
+    loaded = ChunkIndex.load(tmp_path, embedding_model="test-model")
+    loaded.add([_chunk("c6", "late addition")], vectors=rng.normal(size=(1, 4)).astype("float32"))
+    loaded.apply_delta([], ["c0"])
+    loaded.save(tmp_path, embedding_model="test-model")
+    assert ChunkIndex.load(tmp_path, embedding_model="test-model").chunk_ids == [f"c{i}" for i in range(1, 7)]
+    assert len(list(tmp_path.iterdir())) == 10
+
+
+def test_save_only_deletes_files_of_the_replaced_snapshot(tmp_path):
+    vectors = np.eye(3, dtype="float32")
+    index = ChunkIndex()
+    index.build([_chunk(f"c{i}", f"text number {i}") for i in range(3)], vectors=vectors)
+    (tmp_path / "notes.txt").write_text("keep me", encoding="utf-8")
+    index.save(tmp_path, embedding_model="test-model")
+    first = set(p.name for p in tmp_path.iterdir())
+
+    index.save(tmp_path, embedding_model="test-model")
+    second = set(p.name for p in tmp_path.iterdir())
+    assert "notes.txt" in second
+    assert first & second == {"notes.txt", "manifest.json"}
+    assert len(second) == len(first)
+
+
+def test_apply_delta_replaces_removed_and_modified_chunks(monkeypatch):
+    rng = np.random.default_rng(4)
+    vectors = rng.normal(size=(4, 8)).astype("float32")
+    added_vectors = rng.normal(size=(2, 8)).astype("float32")
+    index = ChunkIndex()
+    index.build([_chunk(f"c{i}", f"text number {i}") for i in range(4)], vectors=vectors)
+
+    # c0 is removed, c1 is re-chunked with new text, c4 is new
+    monkeypatch.setattr(index_mod, "embed_texts", lambda texts: added_vectors.copy())
+    index.apply_delta([_chunk("c1", "revised text"), _chunk("c4", "new text")], ["c0"])
+
+    expected = np.concatenate([vectors[2:], added_vectors])
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    assert index.chunk_ids == ["c2", "c3", "c1", "c4"]
+    assert np.allclose(index.vectors, expected, atol=1e-6)
+    assert [c.text for c in index.all_chunks()][2:] == ["revised text", "new text"]
+
+    for vector, expected_id in ((added_vectors[0], "c1"), (added_vectors[1], "c4"), (vectors[3], "c3")):
+        monkeypatch.setattr(index_mod, "embed_texts", lambda texts, v=vector: v[None, :].copy())
+        (best, score), *_ = index.query("anything", k=4, mode="dense")
+        assert best.id == expected_id and score > 0.99
+    monkeypatch.setattr(index_mod, "embed_texts", lambda texts: vectors[0:1].copy())
+    assert "c0" not in [c.id for c, _ in index.query("anything", k=4, mode="dense")]
+
+
+def test_auto_index_type_follows_corpus_size():
+    assert choose_index_type(1_000, "auto") == "flat"
+    assert choose_index_type(200_000, "auto") == "hnsw"
+    assert choose_index_type(5_000_000, "auto") == "ivf_pq"
+    assert choose_index_type(10, "HNSW") == "hnsw"
+    with pytest.raises(ValueError):
+        choose_index_type(10, "annoy")
+
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_pq", "hnsw"])
+def test_approximate_indexes_find_near_copies_and_survive_snapshots(index_type, tmp_path, monkeypatch):
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(2000, 32)).astype("float32")
+    chunks = [_chunk(f"c{i}", f"text {i}") for i in range(2000)]
+    index = ChunkIndex(index_type=index_type)
+    index.build(chunks, vectors=vectors)
+    assert index.kind == index_type
+
+    targets = [3, 777, 1999]
+    hits = 0
+    for row in targets:
+        near = vectors[row : row + 1] + 0.05 * rng.normal(size=(1, 32)).astype("float32")
+        monkeypatch.setattr(index_mod, "embed_texts", lambda texts: near.copy())
+        hits += index.query("q", k=5, nprobe=8, ef_search=32)[0][0].id == f"c{row}"
+    assert hits == len(targets)
+
+    index.save(tmp_path, embedding_model="test-model")
+    loaded = ChunkIndex.load(tmp_path, embedding_model="test-model")
+    assert loaded.kind == index_type
+    assert [c.id for c, _ in loaded.query("q", k=5)] == [c.id for c, _ in index.query("q", k=5)]
+
+
+def test_auto_index_switches_type_when_add_crosses_threshold(monkeypatch):
+    monkeypatch.setattr(index_mod, "AUTO_FLAT_MAX", 300)
+    vectors = np.random.default_rng(3).normal(size=(400, 8)).astype("float32")
+    chunks = [_chunk(f"c{i}", f"text {i}") for i in range(400)]
+    index = ChunkIndex(index_type="auto")
+    index.add(chunks[:200], vectors=vectors[:200])
+    assert index.kind == "flat"
+    index.add(chunks[200:], vectors=vectors[200:])
+    assert index.kind == "hnsw"
+    assert index.index.ntotal == 400
+
+
+def _query_ids(index, vector, monkeypatch, k=3):
+    monkeypatch.setattr(index_mod, "embed_texts", lambda texts: vector[None, :].copy())
+    return [c.id for c, _ in index.query("q", k=k)]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw"])
+def test_remove_upsert_and_compact_keep_ids_consistent(index_type, monkeypatch):
+    monkeypatch.setattr(index_mod, "INDEX_COMPACT_RATIO", 1.0)  # compact explicitly below
+    rng = np.random.default_rng(4)
+    vectors = rng.normal(size=(500, 16)).astype("float32")
+    chunks = [_chunk(f"c{i}", f"text {i}") for i in range(500)]
+    index = ChunkIndex(index_type=index_type)
+    index.build(chunks, vectors=vectors)
+
+    assert index.remove(["c7", "c9", "missing"]) == 2
+    assert _query_ids(index, vectors[7], monkeypatch)[0] != "c7"
+    assert "c7" not in index.chunks_by_id and "c7" not in index.chunk_ids
+    with pytest.raises(ValueError):
+        index.add([_chunk("c8", "again")], vectors=vectors[8:9])
+
+    # Re-adding a removed id and replacing a live one get fresh FAISS ids
+    index.upsert([_chunk("c7", "back"), _chunk("c8", "moved")], vectors=vectors[[7, 100]])
+    assert _query_ids(index, vectors[7], monkeypatch)[0] == "c7"
+    assert set(_query_ids(index, vectors[100], monkeypatch)[:2]) == {"c100", "c8"}
+    assert index.chunks_by_id["c8"].text == "moved"
+    assert len(index.chunk_ids) == len(index.vectors) == len(index.chunks_by_id) == 499
+
+    expected = index.chunk_ids
+    assert index.compact() == 3  # c7, c9 and the replaced c8 row
+    assert index.index.ntotal == 499
+    assert index.chunk_ids == expected
+    assert np.allclose(index.vectors[expected.index("c8")], vectors[100] / np.linalg.norm(vectors[100]))
+    assert _query_ids(index, vectors[8], monkeypatch)[0] != "c8"
+
+
+def test_mapped_snapshot_accepts_updates_and_keeps_tombstones_on_save(tmp_path, monkeypatch):
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(10, 4)).astype("float32")
+    built = ChunkIndex(index_type="flat")
+    built.build([_chunk(f"c{i}", f"text {i}") for i in range(10)], vectors=vectors)
+    built.save(tmp_path, embedding_model="test-model")
+
+    loaded = ChunkIndex.load(tmp_path, embedding_model="test-model")
+    loaded.remove(["c0"])
+    assert loaded.index.ntotal == 10  # tombstoned, not yet dropped
+    loaded.upsert([_chunk("c1", "changed"), _chunk("c10", "new")], vectors=vectors[:2])
+    assert _query_ids(loaded, vectors[0], monkeypatch, k=1) == ["c1"]
+    loaded.save(tmp_path, embedding_model="test-model")
+
+    # 2 tombstones in 12 rows is under INDEX_COMPACT_RATIO: saved as they are
+    reloaded = ChunkIndex.load(tmp_path, embedding_model="test-model")
+    assert reloaded.index.ntotal == 12
+    assert reloaded.chunk_ids == [f"c{i}" for i in range(2, 10)] + ["c1", "c10"]
+    assert reloaded.chunks_by_id["c1"].text == "changed"
+    assert "c0" not in reloaded.chunks_by_id
+    assert _query_ids(reloaded, vectors[0], monkeypatch, k=1) == ["c1"]
+    assert "c0" not in [c.id for c, _ in reloaded.query("text", k=12, mode="lexical")]
+    reloaded.add([_chunk("c11", "after reload")], vectors=vectors[2:3])
+    assert len(set(reloaded._fids.tolist())) == 13
+
+    # Past the ratio, save() compacts first
+    reloaded.remove([f"c{i}" for i in range(2, 6)])
+    assert reloaded.index.ntotal == 7
+    reloaded.save(tmp_path, embedding_model="test-model")
+    assert ChunkIndex.load(tmp_path, embedding_model="test-model").index.ntotal == 7
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf_pq"])
+def test_query_many_matches_single_queries(index_type, monkeypatch):
+    rng = np.random.default_rng(6)
+    vectors = rng.normal(size=(600, 16)).astype("float32")
+    probes = {f"q{i}": vectors[i] + 0.1 * rng.normal(size=16).astype("float32") for i in range(0, 600, 50)}
+    calls = []
+
+    def fake_embed(texts):
+        calls.append(len(texts))
+        return np.array([probes[t] for t in texts], dtype="float32")
+
+    index = ChunkIndex(index_type=index_type)
+    index.build([_chunk(f"c{i}", f"text {i}") for i in range(600)], vectors=vectors)
+    index.remove(["c50"])
+    monkeypatch.setattr(index_mod, "embed_texts", fake_embed)
+
+    batched = index.query_many(list(probes), k=4)
+    assert calls == [len(probes)]
+    single = [index.query(q, k=4) for q in probes]
+    assert [[(c.id, round(s, 5)) for c, s in r] for r in batched] == [
+        [(c.id, round(s, 5)) for c, s in r] for r in single
+    ]
+    assert batched[0][0][0].id == "c0"
+    assert "c50" not in {c.id for c, _ in batched[1]}
+    assert index.query_many([], k=4) == []
+
+
+def test_lexical_and_hybrid_modes_find_exact_terms(tmp_path, monkeypatch):
+    texts = [
+        "The white paper proposes a pro-innovation approach to AI regulation.",
+        "Regulators will apply five cross-sectoral principles.",
+        "Annex C: correction published on 4 July 2023.",
+        "Central functions will monitor and evaluate the framework.",
+    ]
+    chunks = [_chunk(f"c{i}", text) for i, text in enumerate(texts)]
+    vectors = np.eye(4, dtype="float32")
+    index = ChunkIndex(index_type="flat")
+    index.build(chunks, vectors=vectors)
+    # The dense side ranks c0 first and the Annex C chunk last
+    monkeypatch.setattr(index_mod, "embed_texts", lambda texts: np.array([[1.0, 0.5, 0.1, 0.3]], dtype="float32"))
+    question = "What does Annex C correct?"
+
+    assert [c.id for c, _ in index.query(question, k=4, mode="dense")][-1] == "c2"
+    # Dense is the default; hybrid is opt-in
+    assert index.query(question, k=4) == index.query(question, k=4, mode="dense")
+    assert [c.id for c, _ in index.query(question, k=1, mode="lexical")] == ["c2"]
+    # c2: first lexically and last densely beats c0, first densely only
+    assert [c.id for c, _ in index.query(question, k=2, mode="hybrid")] == ["c2", "c0"]
+    # ...but reports cosine similarities, not RRF values
+    cosines = {c.id: score for c, score in index.query(question, k=4, mode="dense")}
+    for chunk, score in index.query(question, k=2, mode="hybrid"):
+        assert score == pytest.approx(cosines[chunk.id], abs=1e-6)
+    with pytest.raises(ValueError):
+        index.query(question, mode="sparse")
+
+    # The BM25 side follows updates and snapshots
+    index.upsert([_chunk("c4", "Annex C was later withdrawn.")], vectors=np.ones((1, 4), dtype="float32"))
+    index.remove(["c2"])
+    assert [c.id for c, _ in index.query(question, k=4, mode="lexical")] == ["c4"]
+    index.save(tmp_path, embedding_model="test-model")
+    loaded = ChunkIndex.load(tmp_path, embedding_model="test-model")
+    assert [c.id for c, _ in loaded.query(question, k=4, mode="lexical")] == ["c4"]
+    assert [c.id for c, _ in loaded.query(question, k=3)] == [c.id for c, _ in index.query(question, k=3)]
@@ -0,0 +1,117 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datetime import datetime
+
+from src import pipeline
+from src.data import blobs
+from src.data.blobs import BlobStore
+from src.models import Article, Chunk
+from src.pipeline import buffered, stream_ingest
+
+
+def test_buffered_keeps_order_bounds_lookahead_and_reraises():
+    produced = []
+
+    def source():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    stream = buffered(source(), maxsize=2)
+    assert next(stream) == 0
+    threading.Event().wait(0.2)
+    # one item handed over, two queued, one blocked in put()
+    assert len(produced) <= 4
+    assert list(stream) == list(range(1, 20))
+
+    def failing():
+        yield 1
+        raise RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        list(buffered(failing()))
+
+
+def _article(i):
+    return Article(
+        id=f"a{i}",
+        source="TEST",
+        url=f"https://example.com/{i}",
+        title=f"T{i}",
+        published_at=None,
+        clean_text=f"Sentence one of {i}. Sentence two of {i}.",
+    )
+
+
+def _fake_chunker(articles, workers=1):
+    per_article = [
+        [
+            Chunk(
+                id=f"{a.id}-c{j}",
+                article_id=a.id,
+                order=j,
+                text=f"{a.clean_text} part {j}",
+                section=None,
+                topic_label=None,
+                created_at=datetime.utcnow(),
+            )
+            for j in range(2)
+        ]
+        for a in articles
+    ]
+    return per_article, np.ones((2 * len(articles), 3), dtype="float32")
+
+
+def test_stream_ingest_indexes_and_persists_every_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(blobs, "_default_store", BlobStore(root=tmp_path / "blobs", compression="gzip"))
+    monkeypatch.setattr(pipeline, "RAW_DIR", tmp_path)
+    monkeypatch.setattr(pipeline, "PROCESSED_DIR", tmp_path)
+    monkeypatch.setattr(pipeline, "semantic_chunk_corpus_with_vectors", _fake_chunker)
+    batch_sizes = []
+
+    def embed(texts):
+        batch_sizes.append(len(texts))
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype="float32")
+
+    monkeypatch.setattr(pipeline, "embed_texts", embed)
+
+    result = stream_ingest((_article(i) for i in range(7)), vector_source="encode", batch_articles=3)
+
+    assert batch_sizes == [6, 6, 2]
+    assert (result.articles, result.chunks) == (7, 14)
+    assert result.index.chunk_ids == [f"a{i}-c{j}" for i in range(7) for j in range(2)]
+    assert result.index.index.ntotal == 14
+
+    lines = result.chunks_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == result.index.chunk_ids
+    records = [json.loads(line) for line in result.articles_path.read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in records] == [f"a{i}" for i in range(7)]
+    assert not list(tmp_path.glob(".*.part"))
+
+    assert stream_ingest(iter([])) is None
+
+
+def test_stream_ingest_returns_none_when_articles_produce_no_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(blobs, "_default_store", BlobStore(root=tmp_path / "blobs", compression="gzip"))
+    monkeypatch.setattr(pipeline, "RAW_DIR", tmp_path)
+    monkeypatch.setattr(pipeline, "PROCESSED_DIR", tmp_path)
+    monkeypatch.setattr(
+        pipeline,
+        "semantic_chunk_corpus_with_vectors",
+        lambda articles, workers=1: ([[] for _ in articles], np.zeros((0, 3), dtype="float32")),
+    )
+
+    assert stream_ingest((_article(i) for i in range(3)), vector_source="pooled") is None
+    assert not list(tmp_path.glob("*.jsonl"))
+    assert not list(tmp_path.glob(".*.part"))
@@ -0,0 +1,86 @@
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.models import Chunk
+from src.retrieval import index as index_mod
+from src.retrieval.index import ChunkIndex
+from src.retrieval.scheduler import QueryScheduler
+
+
+def _chunk(id_):
+    return Chunk(
+        id=id_,
+        article_id="a1",
+        order=0,
+        text=f"text of {id_}",
+        section=None,
+        topic_label=None,
+        created_at=datetime.utcnow(),
+    )
+
+
+def test_concurrent_queries_are_batched_and_match_direct_queries(monkeypatch):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype("float32")
+    index = ChunkIndex(index_type="flat")
+    index.build([_chunk(f"c{i}") for i in range(50)], vectors=vectors)
+
+    embed_calls = []
+
+    def fake_embed(texts):
+        embed_calls.append(len(texts))
+        return np.array([vectors[int(t[1:])] for t in texts], dtype="float32")
+
+    monkeypatch.setattr(index_mod, "embed_texts", fake_embed)
+    scheduler = QueryScheduler(index, max_batch=8, max_wait=0.05)
+    results = {}
+    barrier = threading.Barrier(20)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = scheduler.query(f"q{i}", k=1 + i % 2, timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    scheduler.close()
+
+    assert scheduler.queries == 20
+    assert scheduler.batches < 20
+    assert sum(embed_calls) == 20 and len(embed_calls) < 20
+    for i in range(20):
+        assert [c.id for c, _ in results[i]] == [c.id for c, _ in index.query(f"q{i}", k=1 + i % 2)]
+        assert results[i][0][0].id == f"c{i}"
+
+
+def test_failing_group_only_fails_its_own_requests(monkeypatch):
+    vectors = np.eye(4, dtype="float32")
+    index = ChunkIndex(index_type="flat")
+    index.build([_chunk(f"c{i}") for i in range(4)], vectors=vectors)
+    monkeypatch.setattr(
+        index_mod, "embed_texts", lambda texts: np.array([vectors[int(t[1:])] for t in texts], dtype="float32")
+    )
+    scheduler = QueryScheduler(index, max_batch=8, max_wait=0.2)
+
+    good = scheduler.submit("q1", k=1, mode="dense")
+    bad = scheduler.submit("q2", k=1, mode="no-such-mode")
+    other = scheduler.submit("q3", k=1, mode="dense")
+
+    assert good.result(5)[0][0].id == "c1"
+    assert other.result(5)[0][0].id == "c3"
+    with pytest.raises(ValueError, match="Unknown retrieval mode"):
+        bad.result(5)
+    scheduler.close()
+    assert scheduler.batches == 1
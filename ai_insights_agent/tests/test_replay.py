@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+# Make project root importable so we can "import src"
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.scraping.fetch import configure_transport, fetch_html
+from src.scraping.replay import HttpArchive
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = f"<html><p>page {self.path}</p></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_record_then_replay_offline(server, tmp_path):
+    url = f"{server}/doc-1"
+    recorder = configure_transport("record", tmp_path, session=requests.Session())
+    live_body = fetch_html(url, session=recorder, cache_mode="off")
+
+    archive = HttpArchive(tmp_path)
+    assert len(archive) == 1
+    assert archive.get(url)["headers"]["ETag"] == '"v1"'
+
+    replayer = configure_transport("replay", tmp_path, session=requests.Session())
+    assert fetch_html(url, session=replayer, cache_mode="off") == live_body
+
+
+def test_replay_latency_and_missing_urls(tmp_path):
+    HttpArchive(tmp_path).add("https://example.com/a", "<p>a</p>")
+    session = configure_transport("replay", tmp_path, latency=0.05, session=requests.Session())
+
+    start = time.perf_counter()
+    assert fetch_html("https://example.com/a", session=session, cache_mode="off") == "<p>a</p>"
+    assert time.perf_counter() - start >= 0.05
+
+    with pytest.raises(requests.ConnectionError):
+        fetch_html("https://example.com/missing", session=session, cache_mode="off")